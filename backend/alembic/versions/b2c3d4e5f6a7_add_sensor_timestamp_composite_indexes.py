@@ -0,0 +1,43 @@
+"""add_sensor_timestamp_composite_indexes
+
+Revision ID: b2c3d4e5f6a7
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-16 09:00:00.000000
+
+Adds composite indexes for the per-sensor, time-ordered fetches:
+- sensor_readings (sensor_id, timestamp, value): covering index for
+  analysis windows and date-range queries
+- analysis_results (sensor_id, timestamp): latest result / history paging
+
+"""
+from typing import Sequence, Union
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2c3d4e5f6a7'
+down_revision: Union[str, Sequence[str], None] = 'a1b2c3d4e5f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the composite indexes."""
+    op.create_index(
+        'ix_sensor_readings_sensor_ts_value',
+        'sensor_readings',
+        ['sensor_id', 'timestamp', 'value'],
+        unique=False
+    )
+    op.create_index(
+        'ix_analysis_results_sensor_ts',
+        'analysis_results',
+        ['sensor_id', 'timestamp'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    """Drop the composite indexes."""
+    op.drop_index('ix_analysis_results_sensor_ts', table_name='analysis_results')
+    op.drop_index('ix_sensor_readings_sensor_ts_value', table_name='sensor_readings')
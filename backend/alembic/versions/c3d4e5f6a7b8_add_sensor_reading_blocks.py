@@ -0,0 +1,42 @@
+"""add_sensor_reading_blocks
+
+Revision ID: c3d4e5f6a7b8
+Revises: b2c3d4e5f6a7
+Create Date: 2026-10-16 10:00:00.000000
+
+Adds the optional compressed block storage table for sensor readings.
+Existing rows are converted with `python -m backend.convert_readings`.
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d4e5f6a7b8'
+down_revision: Union[str, Sequence[str], None] = 'b2c3d4e5f6a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create sensor_reading_blocks."""
+    op.create_table(
+        'sensor_reading_blocks',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('sensor_id', sa.String(length=50), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(), nullable=False),
+        sa.Column('first_ts', sa.DateTime(), nullable=False),
+        sa.Column('last_ts', sa.DateTime(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.Column('payload', sa.LargeBinary(), nullable=False),
+        sa.ForeignKeyConstraint(['sensor_id'], ['sensors.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('sensor_id', 'bucket_start', name='uq_reading_blocks_sensor_bucket')
+    )
+
+
+def downgrade() -> None:
+    """Drop sensor_reading_blocks (convert blocks back to rows first if needed)."""
+    op.drop_table('sensor_reading_blocks')
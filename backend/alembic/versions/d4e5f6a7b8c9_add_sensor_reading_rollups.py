@@ -0,0 +1,44 @@
+"""add_sensor_reading_rollups
+
+Revision ID: d4e5f6a7b8c9
+Revises: c3d4e5f6a7b8
+Create Date: 2026-10-16 11:00:00.000000
+
+Adds multi-resolution rollup tiers (count, sum, sum of squares, min, max
+per sensor, resolution and bucket). Existing readings are not rolled up
+here: run the backfill_rollups Celery task once after upgrading, e.g.
+  celery -A backend.core.celery_app:celery_app call backend.tasks.maintenance_tasks.backfill_rollups
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4e5f6a7b8c9'
+down_revision: Union[str, Sequence[str], None] = 'c3d4e5f6a7b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create sensor_reading_rollups."""
+    op.create_table(
+        'sensor_reading_rollups',
+        sa.Column('sensor_id', sa.String(length=50), nullable=False),
+        sa.Column('resolution', sa.Integer(), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(), nullable=False),
+        sa.Column('value_count', sa.Integer(), nullable=False),
+        sa.Column('value_sum', sa.Float(), nullable=False),
+        sa.Column('value_sum_sq', sa.Float(), nullable=False),
+        sa.Column('value_min', sa.Float(), nullable=False),
+        sa.Column('value_max', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['sensor_id'], ['sensors.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('sensor_id', 'resolution', 'bucket_start')
+    )
+
+
+def downgrade() -> None:
+    """Drop sensor_reading_rollups."""
+    op.drop_table('sensor_reading_rollups')
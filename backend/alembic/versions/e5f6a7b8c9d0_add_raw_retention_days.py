@@ -0,0 +1,36 @@
+"""add_raw_retention_days
+
+Revision ID: e5f6a7b8c9d0
+Revises: d4e5f6a7b8c9
+Create Date: 2026-10-16 12:00:00.000000
+
+Adds per-organization and per-sensor raw reading retention (days), enforced
+by the enforce_retention Celery task. NULL falls back to the organization
+and then to settings.raw_retention_days.
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f6a7b8c9d0'
+down_revision: Union[str, Sequence[str], None] = 'd4e5f6a7b8c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add raw_retention_days to organizations and sensors."""
+    op.add_column('organizations', sa.Column('raw_retention_days', sa.Integer(), nullable=True))
+    op.add_column('sensors', sa.Column('raw_retention_days', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Drop raw_retention_days from organizations and sensors."""
+    # Batch mode: SQLite before 3.35 cannot drop columns in place
+    with op.batch_alter_table('sensors') as batch_op:
+        batch_op.drop_column('raw_retention_days')
+    with op.batch_alter_table('organizations') as batch_op:
+        batch_op.drop_column('raw_retention_days')
@@ -0,0 +1,145 @@
+"""split_analysis_metrics
+
+Revision ID: f6a7b8c9d0e1
+Revises: e5f6a7b8c9d0
+Create Date: 2026-10-16 13:00:00.000000
+
+Splits analysis_results.metrics (one JSON blob per result) into:
+- typed scalar columns on analysis_results (bias, slope, snr_db, ...)
+- analysis_artifacts: one row per result holding the chart series
+
+Existing rows are migrated in batches; downgrade reassembles the JSON,
+decoding compact (base64 float32) series back to plain lists.
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+from backend.core.encoding import expand_metrics
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6a7b8c9d0e1'
+down_revision: Union[str, Sequence[str], None] = 'e5f6a7b8c9d0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCALAR_METRICS = (
+    'bias', 'slope', 'noise_std', 'snr_db', 'hysteresis',
+    'hurst', 'hurst_r2', 'dfa_alpha', 'dfa_r_squared',
+)
+BATCH_SIZE = 500
+
+analysis_results = sa.table(
+    'analysis_results',
+    sa.column('id', sa.Integer),
+    sa.column('metrics', sa.JSON(none_as_null=True)),  # None -> SQL NULL
+    *(sa.column(name, sa.Float) for name in SCALAR_METRICS),
+)
+analysis_artifacts = sa.table(
+    'analysis_artifacts',
+    sa.column('analysis_id', sa.Integer),
+    sa.column('series', sa.JSON),
+)
+# executemany target: one parameter dict per row, keyed by _id
+update_by_id = analysis_results.update().where(analysis_results.c.id == sa.bindparam('_id'))
+
+
+def _as_float(value):
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def upgrade() -> None:
+    """Add scalar columns and analysis_artifacts, then move metrics out of the JSON column."""
+    connection = op.get_bind()
+
+    # =========================================================================
+    # STEP 1: New columns and table
+    # =========================================================================
+    for name in SCALAR_METRICS:
+        op.add_column('analysis_results', sa.Column(name, sa.Float(), nullable=True))
+    op.create_table(
+        'analysis_artifacts',
+        sa.Column('analysis_id', sa.Integer(), nullable=False),
+        sa.Column('series', sa.JSON(), nullable=False),
+        sa.ForeignKeyConstraint(['analysis_id'], ['analysis_results.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('analysis_id')
+    )
+
+    # =========================================================================
+    # STEP 2: Migrate existing metrics in id-ordered batches
+    # =========================================================================
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(analysis_results.c.id, analysis_results.c.metrics)
+            .where(analysis_results.c.id > last_id)
+            .order_by(analysis_results.c.id)
+            .limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+
+        scalars, artifacts = [], []
+        for analysis_id, metrics in rows:
+            metrics = metrics or {}
+            scalars.append({
+                '_id': analysis_id,
+                **{name: _as_float(metrics.get(name)) for name in SCALAR_METRICS},
+            })
+            series = {k: v for k, v in metrics.items() if k not in SCALAR_METRICS}
+            if series:
+                artifacts.append({'analysis_id': analysis_id, 'series': series})
+        connection.execute(update_by_id, scalars)
+        if artifacts:
+            connection.execute(analysis_artifacts.insert(), artifacts)
+
+    # =========================================================================
+    # STEP 3: Drop the JSON column
+    # =========================================================================
+    with op.batch_alter_table('analysis_results') as batch_op:
+        batch_op.drop_column('metrics')
+
+
+def downgrade() -> None:
+    """Reassemble analysis_results.metrics and drop the split storage."""
+    connection = op.get_bind()
+
+    op.add_column('analysis_results', sa.Column('metrics', sa.JSON(), nullable=True))
+
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(
+                analysis_results.c.id,
+                analysis_artifacts.c.series,
+                *(analysis_results.c[name] for name in SCALAR_METRICS),
+            )
+            .select_from(analysis_results.outerjoin(
+                analysis_artifacts, analysis_artifacts.c.analysis_id == analysis_results.c.id
+            ))
+            .where(analysis_results.c.id > last_id)
+            .order_by(analysis_results.c.id)
+            .limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+
+        updates = []
+        for analysis_id, series, *scalars in rows:
+            # The old metrics column held plain lists only
+            metrics = expand_metrics(series or {})
+            metrics.update({name: value for name, value in zip(SCALAR_METRICS, scalars) if value is not None})
+            updates.append({'_id': analysis_id, 'metrics': metrics if metrics else None})
+        connection.execute(update_by_id, updates)
+
+    op.drop_table('analysis_artifacts')
+    with op.batch_alter_table('analysis_results') as batch_op:
+        for name in SCALAR_METRICS:
+            batch_op.drop_column(name)
@@ -1,16 +1,196 @@
 import numpy as np
 import pandas as pd
 from scipy import stats, signal
-from typing import Dict, Any, List, Tuple
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Dict, Any, List, Optional, Tuple
+from functools import lru_cache
 import logging
 from datetime import datetime
 from backend.models import SensorConfig
+from backend.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+
+@lru_cache(maxsize=512)
+def _dfa_detrend_operators(scale: int, order: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vandermonde matrix and its pseudo-inverse for one DFA segment length.
+
+    Cached per (scale, order) so repeated analyses of same-sized windows
+    never rebuild them.
+    """
+    x = np.arange(scale, dtype=float)
+    vander = np.vander(x, order + 1)
+    pinv = np.linalg.pinv(vander)
+    vander.setflags(write=False)
+    pinv.setflags(write=False)
+    return vander, pinv
+
+
+def _dfa_scales(n_points: int, order: int) -> np.ndarray:
+    """Log-spaced DFA box sizes between 4 and N/4 (empty if the series is too short)."""
+    min_scale = 4
+    max_scale = n_points // 4
+    if max_scale < min_scale:
+        return np.array([], dtype=int)
+
+    scales = np.unique(np.logspace(np.log10(min_scale), np.log10(max_scale), num=20).astype(int))
+    scales = scales[scales > order + 2]
+
+    if len(scales) < 3:
+        scales = np.arange(min_scale, max_scale, max(1, (max_scale - min_scale) // 5))
+        scales = np.unique(scales.astype(int))
+        scales = scales[scales > order + 2]
+    return scales
+
+
+def _dfa_fluctuation(profile: np.ndarray, scale: int, order: int) -> np.ndarray:
+    """
+    RMS fluctuation F(n) of a cumulative profile at a single scale.
+
+    All segments are detrended in one least-squares solve: the profile is
+    reshaped to (n_segments, scale) and multiplied by the cached
+    pseudo-inverse, which is equivalent to np.polyfit on every segment.
+    Works on the last axis, so a 2D (n_series, N) profile yields one
+    fluctuation per row.
+    """
+    n_segments = profile.shape[-1] // scale
+    segments = profile[..., :n_segments * scale].reshape(*profile.shape[:-1], n_segments, scale)
+    vander, pinv = _dfa_detrend_operators(scale, order)
+
+    coeffs = segments @ pinv.T
+    residuals = segments - coeffs @ vander.T
+    return np.sqrt(np.sum(residuals ** 2, axis=(-2, -1)) / (n_segments * scale))
+
+
+def _fill_gaps(data: np.ndarray, limit: int = 5) -> np.ndarray:
+    """
+    NumPy equivalent of pd.Series.interpolate(method='linear', limit=limit).bfill().ffill().
+
+    Works along the last axis. Each NaN run gets at most `limit` linearly
+    interpolated points (trailing runs are held at the last value, as pandas
+    does); whatever is left is back-filled, then forward-filled.
+    """
+    nan = np.isnan(data)
+    if not nan.any():
+        return data
+
+    n_points = data.shape[-1]
+    idx = np.arange(n_points)
+    prev_valid = np.maximum.accumulate(np.where(nan, -1, idx), axis=-1)
+    next_valid = np.flip(np.minimum.accumulate(np.flip(np.where(nan, n_points, idx), axis=-1), axis=-1), axis=-1)
+
+    has_prev = prev_valid >= 0
+    has_next = next_valid < n_points
+    y_prev = np.take_along_axis(data, np.where(has_prev, prev_valid, 0), axis=-1)
+    y_next = np.take_along_axis(data, np.where(has_next, next_valid, 0), axis=-1)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        frac = (idx - prev_valid) / (next_valid - prev_valid)
+    interpolated = np.where(has_next, y_prev + (y_next - y_prev) * frac, y_prev)
+
+    within_limit = nan & has_prev & (idx - prev_valid <= limit)
+    leftover = nan & ~within_limit
+    # bfill reaches the next original value; with no next value, ffill holds the previous one
+    edge_fill = np.where(has_next, y_next, y_prev)
+
+    return np.where(within_limit, interpolated, np.where(leftover, edge_fill, data))
+
+
+def _rolling_mean_centered(data: np.ndarray, window: int = 5) -> np.ndarray:
+    """
+    NumPy equivalent of rolling(window, center=True).mean().bfill().ffill().
+
+    Cumulative-sum moving average along the last axis; the incomplete
+    windows at both edges take the nearest full-window mean.
+    """
+    n_points = data.shape[-1]
+    if n_points < window:
+        return np.full_like(data, np.nan, dtype=float)
+
+    # Offset by the first value to keep the cumulative sum well-conditioned
+    ref = data[..., :1]
+    csum = np.cumsum(data - ref, axis=-1)
+    csum = np.concatenate([np.zeros_like(ref), csum], axis=-1)
+    means = (csum[..., window:] - csum[..., :-window]) / window + ref
+
+    offset = window // 2
+    left = np.repeat(means[..., :1], offset, axis=-1)
+    right = np.repeat(means[..., -1:], n_points - offset - means.shape[-1], axis=-1)
+    return np.concatenate([left, means, right], axis=-1)
+
+
+@lru_cache(maxsize=64)
+def _x_axis(n_points: int) -> Tuple[np.ndarray, np.ndarray, float]:
+    """
+    Regression x-axis 0..n-1 for a given length: (x, x - mean(x), sum((x - mean(x))^2)).
+
+    Cached per length so same-sized windows reuse the arrays across calls.
+    """
+    x = np.arange(n_points, dtype=float)
+    x_centered = x - (n_points - 1) / 2.0
+    x.setflags(write=False)
+    x_centered.setflags(write=False)
+    return x, x_centered, float(n_points * (n_points - 1) * (n_points + 1) / 12.0)
+
+
+class RegressionContext:
+    """
+    OLS fit of one array against x = 0..n-1, computed once and shared.
+
+    A single analyze() call fits the same trend for slope and RUL; building
+    the context once replaces repeated stats.linregress calls and x-axis
+    allocations.
+    """
+
+    __slots__ = ("data", "n", "slope", "intercept")
+
+    def __init__(self, data: np.ndarray):
+        self.data = np.asarray(data, dtype=float)
+        self.n = len(self.data)
+        if self.n < 2:
+            self.slope = 0.0
+            self.intercept = float(self.data[0]) if self.n else 0.0
+            return
+
+        _, x_centered, sxx = _x_axis(self.n)
+        y_mean = float(np.mean(self.data))
+        self.slope = float(np.dot(x_centered, self.data) / sxx)
+        self.intercept = y_mean - self.slope * (self.n - 1) / 2.0
+
+    def value_at(self, index: float) -> float:
+        """Fitted line evaluated at x = index."""
+        return self.slope * index + self.intercept
+
+    def fitted(self) -> np.ndarray:
+        """Fitted line over the whole array."""
+        return self.slope * _x_axis(self.n)[0] + self.intercept
+
+    def residuals(self) -> np.ndarray:
+        """Data minus the fitted line."""
+        return self.data - self.fitted()
+
+
+def _ols_rows(data: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Least-squares slope and intercept of each row against x = 0..n-1."""
+    n_points = data.shape[-1]
+    if n_points < 2:
+        return np.zeros(data.shape[:-1]), data.mean(axis=-1)
+    _, x_centered, sxx = _x_axis(n_points)
+    slope = (data @ x_centered) / sxx
+    intercept = data.mean(axis=-1) - slope * (n_points - 1) / 2.0
+    return slope, intercept
+
+
 class SensorAnalyzer:
-    def __init__(self, config: SensorConfig = SensorConfig()):
+    # Points (windows x window size) decomposed at once by analyze_rolling
+    ROLLING_CHUNK_POINTS = 1_000_000
+
+    def __init__(self, config: SensorConfig = SensorConfig(), engine: Optional[str] = None):
         self.config = config
+        # "pandas" (default) or "numpy" for gap filling and smoothing
+        self.engine = engine or settings.preprocessing_engine
 
     def preprocessing(self, data: list) -> np.ndarray:
         """
@@ -22,18 +202,27 @@ class SensorAnalyzer:
         if len(data) < self.config.min_data_points:
             raise ValueError(f"Insufficient data: {len(data)} points provided, minimum {self.config.min_data_points} required.")
 
-        s = pd.Series(data)
-        
         # Gap Limit: Don't fill large gaps (simplified logic here as we don't have timestamps in list)
         # Assuming uniform sampling for now.
-        s = s.interpolate(method='linear', limit=5).bfill().ffill()
+        if self.engine == "pandas":
+            values = pd.Series(data).interpolate(method='linear', limit=5).bfill().ffill().values
+        else:
+            values = _fill_gaps(np.asarray(data, dtype=float), limit=5)
         
         # Median Filter for Spikes
         # Kernel size 3 or 5 usually good
-        s_clean = signal.medfilt(s.values, kernel_size=3)
+        s_clean = signal.medfilt(values, kernel_size=3)
         
         return s_clean
 
+    def _smooth(self, data: np.ndarray) -> np.ndarray:
+        """Centered 5-point rolling mean along the last axis (edges held)."""
+        if self.engine == "pandas":
+            if data.ndim == 1:
+                return pd.Series(data).rolling(window=5, center=True).mean().bfill().ffill().values
+            return pd.DataFrame(data.T).rolling(window=5, center=True).mean().bfill().ffill().to_numpy().T
+        return _rolling_mean_centered(data, window=5)
+
     def calc_bias(self, data: np.ndarray) -> float:
         """Calculate offset from mean of first 10% vs current."""
         if len(data) < 10: return 0.0
@@ -42,14 +231,13 @@ class SensorAnalyzer:
         curr_mean = np.mean(data[-n_ref:])
         return float(curr_mean - ref_mean)
 
-    def calc_slope(self, data: np.ndarray) -> float:
+    def calc_slope(self, data: np.ndarray, ctx: Optional[RegressionContext] = None) -> float:
         """Calculate linear trend slope."""
         if len(data) < 2: return 0.0
-        x = np.arange(len(data))
-        slope, _, _, _, _ = stats.linregress(x, data)
-        return float(slope)
+        ctx = ctx or RegressionContext(data)
+        return float(ctx.slope)
 
-    def calc_snr_db(self, data: np.ndarray) -> float:
+    def calc_snr_db(self, data: np.ndarray, ctx: Optional[RegressionContext] = None) -> float:
         """
         Calculate SNR in dB.
         Signal = Peak-to-Peak
@@ -59,15 +247,14 @@ class SensorAnalyzer:
         
         # 1. Estimate Signal Amplitude (Peak-to-Peak)
         # We use the raw range, or robust range (percentiles) to avoid outliers
-        signal_pp = np.percentile(data, 95) - np.percentile(data, 5)
+        p5, p95 = np.percentile(data, [5, 95])
+        signal_pp = p95 - p5
         if signal_pp == 0: signal_pp = 1e-6
 
         # 2. Isolate Noise (High-pass filter or Detrend)
         # Simple approach: Subtract linear trend
-        x = np.arange(len(data))
-        slope, intercept, _, _, _ = stats.linregress(x, data)
-        trend = slope * x + intercept
-        noise_component = data - trend
+        ctx = ctx or RegressionContext(data)
+        noise_component = ctx.residuals()
         
         # RMS of noise
         noise_rms = np.sqrt(np.mean(noise_component**2))
@@ -77,15 +264,16 @@ class SensorAnalyzer:
         snr_db = 20 * np.log10(signal_pp / noise_rms)
         return float(snr_db)
 
-    def calc_hysteresis(self, data: np.ndarray) -> Tuple[float, List[float], List[float]]:
+    def calc_hysteresis(self, data: np.ndarray, as_arrays: bool = False) -> Tuple[float, List[float], List[float]]:
         """
         Calculate Hysteresis based on Area Difference between Rising and Falling edges.
         Simplified Edge Detection.
+        With as_arrays=True the curves are returned as numpy arrays instead of lists.
         """
         if len(data) < 5: return 0.0, [], []
         
         # Smooth heavily to find "edges" (macro movements)
-        smooth = pd.Series(data).rolling(window=5, center=True).mean().bfill().ffill().values
+        smooth = self._smooth(data)
         diffs = np.diff(smooth)
         
         # Threshold for "edge"
@@ -105,6 +293,8 @@ class SensorAnalyzer:
         data_range = np.ptp(data) if np.ptp(data) > 0 else 1.0
         hysteresis_score = abs(avg_rising_val - avg_falling_val) / data_range
         
+        if as_arrays:
+            return float(hysteresis_score), data, smooth
         return float(hysteresis_score), data.tolist(), smooth.tolist()
 
     def calc_dfa(self, data: np.ndarray, order: int = 1) -> Tuple[float, float, List[float], List[float]]:
@@ -119,42 +309,11 @@ class SensorAnalyzer:
             N = len(y)
             if N < 20: return 0.5, 0.0, [], []
 
-            min_scale = 4
-            max_scale = N // 4
-            if max_scale < min_scale: return 0.5, 0.0, [], []
-            
-            scales = np.unique(np.logspace(np.log10(min_scale), np.log10(max_scale), num=20).astype(int))
-            scales = scales[scales > order + 2]
-            
-            if len(scales) < 3:
-                 scales = np.arange(min_scale, max_scale, max(1, (max_scale - min_scale) // 5))
-                 scales = np.unique(scales.astype(int))
-                 scales = scales[scales > order + 2]
-
+            scales = _dfa_scales(N, order)
             if len(scales) < 2: return 0.5, 0.0, [], []
 
-            fluctuations = []
-            
-            # Vectorized-ish loop (still loop over scales, but inner operations are numpy)
-            for scale in scales:
-                n_segments = N // scale
-                # Reshape data into (n_segments, scale) - truncating end
-                segments = y[:n_segments*scale].reshape(n_segments, scale)
-                x = np.arange(scale)
-                
-                # Polyfit for each segment? 
-                # np.polyfit can handle multiple columns if we transpose, but let's keep loop for safety/clarity first
-                # Optimization:
-                total_residual_sq = 0.0
-                for seg in segments:
-                    coeffs = np.polyfit(x, seg, order)
-                    trend = np.polyval(coeffs, x)
-                    total_residual_sq += np.sum((seg - trend) ** 2)
-                
-                f_n = np.sqrt(total_residual_sq / (n_segments * scale))
-                fluctuations.append(f_n)
-            
-            fluctuations = np.array(fluctuations)
+            # One batched least-squares solve per scale (no per-segment polyfit)
+            fluctuations = np.array([_dfa_fluctuation(y, int(scale), order) for scale in scales])
             valid_idx = fluctuations > 1e-10
             if np.sum(valid_idx) < 3: return 0.5, 0.0, [], []
                 
@@ -175,12 +334,13 @@ class SensorAnalyzer:
         Trend represents Process Change.
         Residuals represent Noise/Sensor Characteristics.
         """
-        if len(data) < self.config.min_data_points:
+        n_points = data.shape[-1]
+        if n_points < self.config.min_data_points:
              return data, np.zeros_like(data)
              
         # Savitzky-Golay filter
         # Window length must be odd and <= data length
-        window_length = min(len(data), 51)
+        window_length = min(n_points, 51)
         if window_length % 2 == 0: window_length -= 1
         window_length = max(3, window_length)
         
@@ -188,19 +348,23 @@ class SensorAnalyzer:
         if window_length <= polyorder:
              polyorder = window_length - 1
              
+        # Filters run along the last axis, so a (n_sensors, n_points) stack works too
         try:
-            trend = signal.savgol_filter(data, window_length, polyorder)
+            trend = signal.savgol_filter(data, window_length, polyorder, axis=-1)
         except Exception as e:
             logger.warning(f"Golay filter failed: {e}. Using median filter fallback.")
-            trend = signal.medfilt(data, kernel_size=min(len(data), 11) if min(len(data), 11) % 2 else min(len(data), 11)-1)
+            kernel = min(n_points, 11) if min(n_points, 11) % 2 else min(n_points, 11)-1
+            trend = signal.medfilt(data, kernel_size=(1,) * (data.ndim - 1) + (kernel,))
 
         residuals = data - trend
         return trend, residuals
 
-    def analyze(self, raw_data: list) -> Dict[str, Any]:
+    def analyze(self, raw_data: list, return_arrays: bool = False) -> Dict[str, Any]:
         """
         Centralized Analysis Pipeline.
         Returns full analysis result (metrics + health score).
+        With return_arrays=True, trend/residuals/hysteresis curves stay numpy
+        arrays (see backend.core.encoding) instead of being converted to lists.
         """
         # 1. Preprocessing
         clean_data = self.preprocessing(raw_data)
@@ -209,8 +373,9 @@ class SensorAnalyzer:
         trend, residuals = self.decompose_signal(clean_data)
         
         # 3. Calculate Metrics
-        # Slope -> Calculated on TREND
-        slope = self.calc_slope(trend)
+        # Slope -> Calculated on TREND (fit shared with the RUL projection)
+        trend_ctx = RegressionContext(trend)
+        slope = self.calc_slope(trend, trend_ctx)
         
         # Noise -> Calculated on RESIDUALS
         noise_std = float(np.std(residuals))
@@ -221,7 +386,7 @@ class SensorAnalyzer:
         # Metric Helpers (Some still use full data or specific components)
         bias = self.calc_bias(clean_data) # Bias is absolute shift, use clean data (or trend end)
         snr_db = self.calc_snr_db(clean_data) # SNR usually needs both signal (trend) and noise (residuals)
-        hysteresis, hyst_x, hyst_y = self.calc_hysteresis(clean_data)
+        hysteresis, hyst_x, hyst_y = self.calc_hysteresis(clean_data, as_arrays=return_arrays)
         
         metrics_dict = {
             "bias": bias, 
@@ -235,14 +400,14 @@ class SensorAnalyzer:
             "hurst_r2": hurst_r2, 
             "dfa_scales": dfa_scales, 
             "dfa_fluctuations": dfa_flucts,
-            "trend": trend.tolist(),
-            "residuals": residuals.tolist()
+            "trend": trend if return_arrays else trend.tolist(),
+            "residuals": residuals if return_arrays else residuals.tolist()
         }
         
         # 4. Health Decision & RUL
         # We pass metrics_dict to get_health_score, but need to update get_health_score to logic
         health = self.get_health_score(metrics_dict)
-        rul_prediction = self.calc_rul(trend, slope) # Use trend for RUL projection
+        rul_prediction = self.calc_rul(trend, slope, trend_ctx) # Use trend for RUL projection
 
         return {
             "metrics": metrics_dict,
@@ -254,7 +419,238 @@ class SensorAnalyzer:
             }
         }
 
-    def calc_rul(self, data: np.ndarray, slope: float) -> str:
+    def analyze_batch(self, matrix) -> List[Dict[str, Any]]:
+        """
+        Fleet-wide analysis of equal-length windows in one vectorized pass.
+        
+        Args:
+            matrix: (n_sensors, n_points) array-like, one sensor window per row
+            
+        Returns:
+            One result dict per row, in the same format as analyze().
+        """
+        data = np.asarray(matrix, dtype=float)
+        if data.ndim != 2:
+            raise ValueError(f"Expected a 2D (n_sensors, n_points) array, got shape {data.shape}")
+        n_sensors, n_points = data.shape
+        if n_sensors == 0:
+            return []
+        
+        # 1. Preprocessing
+        clean_data = self._preprocess_batch(data)
+        
+        # 2. Decomposition (row-wise Savitzky-Golay)
+        trend, residuals = self.decompose_signal(clean_data)
+        
+        # 3. Metrics along axis 1
+        slope, trend_intercept = _ols_rows(trend)
+        noise_std = residuals.std(axis=1)
+        hurst, hurst_r2, dfa_scales, dfa_flucts = self._dfa_batch(residuals)
+        bias = self._bias_batch(clean_data)
+        snr_db = self._snr_db_batch(clean_data)
+        hysteresis, smooth, has_edges = self._hysteresis_batch(clean_data)
+        
+        # 4. Health Decision & RUL (scalar rule evaluation per sensor)
+        current_val = slope * (n_points - 1) + trend_intercept
+        results = []
+        for i in range(n_sensors):
+            metrics_dict = {
+                "bias": float(bias[i]),
+                "slope": float(slope[i]),
+                "noise_std": float(noise_std[i]),
+                "snr_db": float(snr_db[i]),
+                "hysteresis": float(hysteresis[i]),
+                "hysteresis_x": clean_data[i].tolist() if has_edges[i] else [],
+                "hysteresis_y": smooth[i].tolist() if has_edges[i] else [],
+                "hurst": hurst[i],
+                "hurst_r2": hurst_r2[i],
+                "dfa_scales": dfa_scales[i],
+                "dfa_fluctuations": dfa_flucts[i],
+                "trend": trend[i].tolist(),
+                "residuals": residuals[i].tolist()
+            }
+            results.append({
+                "metrics": metrics_dict,
+                "health": self.get_health_score(metrics_dict),
+                "prediction": self.project_rul(float(slope[i]), float(trend[i, 0]), float(current_val[i])),
+                "components": {}
+            })
+        return results
+
+    def analyze_rolling(self, raw_data: list, window: int, step: int = 1) -> Dict[str, Any]:
+        """
+        Health-score time series over sliding windows in one vectorized pass.
+        
+        The series is preprocessed once; the windows are strided views of
+        it (sliding_window_view), so bias, slope, noise and SNR for all
+        windows come from the batch helpers instead of one pipeline run per
+        window. Hysteresis and DFA are not evaluated per window. Windows
+        are processed in chunks of about ROLLING_CHUNK_POINTS points, so
+        memory stays bounded however many windows the series has.
+        
+        Args:
+            raw_data: Full series, oldest first
+            window: Points per window (at least config.min_data_points)
+            step: Points between consecutive window starts
+            
+        Returns:
+            Column-oriented dict: window end indices plus one list per
+            metric, health score and status.
+        """
+        if step < 1:
+            raise ValueError("step must be at least 1")
+        if window < self.config.min_data_points:
+            raise ValueError(f"window must be at least {self.config.min_data_points} points")
+        if len(raw_data) < window:
+            raise ValueError(f"Insufficient data: {len(raw_data)} points provided, window is {window}.")
+        
+        clean_data = self.preprocessing(raw_data)
+        windows = sliding_window_view(clean_data, window)[::step]
+        
+        # The batch helpers copy their input: bound the copies per chunk
+        chunk = max(1, self.ROLLING_CHUNK_POINTS // window)
+        slope, noise_std, bias, snr_db = (np.empty(len(windows)) for _ in range(4))
+        for start in range(0, len(windows), chunk):
+            part = slice(start, start + chunk)
+            trend, residuals = self.decompose_signal(windows[part])
+            slope[part] = _ols_rows(trend)[0]
+            noise_std[part] = residuals.std(axis=1)
+            bias[part] = self._bias_batch(windows[part])
+            snr_db[part] = self._snr_db_batch(windows[part])
+        
+        health_scores, statuses = [], []
+        for i in range(len(windows)):
+            health = self.get_health_score({
+                "bias": float(bias[i]),
+                "slope": float(slope[i]),
+                "noise_std": float(noise_std[i]),
+                "snr_db": float(snr_db[i]),
+            })
+            health_scores.append(health["score"])
+            statuses.append(health["status"])
+        
+        return {
+            "window": window,
+            "step": step,
+            "end_index": (np.arange(len(windows)) * step + window - 1).tolist(),
+            "bias": bias.tolist(),
+            "slope": slope.tolist(),
+            "noise_std": noise_std.tolist(),
+            "snr_db": snr_db.tolist(),
+            "health_score": health_scores,
+            "status": statuses,
+        }
+
+    def _preprocess_batch(self, data: np.ndarray) -> np.ndarray:
+        """Row-wise equivalent of preprocessing() for a 2D array."""
+        if data.shape[1] < self.config.min_data_points:
+            raise ValueError(f"Insufficient data: {data.shape[1]} points provided, minimum {self.config.min_data_points} required.")
+        
+        if np.isnan(data).any():
+            if self.engine == "pandas":
+                # Columns of the frame are sensors, so pandas fills along time
+                data = pd.DataFrame(data.T).interpolate(method='linear', limit=5).bfill().ffill().to_numpy().T
+            else:
+                data = _fill_gaps(data, limit=5)
+        
+        return signal.medfilt(data, kernel_size=(1, 3))
+
+    def _bias_batch(self, data: np.ndarray) -> np.ndarray:
+        """Row-wise calc_bias."""
+        n_points = data.shape[1]
+        if n_points < 10:
+            return np.zeros(data.shape[0])
+        n_ref = max(1, int(n_points * 0.1))
+        return data[:, -n_ref:].mean(axis=1) - data[:, :n_ref].mean(axis=1)
+
+    def _snr_db_batch(self, data: np.ndarray) -> np.ndarray:
+        """Row-wise calc_snr_db."""
+        n_points = data.shape[1]
+        if n_points < 2:
+            return np.zeros(data.shape[0])
+        
+        p5, p95 = np.percentile(data, [5, 95], axis=1)
+        signal_pp = p95 - p5
+        signal_pp[signal_pp == 0] = 1e-6
+        
+        slope, intercept = _ols_rows(data)
+        x = _x_axis(n_points)[0]
+        noise_component = data - (slope[:, None] * x + intercept[:, None])
+        noise_rms = np.sqrt(np.mean(noise_component ** 2, axis=1))
+        noise_rms = np.maximum(noise_rms, 1e-9)
+        return 20 * np.log10(signal_pp / noise_rms)
+
+    def _hysteresis_batch(self, data: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Row-wise calc_hysteresis.
+        
+        Returns (scores, smoothed rows, mask of rows with both rising and falling edges).
+        """
+        n_sensors, n_points = data.shape
+        if n_points < 5:
+            return np.zeros(n_sensors), data, np.zeros(n_sensors, dtype=bool)
+        
+        smooth = self._smooth(data)
+        diffs = np.diff(smooth, axis=1)
+        threshold = diffs.std(axis=1, keepdims=True) * 0.5
+        
+        rising = diffs > threshold
+        falling = diffs < -threshold
+        n_rising = rising.sum(axis=1)
+        n_falling = falling.sum(axis=1)
+        has_edges = (n_rising > 0) & (n_falling > 0)
+        
+        edge_vals = data[:, :-1]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            avg_rising_val = (edge_vals * rising).sum(axis=1) / n_rising
+            avg_falling_val = (edge_vals * falling).sum(axis=1) / n_falling
+        
+        data_range = np.ptp(data, axis=1)
+        data_range[data_range <= 0] = 1.0
+        scores = np.where(has_edges, np.abs(avg_rising_val - avg_falling_val) / data_range, 0.0)
+        return scores, smooth, has_edges
+
+    def _dfa_batch(self, data: np.ndarray, order: int = 1) -> Tuple[List[float], List[float], List[list], List[list]]:
+        """Row-wise calc_dfa; fluctuations for all rows are computed per scale in one solve."""
+        n_sensors, n_points = data.shape
+        default = ([0.5] * n_sensors, [0.0] * n_sensors, [[] for _ in range(n_sensors)], [[] for _ in range(n_sensors)])
+        if n_points < 20:
+            return default
+        
+        scales = _dfa_scales(n_points, order)
+        if len(scales) < 2:
+            return default
+        
+        profile = np.cumsum(data - data.mean(axis=1, keepdims=True), axis=1)
+        fluctuations = np.stack([_dfa_fluctuation(profile, int(scale), order) for scale in scales], axis=1)
+        valid = fluctuations > 1e-10
+        
+        # Masked least squares of log F(n) on log n, one regression per row
+        weights = valid.astype(float)
+        k = weights.sum(axis=1)
+        log_scales = np.broadcast_to(np.log(scales), fluctuations.shape)
+        log_flucts = np.log(np.where(valid, fluctuations, 1.0))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_x = (weights * log_scales).sum(axis=1) / k
+            mean_y = (weights * log_flucts).sum(axis=1) / k
+            dx = (log_scales - mean_x[:, None]) * weights
+            dy = (log_flucts - mean_y[:, None]) * weights
+            sxx = (dx * dx).sum(axis=1)
+            sxy = (dx * dy).sum(axis=1)
+            syy = (dy * dy).sum(axis=1)
+            slope = sxy / sxx
+            r = np.where(sxx * syy > 0, sxy / np.sqrt(sxx * syy), 0.0)
+        r = np.clip(r, -1.0, 1.0)
+        
+        hurst, hurst_r2, out_scales, out_flucts = default
+        for i in np.flatnonzero(k >= 3):
+            hurst[i] = float(slope[i])
+            hurst_r2[i] = float(r[i] ** 2)
+            out_scales[i] = scales[valid[i]].tolist()
+            out_flucts[i] = fluctuations[i, valid[i]].tolist()
+        return hurst, hurst_r2, out_scales, out_flucts
+
+    def calc_rul(self, data: np.ndarray, slope: float, ctx: Optional[RegressionContext] = None) -> str:
         """
         Calculate Estimated Remaining Useful Life (RUL).
         Based on linear projection of current trend towards critical bias threshold.
@@ -263,9 +659,8 @@ class SensorAnalyzer:
             return "Stable (> 1 year)"
             
         # Current "level" (intercept of trend at end)
-        x = np.arange(len(data))
-        _, intercept, _, _, _ = stats.linregress(x, data)
-        current_val = slope * (len(data) - 1) + intercept
+        ctx = ctx or RegressionContext(data)
+        current_val = slope * (len(data) - 1) + ctx.intercept
         
         # Distance to critical threshold
         # We assume critical threshold is defined relative to 0 (absolute bias)
@@ -273,6 +668,18 @@ class SensorAnalyzer:
         # Let's assume critical deviation is from the *initial* value.
         initial_val = data[0] if len(data) > 0 else 0
         
+        return self.project_rul(slope, initial_val, current_val)
+
+    def project_rul(self, slope: float, initial_val: float, current_val: float) -> str:
+        """
+        Project RUL from an already-fitted trend line.
+        
+        Split out of calc_rul so callers that maintain their own regression
+        state (e.g. IncrementalSensorAnalyzer) can skip the refit.
+        """
+        if abs(slope) < 1e-6:
+            return "Stable (> 1 year)"
+        
         # Thresholds
         upper_limit = initial_val + self.config.bias_critical
         lower_limit = initial_val - self.config.bias_critical
@@ -420,3 +827,262 @@ class SensorAnalyzer:
             "flags": flags,
             "recommendation": recommendation
         }
+
+
+class IncrementalSensorAnalyzer:
+    """
+    Streaming analyzer holding per-sensor running state.
+
+    Keeps the last `window_size` points in a ring buffer together with
+    running sums (sum y, sum y^2, sum x*y, head/tail block sums), so each
+    new point updates bias, slope, noise and the SNR noise floor in O(1).
+    The expensive metrics (SNR signal range, hysteresis, DFA) go through the
+    batch SensorAnalyzer pipeline on the window every `refresh_interval`
+    points, with the same inputs as SensorAnalyzer.analyze (DFA on the
+    Savitzky-Golay residuals, bias/SNR on the preprocessed data).
+
+    At a refresh every metric equals analyze() on the window. In between,
+    slope follows the running OLS fit of the raw window, and bias, SNR and
+    noise_std follow their raw-window running values, anchored to the batch
+    values of the last refresh (offsets for bias/SNR, a scale for noise).
+    """
+
+    def __init__(self, window_size: int, config: SensorConfig = SensorConfig(), refresh_interval: int = 50):
+        if window_size < 2:
+            raise ValueError("window_size must be at least 2")
+        self.window_size = window_size
+        self.refresh_interval = max(1, refresh_interval)
+        self.analyzer = SensorAnalyzer(config)
+
+        self._buffer = np.zeros(window_size)
+        self._start = 0
+        self._count = 0
+        self._since_refresh = 0
+        self._refreshed: Dict[str, Any] = {}
+        self._reset_sums(0.0)
+
+    # ------------------------------------------------------------------
+    # State management
+    # ------------------------------------------------------------------
+
+    @property
+    def count(self) -> int:
+        """Number of points currently in the window."""
+        return self._count
+
+    @property
+    def needs_refresh(self) -> bool:
+        """True once `refresh_interval` points arrived since the last refresh."""
+        return self._since_refresh >= self.refresh_interval
+
+    def window(self) -> np.ndarray:
+        """Current window in chronological order (copy)."""
+        idx = (self._start + np.arange(self._count)) % self.window_size
+        return self._buffer[idx]
+
+    def seed(self, values: List[float]) -> None:
+        """Replace the state with the last `window_size` values and refresh."""
+        arr = np.asarray(values, dtype=float)
+        arr = arr[np.isfinite(arr)][-self.window_size:]
+
+        self._buffer[:len(arr)] = arr
+        self._start = 0
+        self._count = len(arr)
+        self.refresh()
+
+    def update(self, value: float) -> bool:
+        """
+        Append one point in O(1). Returns False if the value was rejected.
+
+        Non-finite values are dropped; gap filling only happens in the
+        batch preprocessing run during refresh.
+        """
+        value = float(value)
+        if not np.isfinite(value):
+            return False
+
+        W = self.window_size
+        v = value - self._shift
+
+        if self._count < W:
+            n = self._count
+            self._buffer[(self._start + n) % W] = value
+            self._sum_y += v
+            self._sum_yy += v * v
+            self._sum_xy += n * v
+            self._count += 1
+            if self._count == W:
+                self._init_block_sums()
+        else:
+            old = self._buffer[self._start] - self._shift
+            n_ref = self._n_ref
+            head_in = self._buffer[(self._start + n_ref) % W] - self._shift
+            tail_out = self._buffer[(self._start + W - n_ref) % W] - self._shift
+
+            # Retained points shift one position left: x_i -> x_i - 1
+            self._sum_xy = self._sum_xy - (self._sum_y - old) + (W - 1) * v
+            self._sum_y += v - old
+            self._sum_yy += v * v - old * old
+            self._head_sum += head_in - old
+            self._tail_sum += v - tail_out
+
+            self._buffer[self._start] = value
+            self._start = (self._start + 1) % W
+
+        self._since_refresh += 1
+        return True
+
+    def refresh(self) -> None:
+        """Recompute the expensive metrics and re-anchor the running sums."""
+        window = self.window()
+        self._reset_sums(float(np.mean(window)) if len(window) else 0.0)
+        v = window - self._shift
+        self._sum_y = float(np.sum(v))
+        self._sum_yy = float(np.dot(v, v))
+        self._sum_xy = float(np.dot(_x_axis(len(v))[0], v))
+        if self._count == self.window_size:
+            self._init_block_sums()
+
+        self._refreshed = self._expensive_metrics(window)
+        if self._refreshed:
+            ols_rms = self._ols_rms()
+            if ols_rms > 1e-12:
+                self._refreshed["noise_scale"] = self._refreshed["noise_std"] / ols_rms
+            self._refreshed["bias_offset"] = self._refreshed["bias"] - self._raw_bias()
+            self._refreshed["snr_offset"] = self._refreshed["snr_db"] - self._raw_snr_db()
+        self._since_refresh = 0
+
+    def _reset_sums(self, shift: float) -> None:
+        # Sums are kept relative to `shift` to avoid cancellation on large offsets
+        self._shift = shift
+        self._sum_y = 0.0
+        self._sum_yy = 0.0
+        self._sum_xy = 0.0
+        self._n_ref = max(1, int(self.window_size * 0.1))
+        self._head_sum = 0.0
+        self._tail_sum = 0.0
+
+    def _init_block_sums(self) -> None:
+        window = self.window() - self._shift
+        self._head_sum = float(np.sum(window[:self._n_ref]))
+        self._tail_sum = float(np.sum(window[-self._n_ref:]))
+
+    def _expensive_metrics(self, window: np.ndarray) -> Dict[str, Any]:
+        """Batch metrics of the window, computed from the same inputs as SensorAnalyzer.analyze."""
+        if len(window) < max(self.analyzer.config.min_data_points, 2):
+            return {}
+
+        clean_data = self.analyzer.preprocessing(window.tolist())
+        _, residuals = self.analyzer.decompose_signal(clean_data)
+        hysteresis, hyst_x, hyst_y = self.analyzer.calc_hysteresis(clean_data)
+        hurst, hurst_r2, dfa_scales, dfa_flucts = self.analyzer.calc_dfa(residuals)
+        return {
+            "signal_pp": float(np.percentile(window, 95) - np.percentile(window, 5)),
+            "bias": self.analyzer.calc_bias(clean_data),
+            "snr_db": self.analyzer.calc_snr_db(clean_data),
+            "noise_std": float(np.std(residuals)),
+            "hysteresis": hysteresis,
+            "hysteresis_x": hyst_x,
+            "hysteresis_y": hyst_y,
+            "hurst": hurst,
+            "hurst_r2": hurst_r2,
+            "dfa_scales": dfa_scales,
+            "dfa_fluctuations": dfa_flucts,
+        }
+
+    # ------------------------------------------------------------------
+    # O(1) metrics
+    # ------------------------------------------------------------------
+
+    def _regression(self) -> Tuple[float, float, float]:
+        """OLS slope, intercept and residual sum of squares from running sums."""
+        n = self._count
+        mean_y = self._sum_y / n
+        if n < 2:
+            return 0.0, mean_y + self._shift, 0.0
+
+        sum_x = n * (n - 1) / 2.0
+        sxx = n * (n - 1) * (n + 1) / 12.0  # sum((x - x_mean)^2) for x = 0..n-1
+        sxy = self._sum_xy - sum_x * mean_y
+        syy = max(self._sum_yy - n * mean_y * mean_y, 0.0)
+
+        slope = sxy / sxx
+        intercept = mean_y - slope * (sum_x / n) + self._shift
+        sse = max(syy - slope * sxy, 0.0)
+        return slope, intercept, sse
+
+    def _raw_bias(self) -> float:
+        """SensorAnalyzer.calc_bias of the raw window."""
+        n = self._count
+        if n < 10:
+            return 0.0
+        if n == self.window_size:
+            return float((self._tail_sum - self._head_sum) / self._n_ref)
+        return self.analyzer.calc_bias(self.window())
+
+    def bias(self) -> float:
+        """Raw-window bias, anchored to the batch bias at the last refresh."""
+        if self._count < 10:
+            return 0.0
+        return float(self._raw_bias() + self._refreshed.get("bias_offset", 0.0))
+
+    def slope(self) -> float:
+        """Same definition as SensorAnalyzer.calc_slope."""
+        if self._count < 2:
+            return 0.0
+        return float(self._regression()[0])
+
+    def _ols_rms(self) -> float:
+        """RMS of the window's residuals around the running OLS line."""
+        n = self._count
+        if n < 2:
+            return 0.0
+        return float(np.sqrt(self._regression()[2] / n))
+
+    def noise_std(self) -> float:
+        """Detrended noise, anchored to the batch residual std at the last refresh."""
+        return float(self._ols_rms() * self._refreshed.get("noise_scale", 1.0))
+
+    def _raw_snr_db(self) -> float:
+        """SNR with the live raw-window noise floor and the last refreshed signal range."""
+        n = self._count
+        if n < 2:
+            return 0.0
+        signal_pp = self._refreshed.get("signal_pp", 0.0)
+        if signal_pp == 0:
+            signal_pp = 1e-6
+        noise_rms = self._ols_rms()
+        if noise_rms < 1e-9:
+            noise_rms = 1e-9
+        return float(20 * np.log10(signal_pp / noise_rms))
+
+    def snr_db(self) -> float:
+        """Raw-window SNR, anchored to the batch SNR at the last refresh."""
+        if self._count < 2:
+            return 0.0
+        return float(self._raw_snr_db() + self._refreshed.get("snr_offset", 0.0))
+
+    def rul(self) -> str:
+        """RUL projection from the running regression line."""
+        if self._count == 0:
+            return self.analyzer.project_rul(0.0, 0.0, 0.0)
+        slope, intercept, _ = self._regression()
+        current_val = slope * (self._count - 1) + intercept
+        return self.analyzer.project_rul(slope, float(self._buffer[self._start]), current_val)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Metrics dict in the same shape as the background analysis pipeline."""
+        refreshed = self._refreshed
+        return {
+            "bias": self.bias(),
+            "slope": self.slope(),
+            "noise_std": self.noise_std(),
+            "snr_db": self.snr_db(),
+            "hysteresis": refreshed.get("hysteresis", 0.0),
+            "hysteresis_x": refreshed.get("hysteresis_x", []),
+            "hysteresis_y": refreshed.get("hysteresis_y", []),
+            "hurst": refreshed.get("hurst", 0.5),
+            "hurst_r2": refreshed.get("hurst_r2", 0.0),
+            "dfa_scales": refreshed.get("dfa_scales", []),
+            "dfa_fluctuations": refreshed.get("dfa_fluctuations", []),
+        }
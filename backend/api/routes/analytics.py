@@ -5,28 +5,32 @@ Handles sensor data analysis endpoints and background analysis tasks.
 Protected with JWT authentication - requires valid access token.
 """
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, status
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc
 from backend.database import get_db
-from backend.models_db import SensorReading, AnalysisResultDB, User
-from backend.models import SensorDataInput, AnalysisResult, AnalysisMetrics
-from backend.analysis import SensorAnalyzer
+from backend.models_db import AnalysisArtifact, AnalysisResultDB, User
+from backend.models import SensorConfig, SensorDataInput, AnalysisResult, AnalysisMetrics
+from backend.analysis import IncrementalSensorAnalyzer
 from backend.core.config import settings
+from backend.repositories.readings import ReadingSeries, ReadingStore
+from backend.repositories.rollups import RollupStore, resolution_for_span, select_resolution
+from backend.core.cache import analysis_cache_key, get_cached_analysis, set_cached_analysis
+from backend.core.downsample import downsample_metrics
+from backend.core.encoding import SERIES_FIELDS, compact_metrics, expand_metrics
+from backend.core.executor import analysis_executor, analyze_rolling_values, analyze_values, seed_stream_state
 from backend.api.deps import DevUser, DbSession
-from typing import Optional
+from typing import Any, Dict, Optional
+from collections import OrderedDict
 from datetime import datetime, timedelta
-import numpy as np
+import asyncio
 import logging
+import weakref
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/analyze", tags=["Analytics"])
 
-# Shared analyzer instance
-analyzer = SensorAnalyzer()
-
-
 # Extended Models for Timestamps
 from typing import List
 class AnalysisMetricsExtended(AnalysisMetrics):
@@ -41,24 +45,45 @@ class AnalysisResultExtended(AnalysisResult):
     metrics: AnalysisMetricsExtended
 
 
-async def save_analysis_result(db: AsyncSession, sensor_id: str, result: AnalysisResult):
+async def save_analysis_result(
+    db: AsyncSession,
+    sensor_id: str,
+    result: AnalysisResult,
+    metrics: Optional[Dict[str, Any]] = None,
+):
     """
     Save analysis result to database asynchronously.
     
+    Scalar metrics go to typed columns of analysis_results; the series go
+    to analysis_artifacts, base64/float32-encoded when
+    settings.compact_metrics_storage is enabled.
+    
     Args:
         db: Database session
         sensor_id: Sensor identifier
         result: Analysis result to save
+        metrics: Metrics dict to store instead of result.metrics (lists or arrays)
     """
     try:
+        if metrics is None:
+            metrics = result.metrics.dict() if hasattr(result.metrics, 'dict') else result.metrics.model_dump()
+        scalars = {
+            name: float(metrics[name])
+            for name in AnalysisResultDB.SCALAR_METRICS
+            if metrics.get(name) is not None
+        }
+        series = {k: v for k, v in metrics.items() if k not in AnalysisResultDB.SCALAR_METRICS}
+        series = compact_metrics(series) if settings.compact_metrics_storage else expand_metrics(series)
+        
         db_result = AnalysisResultDB(
             sensor_id=sensor_id,
             timestamp=datetime.fromisoformat(result.timestamp),
             health_score=result.health_score,
             status=result.status,
-            metrics=result.metrics.dict() if hasattr(result.metrics, 'dict') else result.metrics.model_dump(),
             diagnosis=result.diagnosis,
-            recommendation=result.recommendation
+            recommendation=result.recommendation,
+            artifact=AnalysisArtifact(series=series),
+            **scalars
         )
         db.add(db_result)
         await db.commit()
@@ -68,60 +93,103 @@ async def save_analysis_result(db: AsyncSession, sensor_id: str, result: Analysi
         await db.rollback()
 
 
-async def run_background_analysis(sensor_id: str, db_session_factory):
+class StreamStates:
+    """
+    Per-sensor IncrementalSensorAnalyzer states for run_background_analysis.
+
+    Holds at most `maxsize` sensors, evicting the least recently analyzed
+    (its window is reloaded from the database on its next point). Each
+    sensor has a lock so concurrent analyses of one sensor run one after
+    another instead of overwriting each other's state.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._states: "OrderedDict[str, IncrementalSensorAnalyzer]" = OrderedDict()
+        # Locks live as long as a task holds or waits for them
+        self._locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+    def lock(self, sensor_id: str) -> asyncio.Lock:
+        lock = self._locks.get(sensor_id)
+        if lock is None:
+            lock = self._locks[sensor_id] = asyncio.Lock()
+        return lock
+
+    def get(self, sensor_id: str) -> Optional[IncrementalSensorAnalyzer]:
+        state = self._states.get(sensor_id)
+        if state is not None:
+            self._states.move_to_end(sensor_id)
+        return state
+
+    def set(self, sensor_id: str, state: IncrementalSensorAnalyzer) -> None:
+        self._states[sensor_id] = state
+        self._states.move_to_end(sensor_id)
+        while len(self._states) > self.maxsize:
+            self._states.popitem(last=False)
+
+    def discard(self, sensor_id: str) -> None:
+        """Forget a sensor's state (e.g. when the sensor is deleted)."""
+        self._states.pop(sensor_id, None)
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+
+stream_states = StreamStates(settings.stream_state_cache_size)
+
+
+async def run_background_analysis(sensor_id: str, db_session_factory, value: Optional[float] = None):
     """
     Background task to run analysis on recent data.
     
+    Streamed points are folded into a per-sensor IncrementalSensorAnalyzer
+    in O(1). The window is (re)loaded from the database only when there is
+    no state yet, when no value is given, or when the analyzer is due for
+    its periodic refresh - which also resynchronises points ingested by
+    other workers. The refresh itself runs in the analysis executor.
+    Analyses of the same sensor are serialized by its stream_states lock.
+    
     Args:
         sensor_id: Sensor to analyze
         db_session_factory: Async session factory
+        value: Newly streamed value, if any
     """
-    async with db_session_factory() as db:
+    async with stream_states.lock(sensor_id), db_session_factory() as db:
         logger.info(f"Running background analysis for {sensor_id}")
         
-        # Fetch last N readings
-        window_size = settings.default_window_size
-        stmt = (
-            select(SensorReading)
-            .where(SensorReading.sensor_id == sensor_id)
-            .order_by(desc(SensorReading.timestamp))
-            .limit(window_size)
-        )
-        result = await db.execute(stmt)
-        readings = result.scalars().all()
-        
-        if len(readings) < 10:
-            logger.info("Not enough data for background analysis")
-            return
-
-        # Prepare values (reverse to chronological order)
-        values = [r.value for r in reversed(readings)]
+        state = stream_states.get(sensor_id)
+        if state is None or value is None or state.needs_refresh:
+            # Fetch last N readings
+            window_size = settings.default_window_size
+            values = (await ReadingStore(db).latest(sensor_id, window_size)).values
+            
+            if len(values) < 10:
+                logger.info("Not enough data for background analysis")
+                return
+            
+            if state is None:
+                state = IncrementalSensorAnalyzer(
+                    window_size,
+                    refresh_interval=settings.incremental_refresh_interval
+                )
+                stream_states.set(sensor_id, state)
+            try:
+                state = await analysis_executor.run(seed_stream_state, state, values)
+                stream_states.set(sensor_id, state)
+            except Exception as e:
+                logger.error(f"Background analysis error: {e}", exc_info=True)
+                return
+        else:
+            state.update(value)
+            if state.count < 10:
+                logger.info("Not enough data for background analysis")
+                return
         
         # Analyze
         try:
-            clean_data = analyzer.preprocessing(values)
-            bias = analyzer.calc_bias(clean_data)
-            slope = analyzer.calc_slope(clean_data)
-            noise_std = float(np.std(clean_data))
-            snr_db = analyzer.calc_snr_db(clean_data)
-            hysteresis, hyst_x, hyst_y = analyzer.calc_hysteresis(clean_data)
-            hurst, hurst_r2, dfa_scales, dfa_flucts = analyzer.calc_dfa(clean_data)
-            
-            metrics_dict = {
-                "bias": bias,
-                "slope": slope,
-                "noise_std": noise_std,
-                "snr_db": snr_db,
-                "hysteresis": hysteresis,
-                "hysteresis_x": hyst_x,
-                "hysteresis_y": hyst_y,
-                "hurst": hurst,
-                "hurst_r2": hurst_r2,
-                "dfa_scales": dfa_scales,
-                "dfa_fluctuations": dfa_flucts
-            }
-            health = analyzer.get_health_score(metrics_dict)
-            rul = analyzer.calc_rul(clean_data, slope)
+            metrics_dict = state.metrics()
+            health = state.analyzer.get_health_score(metrics_dict)
+            rul = state.rul()
             
             analysis_result = AnalysisResult(
                 sensor_id=sensor_id,
@@ -142,11 +210,45 @@ async def run_background_analysis(sensor_id: str, db_session_factory):
             logger.error(f"Background analysis error: {e}", exc_info=True)
 
 
+async def _range_series(
+    db: AsyncSession,
+    sensor_id: str,
+    start: datetime,
+    end: datetime,
+    resolution: Optional[int] = None,
+) -> ReadingSeries:
+    """
+    Readings for a date range, capped at settings.max_analysis_points.
+
+    With `resolution` (seconds), the bucket means of the coarsest rollup
+    tier not coarser than it are analyzed (raw readings if no tier is that
+    fine). When the rollup tiers estimate more raw readings than the cap,
+    the finest tier that fits is the minimum, instead of truncating the
+    range to its first max_analysis_points readings. Either way, at most
+    the first max_analysis_points points of the range are returned.
+    """
+    limit = settings.max_analysis_points
+    if settings.rollup_enabled:
+        rollups = RollupStore(db)
+        resolution = select_resolution(resolution) if resolution else None
+        if await rollups.count(sensor_id, start, end) > limit:
+            resolution = max(resolution or 0, resolution_for_span(start, end, limit))
+        if resolution:
+            buckets = await rollups.series(sensor_id, start, end, resolution)
+            if len(buckets):
+                logger.info(f"Analyzing {len(buckets)} {resolution}s rollup buckets for {sensor_id}")
+                return ReadingSeries(buckets.timestamps[:limit], buckets.mean[:limit])
+    return await ReadingStore(db).range(sensor_id, start, end, limit=limit)
+
+
 @router.post("", response_model=AnalysisResultExtended)
 async def analyze_sensor(
     data: SensorDataInput,
     db: DbSession,
     current_user: DevUser = None,
+    compact: bool = Query(False, description="Return series as base64 float32 buffers"),
+    max_points: Optional[int] = Query(None, ge=3, description="Downsample chart series (LTTB) to this many points"),
+    resolution: Optional[int] = Query(None, ge=1, description="Date ranges: analyze rollup buckets of up to this many seconds"),
 ):
     """
     Analyze sensor data.
@@ -157,10 +259,24 @@ async def analyze_sensor(
     1. Ad-hoc analysis: Provide values directly in the request
     2. Database analysis: Sensor data is fetched from database using sensor_id
     
+    With `compact=true` the trend, residuals, hysteresis and DFA series are
+    returned base64-encoded (float32) and the metrics carry
+    `"encoding": "f32-base64"`; see backend/core/encoding.py.
+    
+    With `max_points` the timestamps, trend, residuals and hysteresis
+    series are reduced with LTTB for charting; the stored result keeps the
+    full window.
+    
+    With `resolution` (seconds), a date range is analyzed on the bucket
+    means of the coarsest rollup tier not coarser than it.
+    
     Args:
         data: Sensor data input (values or sensor_id with config)
         db: Database session
         current_user: Authenticated user (optional in development)
+        compact: Encode series instead of returning JSON lists
+        max_points: Maximum points per chart series in the response
+        resolution: Requested bucket width (seconds) for date range analysis
         
     Returns:
         AnalysisResultExtended: Analysis result with metrics
@@ -170,6 +286,8 @@ async def analyze_sensor(
     
     values = data.values
     timestamps_iso = []
+    # Timestamps that identify the window in the result cache
+    cache_timestamps = data.timestamps
     
     # If no values provided, fetch from database
     if not values or len(values) == 0:
@@ -193,21 +311,10 @@ async def analyze_sensor(
                 if isinstance(end_date, str):
                     end_date = datetime.fromisoformat(end_date)
                 
-                stmt = (
-                    select(SensorReading)
-                    .where(
-                        SensorReading.sensor_id == data.sensor_id,
-                        SensorReading.timestamp >= start_date,
-                        SensorReading.timestamp <= end_date
-                    )
-                    .order_by(SensorReading.timestamp.asc())
-                    .limit(settings.max_analysis_points)
-                )
-                
-                result = await db.execute(stmt)
-                readings = result.scalars().all()
-                values = [r.value for r in readings]
-                timestamps_iso = [r.timestamp.isoformat() for r in readings]
+                series = await _range_series(db, data.sensor_id, start_date, end_date, resolution)
+                values = series.values
+                timestamps_iso = series.isoformat()
+                cache_timestamps = timestamps_iso
                 
             except Exception as e:
                 logger.error(f"Date range query error: {e}")
@@ -223,19 +330,10 @@ async def analyze_sensor(
                 if cfg_window:
                     window_size = min(cfg_window, settings.max_analysis_points)
 
-            stmt = (
-                select(SensorReading)
-                .where(SensorReading.sensor_id == data.sensor_id)
-                .order_by(desc(SensorReading.timestamp))
-                .limit(window_size)
-            )
-            result = await db.execute(stmt)
-            readings = result.scalars().all()
-            
-            # Restore chronological order
-            readings_asc = list(reversed(readings))
-            values = [r.value for r in readings_asc]
-            timestamps_iso = [r.timestamp.isoformat() for r in readings_asc]
+            series = await ReadingStore(db).latest(data.sensor_id, window_size)
+            values = series.values
+            timestamps_iso = series.isoformat()
+            cache_timestamps = timestamps_iso
         
         # Return empty result if insufficient data
         if len(values) < 5:
@@ -268,21 +366,44 @@ async def analyze_sensor(
                 for i in range(len(values))
             ]
 
-    # Create analyzer with custom config if provided
-    current_analyzer = SensorAnalyzer(config=data.config) if data.config else analyzer
-    
     try:
-        # Perform analysis
-        analysis_result = current_analyzer.analyze(values)
+        # Identical windows are served from the result cache; otherwise
+        # analyze off the event loop (custom config if provided)
+        cache_key = analysis_cache_key(values, cache_timestamps, data.config)
+        analysis_result = await get_cached_analysis(cache_key)
+        if analysis_result is None:
+            analysis_result = await analysis_executor.run(analyze_values, values, data.config, True)
+            await set_cached_analysis(cache_key, analysis_result)
         
-        metrics_dict = analysis_result["metrics"]
-        metrics_dict["timestamps"] = timestamps_iso
+        # Series come back as numpy arrays; they are only turned into
+        # lists for the plain JSON response
+        metrics_dict = {**analysis_result["metrics"], "timestamps": timestamps_iso}
         
         health = analysis_result["health"]
         rul_prediction = analysis_result["prediction"]
         
+        chart_metrics = downsample_metrics(metrics_dict, max_points) if max_points else metrics_dict
+        
+        if compact:
+            metrics_out = compact_metrics(chart_metrics)
+            result_obj = AnalysisResult(
+                sensor_id=data.sensor_id,
+                timestamp=datetime.now().isoformat(),
+                health_score=health["score"],
+                status=health["status"],
+                diagnosis=health["diagnosis"],
+                metrics=AnalysisMetrics(**{k: v for k, v in metrics_dict.items() if k not in SERIES_FIELDS}),
+                flags=health["flags"],
+                recommendation=health["recommendation"],
+                prediction=rul_prediction
+            )
+            await save_analysis_result(db, data.sensor_id, result_obj, metrics=metrics_dict)
+            
+            logger.info(f"Analysis completed for {data.sensor_id}: health={health['score']:.1f}")
+            return JSONResponse({**result_obj.model_dump(), "metrics": metrics_out})
+        
         # Construct extended model
-        metrics_obj = AnalysisMetricsExtended(**metrics_dict)
+        metrics_obj = AnalysisMetricsExtended(**expand_metrics(chart_metrics))
         
         result_obj = AnalysisResultExtended(
             sensor_id=data.sensor_id,
@@ -297,7 +418,7 @@ async def analyze_sensor(
         )
         
         # Save to database
-        await save_analysis_result(db, data.sensor_id, result_obj)
+        await save_analysis_result(db, data.sensor_id, result_obj, metrics=metrics_dict)
         
         logger.info(f"Analysis completed for {data.sensor_id}: health={health['score']:.1f}")
         return result_obj
@@ -375,22 +496,13 @@ async def analyze_sensor_async(
     
     if not values or len(values) == 0:
         # Fetch from database
-        stmt = (
-            select(SensorReading)
-            .where(SensorReading.sensor_id == request.sensor_id)
-            .order_by(desc(SensorReading.timestamp))
-            .limit(1000)
-        )
-        result = await db.execute(stmt)
-        readings = result.scalars().all()
+        values = (await ReadingStore(db).latest(request.sensor_id, 1000)).values
         
-        if not readings:
+        if len(values) == 0:
             raise HTTPException(
                 status_code=404,
                 detail=f"No data found for sensor {request.sensor_id}"
             )
-        
-        values = [r.value for r in reversed(readings)]
     
     # Try async mode with Celery
     if request.use_async:
@@ -402,7 +514,7 @@ async def analyze_sensor_async(
                 # Submit to Celery
                 task = analyze_sensor_data.delay(
                     sensor_id=request.sensor_id,
-                    values=values,
+                    values=list(map(float, values)),
                     sensor_type=request.sensor_type,
                     config=request.config
                 )
@@ -431,8 +543,12 @@ async def analyze_sensor_async(
     logger.info(f"Running synchronous analysis for {request.sensor_id} (task_id={fake_task_id})")
     
     try:
-        # Note: analyzer.analyze() takes raw_data, not keyword args
-        analysis_result = analyzer.analyze(raw_data=values)
+        config = SensorConfig(**request.config) if request.config else None
+        cache_key = analysis_cache_key(values, None, config)
+        analysis_result = await get_cached_analysis(cache_key)
+        if analysis_result is None:
+            analysis_result = await analysis_executor.run(analyze_values, values, config, True)
+            await set_cached_analysis(cache_key, analysis_result)
         
         # Store result temporarily (in production, use Redis or DB)
         # For now, return a special response indicating sync completion
@@ -451,3 +567,94 @@ async def analyze_sensor_async(
             detail=f"Analysis failed: {str(e)}"
         )
 
+
+
+# =============================================================================
+# Rolling-Window Analysis
+# =============================================================================
+
+class RollingAnalysisRequest(BaseModel):
+    """Request model for rolling-window analysis."""
+    sensor_id: str = Field(..., description="Sensor ID to analyze")
+    values: List[float] = Field(default=[], description="Optional values override (oldest first)")
+    timestamps: Optional[List[str]] = Field(default=None, description="Timestamps matching values")
+    window: int = Field(default=100, ge=10, le=settings.max_analysis_points, description="Points per window")
+    step: int = Field(default=10, ge=1, description="Points between window starts")
+    config: Optional[SensorConfig] = Field(default=None, description="Analysis configuration")
+
+
+class RollingAnalysisResponse(BaseModel):
+    """Health-score time series, one entry per window."""
+    sensor_id: str
+    window: int
+    step: int
+    timestamps: List[str] = Field(default=[], description="Timestamp of each window's last point")
+    end_index: List[int]
+    health_score: List[float]
+    status: List[str]
+    bias: List[float]
+    slope: List[float]
+    noise_std: List[float]
+    snr_db: List[float]
+
+
+@router.post("/rolling", response_model=RollingAnalysisResponse)
+async def analyze_sensor_rolling(
+    request: RollingAnalysisRequest,
+    db: DbSession,
+    current_user: DevUser = None,
+):
+    """
+    Analyze sliding windows of a series and return health over time.
+    
+    Bias, slope, noise and SNR are computed for every window in one
+    vectorized pass (SensorAnalyzer.analyze_rolling), replacing repeated
+    `/analyze` calls over shifted ranges.
+    
+    **Authentication**: Required in production, optional in development.
+    
+    Args:
+        request: Series (or sensor_id to load the latest readings), window and step
+        db: Database session
+        current_user: Authenticated user (optional in development)
+        
+    Returns:
+        RollingAnalysisResponse with one entry per window
+        
+    Raises:
+        HTTPException 400: Fewer values than one window
+        HTTPException 413: More than settings.max_analysis_points values
+    """
+    if len(request.values) > settings.max_analysis_points:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.max_analysis_points} values per rolling analysis"
+        )
+    values = request.values
+    timestamps_iso = request.timestamps or []
+    
+    if not values:
+        series = await ReadingStore(db).latest(request.sensor_id, settings.max_analysis_points)
+        values = series.values
+        timestamps_iso = series.isoformat()
+    
+    if len(values) < request.window:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Insufficient data: {len(values)} points for a window of {request.window}"
+        )
+    
+    try:
+        result = await analysis_executor.run(
+            analyze_rolling_values, values, request.window, request.step, request.config
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Rolling analysis failed: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Analysis error: {str(e)}")
+    
+    if len(timestamps_iso) == len(values):
+        result["timestamps"] = [timestamps_iso[i] for i in result["end_index"]]
+    
+    return RollingAnalysisResponse(sensor_id=request.sensor_id, **result)
@@ -11,24 +11,39 @@ Security:
 """
 
 from typing import List, Optional
-from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form, BackgroundTasks, status
+from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form, BackgroundTasks, Query, WebSocket, WebSocketDisconnect, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, insert, desc, func, delete
+from sqlalchemy.orm import selectinload
+from sqlalchemy import select, desc, func, delete, tuple_
+from sqlalchemy.exc import SQLAlchemyError
 from backend.database import get_db, AsyncSessionLocal
-from backend.models_db import Sensor, SensorReading, AnalysisResultDB, SourceType, Role, User
+from backend.models_db import Sensor, SensorReading, ReadingBlock, ReadingRollup, AnalysisResultDB, AnalysisArtifact, SourceType, Role, User
 from backend.models import SensorCreate, SensorResponse, AnalysisResult, AnalysisMetrics
+from backend.core.config import settings
+from backend.core.downsample import downsample_metrics
+from backend.core.csv_import import PipelineStats, SensorImportCounts, parse_chunk, parse_chunks, parse_wide_chunk, pipeline
+from backend.core.encoding import expand_metrics
+from backend.core.ingest import INSERT_MODE_COPY, INSERT_MODE_EXECUTEMANY, copy_supported, ingest_buffer, parse_frame, write_readings
+from backend.core.metrics import INGEST_WS_CONNECTIONS, INGEST_WS_POINTS
+from backend.core.pagination import decode_cursor, encode_cursor, page_total
+from backend.repositories.sensors import SENSOR_ORDER, with_latest_analysis
 from backend.schemas.common import PaginationParams, PaginatedResponse
-from backend.schemas.sensor import SensorReadingBulk, CSVImportResult
+from backend.schemas.sensor import CSVImportResult, CSVSensorImportStats, CSVWideImportResult, StreamBatch
 from backend.api.deps import (
     DbSession,
     CurrentUser,
     CurrentActiveUser,
     RoleChecker,
     get_current_active_user,
+    get_current_user,
 )
+import asyncio
+from contextlib import aclosing
+from functools import partial
 from datetime import datetime
 import logging
 import csv
+import json
 import codecs
 import uuid
 import math
@@ -87,6 +102,107 @@ async def get_sensor_with_org_check(
     return sensor
 
 
+async def get_sensors_with_org_check(
+    sensor_ids: List[str],
+    user: User,
+    db: AsyncSession
+) -> dict:
+    """
+    Get several sensors by ID with one query and the organization ownership check.
+    
+    Args:
+        sensor_ids: Sensor IDs to fetch
+        user: Current authenticated user
+        db: Database session
+        
+    Returns:
+        Dict of sensor_id -> Sensor
+        
+    Raises:
+        HTTPException 404: Any sensor not found or not owned by user's organization
+    """
+    result = await db.execute(
+        select(Sensor).where(Sensor.id.in_(set(sensor_ids)))
+    )
+    sensors = {sensor.id: sensor for sensor in result.scalars()}
+    
+    # Foreign sensors are reported as missing to not leak their existence
+    missing = [
+        sensor_id for sensor_id in dict.fromkeys(sensor_ids)
+        if sensor_id not in sensors
+        or (user.role != Role.SUPER_ADMIN and sensors[sensor_id].organization_id != user.organization_id)
+    ]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Sensör bulunamadı: {', '.join(missing)}"
+        )
+    
+    return sensors
+
+
+def _sensor_response(
+    sensor: Sensor,
+    health_score: Optional[float] = None,
+    status_: Optional[str] = None,
+    analysis_timestamp: Optional[datetime] = None,
+) -> SensorResponse:
+    """
+    Build a SensorResponse from a sensor and its latest analysis columns.
+    
+    Sensors without analyses report a healthy default.
+    """
+    return SensorResponse(
+        id=sensor.id,
+        name=sensor.name,
+        location=sensor.location,
+        source_type=sensor.source_type,
+        organization_id=sensor.organization_id,
+        raw_retention_days=sensor.raw_retention_days,
+        latest_health_score=health_score if health_score is not None else 100.0,
+        latest_status=status_ or "Normal",
+        latest_analysis_timestamp=analysis_timestamp
+    )
+
+
+def _decode_cursor(cursor: str) -> tuple:
+    """Decode a pagination cursor, rejecting malformed ones with 400."""
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def _paginated(
+    items: list,
+    pagination: PaginationParams,
+    total: Optional[int],
+    estimated: bool,
+    next_cursor: Optional[str],
+) -> PaginatedResponse:
+    """Build a page response; page numbers are only reported in page mode."""
+    return PaginatedResponse(
+        items=items,
+        total=total,
+        page=None if pagination.cursor else pagination.page,
+        size=pagination.size,
+        pages=math.ceil(total / pagination.size) if total is not None else None,
+        next_cursor=next_cursor,
+        total_is_estimate=estimated
+    )
+
+
+async def _latest_analysis(db: AsyncSession, sensor_id: str) -> tuple:
+    """(health_score, status, timestamp) of the sensor's latest analysis, or Nones."""
+    stmt = (
+        select(AnalysisResultDB.health_score, AnalysisResultDB.status, AnalysisResultDB.timestamp)
+        .where(AnalysisResultDB.sensor_id == sensor_id)
+        .order_by(desc(AnalysisResultDB.timestamp))
+        .limit(1)
+    )
+    return tuple((await db.execute(stmt)).first() or (None, None, None))
+
+
 # ==============================================================================
 # LIST / READ ENDPOINTS
 # ==============================================================================
@@ -107,53 +223,38 @@ async def get_sensors(
     """
     # Build base query with organization filter
     base_query = select(Sensor)
-    count_query = select(func.count()).select_from(Sensor)
     
     # Apply org filter (SUPER_ADMIN sees all)
     if current_user.role != Role.SUPER_ADMIN:
         base_query = base_query.where(Sensor.organization_id == current_user.organization_id)
-        count_query = count_query.where(Sensor.organization_id == current_user.organization_id)
     
     # Count total
-    total = await db.scalar(count_query)
+    total, estimated = await page_total(db, base_query.with_only_columns(Sensor.id), pagination.total_mode)
+    
+    # Get items: keyset seek with a cursor, OFFSET otherwise. One extra
+    # row tells whether there is a next page. Latest analyses come back
+    # in the same query.
+    page_query = base_query.order_by(*SENSOR_ORDER).limit(pagination.size + 1)
+    if pagination.cursor:
+        page_query = page_query.where(tuple_(*SENSOR_ORDER) > tuple_(*_decode_cursor(pagination.cursor)))
+    else:
+        page_query = page_query.offset((pagination.page - 1) * pagination.size)
+    rows = (await db.execute(with_latest_analysis(page_query))).all()
     
-    # Get items with pagination
-    stmt = base_query.offset((pagination.page - 1) * pagination.size).limit(pagination.size)
-    result = await db.execute(stmt)
-    sensors = result.scalars().all()
-    
-    sensor_responses = []
-    for s in sensors:
-        stmt = (
-            select(AnalysisResultDB)
-            .where(AnalysisResultDB.sensor_id == s.id)
-            .order_by(desc(AnalysisResultDB.timestamp))
-            .limit(1)
-        )
-        res = await db.execute(stmt)
-        latest_analysis = res.scalar_one_or_none()
-        
-        response = SensorResponse(
-            id=s.id,
-            name=s.name,
-            location=s.location,
-            source_type=s.source_type,
-            organization_id=s.organization_id,
-            latest_health_score=latest_analysis.health_score if latest_analysis else 100.0,
-            latest_status=latest_analysis.status if latest_analysis else "Normal",
-            latest_analysis_timestamp=latest_analysis.timestamp if latest_analysis else None
-        )
-        sensor_responses.append(response)
+    next_cursor = None
+    if len(rows) > pagination.size:
+        rows = rows[:pagination.size]
+        last = rows[-1][0]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    
+    sensor_responses = [
+        _sensor_response(s, health_score, status_, analysis_ts)
+        for s, health_score, status_, analysis_ts in rows
+    ]
     
     logger.info(f"User {current_user.email} listed {len(sensor_responses)} sensors")
     
-    return PaginatedResponse(
-        items=sensor_responses,
-        total=total or 0,
-        page=pagination.page,
-        size=pagination.size,
-        pages=math.ceil(total / pagination.size) if total else 0
-    )
+    return _paginated(sensor_responses, pagination, total, estimated, next_cursor)
 
 
 @router.get("/{sensor_id}", response_model=SensorResponse)
@@ -171,32 +272,15 @@ async def get_sensor(
     """
     sensor = await get_sensor_with_org_check(sensor_id, current_user, db)
     
-    # Get latest analysis
-    stmt = (
-        select(AnalysisResultDB)
-        .where(AnalysisResultDB.sensor_id == sensor.id)
-        .order_by(desc(AnalysisResultDB.timestamp))
-        .limit(1)
-    )
-    res = await db.execute(stmt)
-    latest_analysis = res.scalar_one_or_none()
-    
-    return SensorResponse(
-        id=sensor.id,
-        name=sensor.name,
-        location=sensor.location,
-        source_type=sensor.source_type,
-        organization_id=sensor.organization_id,
-        latest_health_score=latest_analysis.health_score if latest_analysis else 100.0,
-        latest_status=latest_analysis.status if latest_analysis else "Normal",
-        latest_analysis_timestamp=latest_analysis.timestamp if latest_analysis else None
-    )
+    return _sensor_response(sensor, *await _latest_analysis(db, sensor.id))
 
 
 @router.get("/{sensor_id}/history", response_model=PaginatedResponse[AnalysisResult])
 async def get_sensor_history(
     sensor_id: str,
     pagination: PaginationParams = Depends(),
+    max_points: Optional[int] = Query(None, ge=3, description="Downsample chart series (LTTB) to this many points"),
+    include_series: bool = Query(False, description="Include chart series (trend, residuals, hysteresis, DFA)"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
@@ -204,6 +288,9 @@ async def get_sensor_history(
     Get paginated analysis history for a sensor.
     
     Users can only access history for sensors belonging to their organization.
+    Items carry scalar metrics only; with `include_series` the chart series
+    are loaded from analysis_artifacts as well (one extra query per page),
+    and `max_points` reduces them with LTTB.
     
     **Authentication**: Required
     """
@@ -211,28 +298,42 @@ async def get_sensor_history(
     await get_sensor_with_org_check(sensor_id, current_user, db)
     
     # Count total
-    count_stmt = (
-        select(func.count())
-        .select_from(AnalysisResultDB)
-        .where(AnalysisResultDB.sensor_id == sensor_id)
+    history_query = select(AnalysisResultDB).where(AnalysisResultDB.sensor_id == sensor_id)
+    total, estimated = await page_total(
+        db, history_query.with_only_columns(AnalysisResultDB.id), pagination.total_mode
     )
-    total = await db.scalar(count_stmt)
     
-    # Get items
+    # Get items, newest first (keyset seek with a cursor, OFFSET otherwise)
     stmt = (
-        select(AnalysisResultDB)
-        .where(AnalysisResultDB.sensor_id == sensor_id)
-        .order_by(desc(AnalysisResultDB.timestamp))
-        .offset((pagination.page - 1) * pagination.size)
-        .limit(pagination.size)
+        history_query
+        .order_by(desc(AnalysisResultDB.timestamp), desc(AnalysisResultDB.id))
+        .limit(pagination.size + 1)
     )
+    if pagination.cursor:
+        stmt = stmt.where(
+            tuple_(AnalysisResultDB.timestamp, AnalysisResultDB.id) < tuple_(*_decode_cursor(pagination.cursor))
+        )
+    else:
+        stmt = stmt.offset((pagination.page - 1) * pagination.size)
+    if include_series:
+        stmt = stmt.options(selectinload(AnalysisResultDB.artifact))
     result = await db.execute(stmt)
     history_db = result.scalars().all()
     
+    next_cursor = None
+    if len(history_db) > pagination.size:
+        history_db = history_db[:pagination.size]
+        next_cursor = encode_cursor(history_db[-1].timestamp, history_db[-1].id)
+    
     history_pydantic = []
     for item in history_db:
         try:
-            metrics_obj = AnalysisMetrics(**item.metrics)
+            metrics_dict = item.scalar_metrics
+            if include_series and item.artifact is not None:
+                metrics_dict.update(expand_metrics(item.artifact.series))
+                if max_points:
+                    metrics_dict = downsample_metrics(metrics_dict, max_points)
+            metrics_obj = AnalysisMetrics(**metrics_dict)
             
             res = AnalysisResult(
                 sensor_id=item.sensor_id,
@@ -249,13 +350,7 @@ async def get_sensor_history(
             logger.error(f"Error converting history item {item.id}: {e}")
             continue
             
-    return PaginatedResponse(
-        items=history_pydantic,
-        total=total or 0,
-        page=pagination.page,
-        size=pagination.size,
-        pages=math.ceil(total / pagination.size) if total else 0
-    )
+    return _paginated(history_pydantic, pagination, total, estimated, next_cursor)
 
 
 # ==============================================================================
@@ -286,7 +381,8 @@ async def create_sensor(
         name=sensor.name,
         location=sensor.location,
         source_type=SourceType(sensor.source_type),
-        organization_id=org_id  # Always use current user's org
+        organization_id=org_id,  # Always use current user's org
+        raw_retention_days=sensor.raw_retention_days
     )
     db.add(db_sensor)
     await db.commit()
@@ -294,16 +390,7 @@ async def create_sensor(
     
     logger.info(f"User {current_user.email} created sensor: {new_id} - {sensor.name} for org {org_id}")
     
-    return SensorResponse(
-        id=db_sensor.id,
-        name=db_sensor.name,
-        location=db_sensor.location,
-        source_type=db_sensor.source_type,
-        organization_id=db_sensor.organization_id,
-        latest_health_score=100.0,
-        latest_status="Normal",
-        latest_analysis_timestamp=None
-    )
+    return _sensor_response(db_sensor)
 
 
 @router.put("/{sensor_id}", response_model=SensorResponse)
@@ -327,32 +414,14 @@ async def update_sensor(
     db_sensor.name = sensor_update.name
     db_sensor.location = sensor_update.location
     db_sensor.source_type = SourceType(sensor_update.source_type)
+    db_sensor.raw_retention_days = sensor_update.raw_retention_days
     
     await db.commit()
     await db.refresh(db_sensor)
     
     logger.info(f"User {current_user.email} updated sensor: {sensor_id}")
     
-    # Get latest analysis for response
-    stmt = (
-        select(AnalysisResultDB)
-        .where(AnalysisResultDB.sensor_id == db_sensor.id)
-        .order_by(desc(AnalysisResultDB.timestamp))
-        .limit(1)
-    )
-    res = await db.execute(stmt)
-    latest_analysis = res.scalar_one_or_none()
-    
-    return SensorResponse(
-        id=db_sensor.id,
-        name=db_sensor.name,
-        location=db_sensor.location,
-        source_type=db_sensor.source_type,
-        organization_id=db_sensor.organization_id,
-        latest_health_score=latest_analysis.health_score if latest_analysis else 100.0,
-        latest_status=latest_analysis.status if latest_analysis else "Normal",
-        latest_analysis_timestamp=latest_analysis.timestamp if latest_analysis else None
-    )
+    return _sensor_response(db_sensor, *await _latest_analysis(db, db_sensor.id))
 
 
 @router.delete(
@@ -380,8 +449,21 @@ async def delete_sensor(
     await db.execute(
         delete(SensorReading).where(SensorReading.sensor_id == sensor_id)
     )
+    await db.execute(
+        delete(ReadingBlock).where(ReadingBlock.sensor_id == sensor_id)
+    )
+    await db.execute(
+        delete(ReadingRollup).where(ReadingRollup.sensor_id == sensor_id)
+    )
     
     # Delete related analysis results
+    await db.execute(
+        delete(AnalysisArtifact).where(
+            AnalysisArtifact.analysis_id.in_(
+                select(AnalysisResultDB.id).where(AnalysisResultDB.sensor_id == sensor_id)
+            )
+        )
+    )
     await db.execute(
         delete(AnalysisResultDB).where(AnalysisResultDB.sensor_id == sensor_id)
     )
@@ -390,6 +472,9 @@ async def delete_sensor(
     await db.delete(db_sensor)
     await db.commit()
     
+    from backend.api.routes.analytics import stream_states
+    stream_states.discard(sensor_id)
+    
     logger.warning(f"User {current_user.email} (role: {current_user.role.value}) deleted sensor: {sensor_id}")
     
     return None
@@ -421,8 +506,11 @@ async def upload_csv(
     
     **Features:**
     - Streaming chunk-based processing (no full file in RAM)
-    - Per-row Pydantic validation with error reporting
+    - Column-wise (vectorized) parsing; per-row Pydantic validation only
+      for rows the fast path rejects, to report their errors
+    - Parsing in a worker thread overlapped with inserts (bounded queue)
     - Atomic transaction per chunk with rollback capability
+    - Binary COPY bulk load on PostgreSQL (asyncpg), bulk INSERT elsewhere
     - Detailed import statistics and error samples
     
     **CSV Format Support:**
@@ -489,6 +577,7 @@ async def upload_csv(
     skipped_rows = 0
     error_samples: List[str] = []
     chunks_processed = 0
+    insert_mode = INSERT_MODE_COPY if copy_supported(db) else INSERT_MODE_EXECUTEMANY
     
     try:
         # Create streaming CSV reader
@@ -538,76 +627,49 @@ async def upload_csv(
                     detail="CSV file is empty"
                 )
         
-        # Process CSV in chunks
-        chunk_buffer: List[dict] = []
-        current_row_num = 1 if has_header else 0
+        # Pipeline: a worker thread reads and parses chunks column-wise while
+        # this coroutine inserts the previous ones
+        stats = PipelineStats()
+        chunks = parse_chunks(
+            reader, 1 if has_header else 0, chunk_size, stats,
+            partial(parse_chunk, sensor_id=sensor_id, timestamp_col=actual_timestamp_col, value_col=actual_value_col),
+        )
+        insert_seconds = 0.0
         
-        for row in reader:
-            current_row_num += 1
-            total_rows += 1
-            
-            # Skip empty rows
-            if not row or all(cell.strip() == '' for cell in row):
-                skipped_rows += 1
-                continue
-            
-            try:
-                # Parse row based on column count
-                parsed = _parse_csv_row(
-                    row=row,
-                    row_num=current_row_num,
-                    sensor_id=sensor_id,
-                    timestamp_col=actual_timestamp_col,
-                    value_col=actual_value_col
-                )
-                
-                # Validate with Pydantic schema
-                validated = SensorReadingBulk(
-                    timestamp=parsed['timestamp'],
-                    value=parsed['value']
-                )
-                
-                # Build insert record
-                chunk_buffer.append({
-                    "sensor_id": sensor_id,
-                    "timestamp": validated.timestamp or datetime.now(),
-                    "value": validated.value
-                })
-                
-            except Exception as e:
-                failed_rows += 1
-                error_msg = f"Row {current_row_num}: {str(e)}"
-                
-                if len(error_samples) < 10:
-                    error_samples.append(error_msg)
+        async with aclosing(pipeline(chunks, settings.csv_import_queue_depth, stats)) as parsed_chunks:
+            async for parsed in parsed_chunks:
+                for row_num, message in parsed.errors:
+                    failed_rows += 1
+                    error_msg = f"Row {row_num}: {message}"
+                    
+                    if len(error_samples) < 10:
+                        error_samples.append(error_msg)
+                    
+                    if not skip_errors:
+                        # Fail fast mode
+                        raise HTTPException(
+                            status_code=400,
+                            detail=f"Validation error at {error_msg}"
+                        )
                 
-                if not skip_errors:
-                    # Fail fast mode
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"Validation error at {error_msg}"
-                    )
-                continue
-            
-            # Process chunk when buffer is full
-            if len(chunk_buffer) >= chunk_size:
-                await _process_chunk(db, chunk_buffer, sensor_id, chunks_processed)
-                imported_rows += len(chunk_buffer)
-                chunks_processed += 1
-                chunk_buffer = []
-                logger.debug(f"Processed chunk {chunks_processed}, total imported: {imported_rows}")
-        
-        # Process remaining rows in buffer
-        if chunk_buffer:
-            await _process_chunk(db, chunk_buffer, sensor_id, chunks_processed)
-            imported_rows += len(chunk_buffer)
-            chunks_processed += 1
+                if parsed.rows:
+                    insert_started = time.time()
+                    insert_mode = await _process_chunk(db, parsed.rows, sensor_id, chunks_processed)
+                    insert_seconds += time.time() - insert_started
+                    imported_rows += len(parsed.rows)
+                    chunks_processed += 1
+                    logger.debug(f"Processed chunk {chunks_processed}, total imported: {imported_rows}")
+        
+        total_rows = stats.total_rows
+        skipped_rows = stats.skipped_rows
         
         # Final commit
         await db.commit()
         
-        # Calculate duration
-        duration_ms = int((time.time() - start_time) * 1000)
+        # Calculate duration and throughput
+        elapsed = time.time() - start_time
+        duration_ms = int(elapsed * 1000)
+        rows_per_second = imported_rows / elapsed if elapsed > 0 else 0.0
         
         # Build result
         result = CSVImportResult(
@@ -619,14 +681,20 @@ async def upload_csv(
             skipped_rows=skipped_rows,
             error_samples=error_samples,
             import_duration_ms=duration_ms,
-            chunks_processed=chunks_processed
+            chunks_processed=chunks_processed,
+            rows_per_second=round(rows_per_second, 1),
+            insert_mode=insert_mode,
+            parse_duration_ms=int(stats.parse_seconds * 1000),
+            insert_duration_ms=int(insert_seconds * 1000),
+            parser_blocked_ms=int(stats.parser_blocked_seconds * 1000),
+            writer_idle_ms=int(stats.writer_idle_seconds * 1000)
         )
         
         logger.info(
             f"CSV import completed for {sensor_id} by {current_user.email}: "
             f"{imported_rows}/{total_rows} rows imported, "
             f"{failed_rows} failed, {skipped_rows} skipped, "
-            f"in {duration_ms}ms ({chunks_processed} chunks)"
+            f"in {duration_ms}ms ({chunks_processed} chunks, {insert_mode}, {rows_per_second:.0f} rows/s)"
         )
         
         return result
@@ -642,6 +710,163 @@ async def upload_csv(
         )
 
 
+@router.post("/upload-csv-wide", response_model=CSVWideImportResult)
+async def upload_csv_wide(
+    file: UploadFile = File(..., description="CSV file to import"),
+    sensor_columns: Optional[str] = Form(
+        default=None,
+        description='JSON object mapping column header or 0-based index to sensor ID, '
+                    'e.g. {"TT-101": "temp-1", "3": "press-2"}. Default: every header '
+                    'column except the timestamp, named by its sensor ID'
+    ),
+    has_header: bool = Form(default=True, description="CSV has header row"),
+    timestamp_col: int = Form(default=0, ge=0, description="Timestamp column index (0-based)"),
+    chunk_size: int = Form(default=1000, ge=100, le=50000, description="Rows per chunk"),
+    skip_errors: bool = Form(default=True, description="Skip invalid cells vs fail fast"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Import a wide-format CSV (one timestamp column, one column per sensor) in one pass.
+    
+    SCADA/historian exports carry many sensors per row; this parses the file
+    once and inserts the readings of all mapped sensors in batched chunks,
+    through the same pipeline as /upload-csv.
+    
+    **Security**: User must own every target sensor (one query, checked up front)
+    
+    **Authentication**: Required
+    
+    Args:
+        file: CSV file upload (multipart/form-data)
+        sensor_columns: Column -> sensor ID mapping (JSON), see above
+        has_header: Whether CSV has a header row
+        timestamp_col: 0-based column index for timestamp
+        chunk_size: Number of rows to process per batch (default: 1000)
+        skip_errors: If True, skip invalid cells; if False, fail on first error
+        db: Database session (injected)
+        current_user: Authenticated user
+        
+    Returns:
+        CSVWideImportResult: Totals and per-sensor statistics
+        
+    Raises:
+        HTTPException 400: Invalid CSV, header or column mapping
+        HTTPException 404: A sensor not found or not owned by user
+        HTTPException 500: Database or processing error
+    """
+    import time
+    start_time = time.time()
+    
+    file_stream = codecs.iterdecode(file.file, 'utf-8', errors='replace')
+    reader = csv.reader(file_stream)
+    header = next(reader, None) if has_header else None
+    if has_header and header is None:
+        raise HTTPException(status_code=400, detail="CSV file is empty")
+    
+    columns = _resolve_sensor_columns(header, timestamp_col, sensor_columns)
+    
+    # SECURITY: Verify ownership of every target sensor
+    await get_sensors_with_org_check(list(columns.values()), current_user, db)
+    
+    logger.info(
+        f"Wide CSV upload started for {len(columns)} sensors by user: {current_user.email}"
+    )
+    
+    failed_rows = 0
+    error_samples: List[str] = []
+    chunks_processed = 0
+    insert_mode = INSERT_MODE_COPY if copy_supported(db) else INSERT_MODE_EXECUTEMANY
+    counts = {sensor_id: SensorImportCounts() for sensor_id in columns.values()}
+    
+    try:
+        stats = PipelineStats()
+        chunks = parse_chunks(
+            reader, 1 if has_header else 0, chunk_size, stats,
+            partial(parse_wide_chunk, timestamp_col=timestamp_col, columns=columns),
+        )
+        insert_seconds = 0.0
+        
+        async with aclosing(pipeline(chunks, settings.csv_import_queue_depth, stats)) as parsed_chunks:
+            async for parsed in parsed_chunks:
+                for row_num, message in parsed.errors:
+                    failed_rows += 1
+                    error_msg = f"Row {row_num}: {message}"
+                    
+                    if len(error_samples) < 10:
+                        error_samples.append(error_msg)
+                    
+                    if not skip_errors:
+                        # Fail fast mode
+                        raise HTTPException(
+                            status_code=400,
+                            detail=f"Validation error at {error_msg}"
+                        )
+                
+                if parsed.rows:
+                    insert_started = time.time()
+                    insert_mode = await _process_chunk(db, parsed.rows, f"{len(columns)} sensors", chunks_processed)
+                    insert_seconds += time.time() - insert_started
+                    chunks_processed += 1
+                
+                for sensor_id, chunk_counts in parsed.counts.items():
+                    counts[sensor_id].imported += chunk_counts.imported
+                    counts[sensor_id].failed += chunk_counts.failed
+                    counts[sensor_id].skipped += chunk_counts.skipped
+        
+        await db.commit()
+        
+        elapsed = time.time() - start_time
+        imported_rows = sum(c.imported for c in counts.values())
+        rows_per_second = imported_rows / elapsed if elapsed > 0 else 0.0
+        
+        result = CSVWideImportResult(
+            success=True,
+            total_rows=stats.total_rows,
+            skipped_rows=stats.skipped_rows,
+            imported_rows=imported_rows,
+            failed_rows=failed_rows,
+            sensors=[
+                CSVSensorImportStats(
+                    sensor_id=sensor_id,
+                    column=column,
+                    imported_rows=counts[sensor_id].imported,
+                    failed_rows=counts[sensor_id].failed,
+                    skipped_rows=counts[sensor_id].skipped,
+                )
+                for column, sensor_id in columns.items()
+            ],
+            error_samples=error_samples,
+            import_duration_ms=int(elapsed * 1000),
+            chunks_processed=chunks_processed,
+            rows_per_second=round(rows_per_second, 1),
+            insert_mode=insert_mode,
+            parse_duration_ms=int(stats.parse_seconds * 1000),
+            insert_duration_ms=int(insert_seconds * 1000),
+            parser_blocked_ms=int(stats.parser_blocked_seconds * 1000),
+            writer_idle_ms=int(stats.writer_idle_seconds * 1000)
+        )
+        
+        logger.info(
+            f"Wide CSV import completed by {current_user.email}: "
+            f"{imported_rows} readings for {len(columns)} sensors from {stats.total_rows} rows, "
+            f"{failed_rows} failed, in {result.import_duration_ms}ms "
+            f"({chunks_processed} chunks, {insert_mode}, {rows_per_second:.0f} readings/s)"
+        )
+        
+        return result
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Wide CSV upload fatal error: {e}", exc_info=True)
+        await db.rollback()
+        raise HTTPException(
+            status_code=500,
+            detail=f"CSV import failed: {str(e)}"
+        )
+
+
 @router.post("/stream-data")
 async def stream_data(
     data: dict,
@@ -676,88 +901,300 @@ async def stream_data(
     value = float(data["value"])
     ts = datetime.fromisoformat(data["timestamp"]) if "timestamp" in data else datetime.now()
     
-    # Insert reading
-    reading = SensorReading(sensor_id=sensor_id, value=value, timestamp=ts)
-    db.add(reading)
-    await db.commit()
+    # Insert reading (directly, or through the write-behind buffer)
+    await _store_readings(db, [{"sensor_id": sensor_id, "timestamp": ts, "value": value}])
     
     # Trigger background analysis
     from backend.api.routes.analytics import run_background_analysis
-    background_tasks.add_task(run_background_analysis, sensor_id, AsyncSessionLocal)
+    background_tasks.add_task(run_background_analysis, sensor_id, AsyncSessionLocal, value)
     
     logger.info(f"User {current_user.email} streamed data point for sensor {sensor_id}")
     return {"status": "received", "sensor_id": sensor_id, "timestamp": ts.isoformat()}
 
 
+@router.post("/stream-batch")
+async def stream_batch(
+    batch: StreamBatch,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Stream many data points, for one or more sensors, in one request.
+    
+    Ownership is checked once per distinct sensor (one query), all points
+    are written with one insert, and at most one background analysis is
+    scheduled per sensor.
+    
+    **Security**: User must own every target sensor (organization check)
+    
+    **Authentication**: Required
+    
+    Args:
+        batch: Points with sensor_id, value, and optional timestamp
+        background_tasks: FastAPI background tasks
+        db: Database session
+        current_user: Authenticated user
+        
+    Returns:
+        dict: Reception status with the number of points per sensor
+        
+    Raises:
+        HTTPException 404: A sensor not found or not owned by user
+        HTTPException 413: More than settings.stream_batch_max_points points
+    """
+    if len(batch.points) > settings.stream_batch_max_points:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.stream_batch_max_points} points per batch"
+        )
+    
+    # SECURITY: Verify ownership of every distinct sensor
+    sensor_ids = list(dict.fromkeys(point.sensor_id for point in batch.points))
+    await get_sensors_with_org_check(sensor_ids, current_user, db)
+    
+    now = datetime.now()
+    rows = [
+        {"sensor_id": point.sensor_id, "timestamp": point.timestamp or now, "value": point.value}
+        for point in batch.points
+    ]
+    await _store_readings(db, rows)
+    
+    # One analysis per sensor: a single new point updates the incremental
+    # state, several make it reload the window
+    points_per_sensor = {sensor_id: [] for sensor_id in sensor_ids}
+    for point in batch.points:
+        points_per_sensor[point.sensor_id].append(point.value)
+    
+    from backend.api.routes.analytics import run_background_analysis
+    for sensor_id, values in points_per_sensor.items():
+        value = values[0] if len(values) == 1 else None
+        background_tasks.add_task(run_background_analysis, sensor_id, AsyncSessionLocal, value)
+    
+    logger.info(
+        f"User {current_user.email} streamed {len(rows)} data points for {len(sensor_ids)} sensors"
+    )
+    return {
+        "status": "received",
+        "points": len(rows),
+        "sensors": {sensor_id: len(values) for sensor_id, values in points_per_sensor.items()},
+    }
+
+
+@router.websocket("/ws/ingest")
+async def ingest_websocket(websocket: WebSocket, token: Optional[str] = Query(default=None)):
+    """
+    Continuous ingest channel for high-rate sensors (e.g. SourceType.IoT).
+    
+    **Authentication**: Access token as ?token=... or "Authorization: Bearer"
+    header, checked once when the connection opens (rejected: close 1008)
+    
+    **Security**: Ownership is checked the first time a sensor appears on
+    the connection; frames naming other sensors are rejected
+    
+    Protocol:
+    - Server sends {"type": "ready", "ack_points": N, "ack_ms": T} after auth
+    - Client sends frames: JSON arrays of [sensor_id, value] or
+      [sensor_id, value, timestamp] points (timestamp: epoch seconds or ISO-8601)
+    - Frames are numbered 1, 2, ... in arrival order. Accepted points are
+      stored (same pipeline and settings.ingest_mode as /stream-data) after
+      N points or T ms, then acknowledged cumulatively with
+      {"type": "ack", "seq": <last frame>, "points": <points stored>}
+    - A rejected frame gets {"type": "error", "seq": <frame>, "detail": ...}
+      and is dropped; a failed write gets an error for the last frame of the
+      batch, and none of the batch's frames are acknowledged
+    
+    Flow control: the server stops reading while a batch is being stored,
+    including while the ingest buffer is over settings.ingest_max_pending,
+    so TCP backpressure reaches the client; clients should also bound the
+    number of unacknowledged frames they send.
+    """
+    if token is None:
+        scheme, _, credentials = websocket.headers.get("authorization", "").partition(" ")
+        token = credentials if scheme.lower() == "bearer" and credentials else None
+    try:
+        async with AsyncSessionLocal() as db:
+            user = await get_current_active_user(await get_current_user(token, db))
+    except HTTPException as e:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=str(e.detail))
+        return
+    
+    await websocket.accept()
+    await websocket.send_json({
+        "type": "ready",
+        "ack_points": settings.ingest_ws_ack_points,
+        "ack_ms": settings.ingest_ws_ack_ms,
+    })
+    logger.info(f"User {user.email} opened an ingest WebSocket")
+    
+    from backend.api.routes.analytics import run_background_analysis
+    
+    loop = asyncio.get_running_loop()
+    owned: set = set()
+    analyses: dict = {}  # sensor_id -> running analysis task
+    rows: List[dict] = []
+    seq = acked = 0
+    deadline: Optional[float] = None
+    
+    async def store(send: bool = True) -> None:
+        nonlocal rows, acked, deadline
+        batch, rows, deadline = rows, [], None
+        try:
+            if batch:
+                async with AsyncSessionLocal() as db:
+                    await _store_readings(db, batch)
+        except HTTPException as e:
+            acked = seq
+            if send:
+                await websocket.send_json({"type": "error", "seq": seq, "detail": e.detail})
+            return
+        acked = seq
+        INGEST_WS_POINTS.inc(len(batch))
+        if send:
+            await websocket.send_json({"type": "ack", "seq": seq, "points": len(batch)})
+        
+        # One analysis per sensor and batch, skipped while the previous one runs
+        points_per_sensor: dict = {}
+        for row in batch:
+            points_per_sensor.setdefault(row["sensor_id"], []).append(row["value"])
+        for sensor_id, values in points_per_sensor.items():
+            if sensor_id in analyses and not analyses[sensor_id].done():
+                continue
+            value = values[0] if len(values) == 1 else None
+            analyses[sensor_id] = asyncio.create_task(
+                run_background_analysis(sensor_id, AsyncSessionLocal, value)
+            )
+    
+    INGEST_WS_CONNECTIONS.inc()
+    try:
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - loop.time())
+            try:
+                message = await asyncio.wait_for(websocket.receive(), timeout)
+            except asyncio.TimeoutError:
+                await store()
+                continue
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", status.WS_1000_NORMAL_CLOSURE))
+            
+            seq += 1
+            try:
+                points = parse_frame(message.get("text") or message.get("bytes") or "", datetime.now())
+                new_sensors = list(dict.fromkeys(p["sensor_id"] for p in points if p["sensor_id"] not in owned))
+                if new_sensors:
+                    # SECURITY: Verify ownership once per sensor and connection
+                    async with AsyncSessionLocal() as db:
+                        await get_sensors_with_org_check(new_sensors, user, db)
+                    owned.update(new_sensors)
+            except (ValueError, HTTPException) as e:
+                await websocket.send_json({
+                    "type": "error",
+                    "seq": seq,
+                    "detail": e.detail if isinstance(e, HTTPException) else str(e),
+                })
+                continue
+            
+            rows.extend(points)
+            if deadline is None:
+                deadline = loop.time() + settings.ingest_ws_ack_ms / 1000
+            if len(rows) >= settings.ingest_ws_ack_points:
+                await store()
+    except WebSocketDisconnect:
+        # Store what arrived; it cannot be acknowledged any more
+        if rows:
+            await store(send=False)
+        logger.info(f"Ingest WebSocket of {user.email} closed after {seq} frames")
+    finally:
+        # Analyses of a closed connection are not awaited by anyone
+        for task in analyses.values():
+            task.cancel()
+        await asyncio.gather(*analyses.values(), return_exceptions=True)
+        INGEST_WS_CONNECTIONS.dec()
+
+
 # ==============================================================================
 # HELPER FUNCTIONS (Private)
 # ==============================================================================
 
-def _parse_csv_row(
-    row: List[str],
-    row_num: int,
-    sensor_id: str,
+def _resolve_sensor_columns(
+    header: Optional[List[str]],
     timestamp_col: int,
-    value_col: int
+    sensor_columns: Optional[str]
 ) -> dict:
     """
-    Parse a single CSV row into sensor reading components.
-    
-    Handles multiple CSV formats:
-    - 3+ columns: Uses specified column indices
-    - 2 columns: [timestamp, value]
-    - 1 column: [value] with current timestamp
+    Resolve the column -> sensor ID mapping of a wide-format import.
     
     Args:
-        row: CSV row as list of strings
-        row_num: Row number for error reporting
-        sensor_id: Target sensor ID
-        timestamp_col: Column index for timestamp
-        value_col: Column index for value
+        header: CSV header row (None if the file has none)
+        timestamp_col: Timestamp column index
+        sensor_columns: JSON object of column header or index -> sensor ID;
+            None maps every other header column to the sensor named by it
         
     Returns:
-        Dict with 'timestamp' (str or None) and 'value' (str)
+        Dict of column index -> sensor ID, in column order
         
     Raises:
-        ValueError: If row cannot be parsed
+        HTTPException 400: Invalid mapping
     """
-    num_cols = len(row)
-    
-    # Handle special case: timestamp_col = -1 means no timestamp column
-    if timestamp_col < 0:
-        # Value-only mode
-        if value_col < num_cols:
-            val_str = row[value_col].strip()
-        elif num_cols >= 1:
-            val_str = row[0].strip()
-        else:
-            raise ValueError("Empty row")
-        return {'timestamp': None, 'value': val_str}
-    
-    # Standard column parsing
-    if num_cols >= max(timestamp_col, value_col) + 1:
-        # Use specified column indices
-        ts_str = row[timestamp_col].strip() if timestamp_col < num_cols else None
-        val_str = row[value_col].strip()
-    elif num_cols == 2:
-        # Assume [timestamp, value]
-        ts_str = row[0].strip()
-        val_str = row[1].strip()
-    elif num_cols == 1:
-        # Assume [value] only
-        ts_str = None
-        val_str = row[0].strip()
+    if sensor_columns is None:
+        if header is None:
+            raise HTTPException(status_code=400, detail="sensor_columns is required for CSV files without a header")
+        columns = {i: name.strip() for i, name in enumerate(header) if i != timestamp_col and name.strip()}
     else:
-        raise ValueError(f"Empty row or insufficient columns (got {num_cols})")
+        try:
+            mapping = json.loads(sensor_columns)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="sensor_columns must be a JSON object")
+        if not isinstance(mapping, dict):
+            raise HTTPException(status_code=400, detail="sensor_columns must be a JSON object")
+        
+        names = [name.strip() for name in header] if header else []
+        columns = {}
+        for key, sensor_id in mapping.items():
+            if key.strip().isdigit():
+                index = int(key)
+            elif key.strip() in names:
+                index = names.index(key.strip())
+            else:
+                raise HTTPException(status_code=400, detail=f"Unknown CSV column: {key}")
+            if not isinstance(sensor_id, str) or not sensor_id:
+                raise HTTPException(status_code=400, detail=f"Invalid sensor ID for column {key}")
+            if index == timestamp_col:
+                raise HTTPException(status_code=400, detail=f"Column {key} is the timestamp column")
+            if header is not None and index >= len(header):
+                raise HTTPException(status_code=400, detail=f"Column index {index} out of range ({len(header)} columns)")
+            columns[index] = sensor_id
+        columns = dict(sorted(columns.items()))
+    
+    if not columns:
+        raise HTTPException(status_code=400, detail="No sensor columns to import")
+    if len(set(columns.values())) != len(columns):
+        raise HTTPException(status_code=400, detail="Each sensor may be mapped to one column only")
+    return columns
+
+
+async def _store_readings(db: AsyncSession, rows: List[dict]) -> None:
+    """
+    Store streamed readings according to settings.ingest_mode.
     
-    # Validate value is present
-    if not val_str:
-        raise ValueError("Missing value in row")
+    "direct" inserts and commits on the request session; "buffered" and
+    "durable" hand the rows to the write-behind ingest buffer ("durable"
+    waits until they are committed).
     
-    return {
-        'timestamp': ts_str if ts_str else None,
-        'value': val_str
-    }
+    Raises:
+        HTTPException 503: Direct or durable write failed
+    """
+    try:
+        if settings.ingest_mode == "direct":
+            await write_readings(db, rows)
+            await db.commit()
+        else:
+            await ingest_buffer.add(rows, wait=settings.ingest_mode == "durable")
+    except SQLAlchemyError as e:
+        logger.error(f"{settings.ingest_mode.capitalize()} write of {len(rows)} readings failed: {e}")
+        if settings.ingest_mode == "direct":
+            await db.rollback()
+        raise HTTPException(status_code=503, detail="Readings could not be stored, retry later")
 
 
 async def _process_chunk(
@@ -765,12 +1202,12 @@ async def _process_chunk(
     chunk: List[dict],
     sensor_id: str,
     chunk_num: int
-) -> None:
+) -> str:
     """
     Process and insert a chunk of sensor readings into the database.
     
-    Uses bulk insert for performance. Does NOT commit - caller
-    is responsible for transaction management.
+    Uses binary COPY on PostgreSQL (asyncpg) and a bulk INSERT elsewhere.
+    Does NOT commit - caller is responsible for transaction management.
     
     Args:
         db: Database session
@@ -778,15 +1215,16 @@ async def _process_chunk(
         sensor_id: Sensor identifier (for logging)
         chunk_num: Chunk number (for logging)
         
+    Returns:
+        Insert mode used ("copy" or "executemany")
+        
     Raises:
         SQLAlchemyError: On database errors
     """
-    if not chunk:
-        return
-    
     try:
-        await db.execute(insert(SensorReading), chunk)
-        logger.debug(f"Inserted chunk {chunk_num} with {len(chunk)} rows for {sensor_id}")
+        mode = await write_readings(db, chunk, use_copy=True)
+        logger.debug(f"Inserted chunk {chunk_num} with {len(chunk)} rows for {sensor_id} ({mode})")
+        return mode
     except Exception as e:
         logger.error(f"Chunk {chunk_num} insert failed: {e}")
         raise
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Reading Block Conversion Script
+
+Packs existing sensor_readings rows older than a cutoff into compressed
+blocks (sensor_reading_blocks) and deletes the converted rows. Safe to
+re-run: each bucket is committed on its own and merged into any block
+that already exists.
+
+Enable BLOCK_STORAGE_ENABLED before converting, otherwise the analysis
+paths stop seeing the converted readings.
+
+Usage:
+    python -m backend.convert_readings --older-than-days 7
+    python -m backend.convert_readings --sensor pH-01 --sensor pH-02 --older-than-days 1
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select
+
+from backend.core.config import settings
+from backend.database import AsyncSessionLocal, engine, Base
+from backend.models_db import SensorReading
+from backend.repositories.blocks import BlockStore
+
+
+async def run_conversion(sensor_ids, older_than_days: float, bucket_seconds: int) -> None:
+    """Convert rows older than the cutoff for the given (or all) sensors."""
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    print("=" * 50)
+    print("QorSense Reading Block Conversion")
+    print("=" * 50)
+    print(f"Cutoff: {cutoff.isoformat()}  Bucket: {bucket_seconds}s")
+    if not settings.block_storage_enabled:
+        print("⚠️  BLOCK_STORAGE_ENABLED is off - converted readings will be hidden from analysis")
+    print()
+
+    # Ensure tables exist
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with AsyncSessionLocal() as db:
+        if not sensor_ids:
+            result = await db.execute(
+                select(SensorReading.sensor_id)
+                .where(SensorReading.timestamp < cutoff)
+                .distinct()
+            )
+            sensor_ids = [row.sensor_id for row in result]
+
+        store = BlockStore(db, bucket_seconds=bucket_seconds)
+        total = 0
+        for sensor_id in sensor_ids:
+            start = time.perf_counter()
+            try:
+                converted = await store.convert_rows(sensor_id, cutoff)
+            except Exception as e:
+                await db.rollback()
+                print(f"❌ {sensor_id}: {e}")
+                raise
+            total += converted
+            print(f"✓ {sensor_id}: {converted:,} rows in {time.perf_counter() - start:.1f}s")
+
+    print()
+    print(f"✅ Converted {total:,} rows from {len(sensor_ids)} sensors")
+
+
+def main():
+    """Entry point for the conversion script."""
+    parser = argparse.ArgumentParser(description="Convert sensor readings into compressed blocks")
+    parser.add_argument("--sensor", action="append", default=[], help="Sensor ID (repeatable; default: all)")
+    parser.add_argument("--older-than-days", type=float, default=7.0, help="Only convert rows older than this")
+    parser.add_argument("--bucket-seconds", type=int, default=settings.block_bucket_seconds)
+    args = parser.parse_args()
+
+    asyncio.run(run_conversion(args.sensor, args.older_than_days, args.bucket_seconds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Reading Block Codec
+
+Packs a run of (timestamp, value) readings into a compressed blob, in the
+spirit of Gorilla (Facebook's TSDB):
+
+- timestamps: integer microseconds, stored as first value, first delta,
+  then delta-of-deltas (zero for regular sampling)
+- values: float64 bit patterns XOR-ed with their predecessor (zero for
+  repeated values, few significant bits for slowly changing ones)
+
+Instead of Gorilla's bit-level packing, which is inherently sequential,
+both streams are zigzag/byte-shuffled and zlib-compressed, so encoding and
+decoding are whole-array NumPy operations (cumsum, bitwise_xor.accumulate).
+
+Layout: b"QSB1" | count (uint32, LE) | zlib(shuffled timestamps + shuffled values)
+"""
+
+import struct
+import zlib
+from typing import Tuple
+
+import numpy as np
+
+MAGIC = b"QSB1"
+_HEADER = struct.Struct("<4sI")
+
+
+def _zigzag(x: np.ndarray) -> np.ndarray:
+    """Map signed int64 to uint64 so small magnitudes have small codes."""
+    return ((x << 1) ^ (x >> 63)).view(np.uint64)
+
+
+def _unzigzag(z: np.ndarray) -> np.ndarray:
+    return ((z >> np.uint64(1)).view(np.int64)) ^ -((z & np.uint64(1)).view(np.int64))
+
+
+def _shuffle(words: np.ndarray) -> bytes:
+    """Group byte k of every 8-byte word together (helps zlib on sparse high bytes)."""
+    return words.astype("<u8").view(np.uint8).reshape(-1, 8).T.tobytes()
+
+
+def _unshuffle(buffer: bytes, count: int) -> np.ndarray:
+    return np.frombuffer(buffer, dtype=np.uint8).reshape(8, count).T.copy().view("<u8").ravel()
+
+
+def encode_block(timestamps: np.ndarray, values: np.ndarray, level: int = 6) -> bytes:
+    """
+    Encode readings into a compressed block.
+
+    Args:
+        timestamps: datetime64 array (any unit, converted to microseconds), sorted
+        values: float64 array of the same length
+
+    Returns:
+        Block bytes
+    """
+    ts = np.asarray(timestamps, dtype="datetime64[us]").astype(np.int64)
+    vals = np.ascontiguousarray(values, dtype=np.float64)
+    if len(ts) != len(vals):
+        raise ValueError("timestamps and values must have the same length")
+
+    count = len(ts)
+    ts_stream = np.empty(count, dtype=np.int64)
+    if count:
+        ts_stream[0] = ts[0]
+        deltas = np.diff(ts)
+        if count > 1:
+            ts_stream[1] = deltas[0]
+            ts_stream[2:] = np.diff(deltas)
+
+    bits = vals.view(np.uint64)
+    xor_stream = bits.copy()
+    xor_stream[1:] ^= bits[:-1]
+
+    payload = _shuffle(_zigzag(ts_stream)) + _shuffle(xor_stream)
+    return _HEADER.pack(MAGIC, count) + zlib.compress(payload, level)
+
+
+def decode_block(block: bytes) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Decode a block produced by encode_block.
+
+    Returns:
+        (timestamps as datetime64[us], values as float64)
+    """
+    magic, count = _HEADER.unpack_from(block)
+    if magic != MAGIC:
+        raise ValueError("Not a reading block")
+
+    payload = zlib.decompress(block[_HEADER.size:])
+    half = 8 * count
+    ts_stream = _unzigzag(_unshuffle(payload[:half], count))
+    xor_stream = _unshuffle(payload[half:], count)
+
+    ts = np.empty(count, dtype=np.int64)
+    if count:
+        ts[0] = ts_stream[0]
+        if count > 1:
+            deltas = np.cumsum(ts_stream[1:])
+            ts[1:] = ts_stream[0] + np.cumsum(deltas)
+
+    values = np.bitwise_xor.accumulate(xor_stream).view(np.float64)
+    return ts.astype("datetime64[us]"), values
@@ -5,12 +5,20 @@ Provides caching decorators and utilities using Redis (optional) or in-memory fa
 """
 
 import os
+import json
+import time
 import pickle
+import hashlib
 import logging
+from collections import OrderedDict
 from functools import wraps
-from typing import Any, Optional, Callable
+from typing import Any, Optional, Callable, Sequence
+import numpy as np
 import redis.asyncio as redis
 
+from backend.core.config import settings
+from backend.core.metrics import ANALYSIS_CACHE_HITS, ANALYSIS_CACHE_MISSES
+
 logger = logging.getLogger(__name__)
 
 # Redis Connection (Lazy init)
@@ -74,3 +82,105 @@ def cache(ttl_seconds: int = 300, key_prefix: str = ""):
             return result
         return wrapper
     return decorator
+
+
+class LRUCache:
+    """
+    In-process LRU cache with per-entry expiry.
+
+    Used when Redis is not available. Values are stored pickled so callers
+    cannot mutate cached entries through the returned objects.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[bytes]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, payload = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return payload
+
+    def set(self, key: str, payload: bytes, ttl_seconds: int) -> None:
+        self._data[key] = (time.monotonic() + ttl_seconds, payload)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+# Fallback store for analysis results
+local_cache = LRUCache(settings.analysis_cache_size)
+
+
+def analysis_cache_key(
+    values: Sequence[float],
+    timestamps: Optional[Sequence[str]] = None,
+    config: Any = None,
+) -> str:
+    """
+    Content hash of an analysis request.
+
+    Values are hashed as float64 bytes, timestamps as their ISO strings and
+    the config as sorted JSON, so identical windows map to the same key
+    regardless of how they were posted.
+    """
+    digest = hashlib.sha256()
+    digest.update(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+    digest.update(b"\x00ts")
+    if timestamps:
+        digest.update("\x1f".join(timestamps).encode())
+    digest.update(b"\x00cfg")
+    if config is not None:
+        cfg = config.model_dump() if hasattr(config, "model_dump") else dict(config)
+        digest.update(json.dumps(cfg, sort_keys=True, default=str).encode())
+    return f"analysis:{digest.hexdigest()}"
+
+
+async def get_cached_analysis(key: str) -> Optional[Any]:
+    """Return the cached analysis result for `key`, or None on a miss."""
+    if settings.analysis_cache_ttl <= 0:
+        return None
+
+    r = await get_redis()
+    backend = "redis" if r else "memory"
+    payload = None
+    if r:
+        try:
+            payload = await r.get(key)
+        except Exception as e:
+            logger.warning(f"Cache get error: {e}")
+    else:
+        payload = local_cache.get(key)
+
+    if payload is None:
+        ANALYSIS_CACHE_MISSES.labels(backend=backend).inc()
+        return None
+    ANALYSIS_CACHE_HITS.labels(backend=backend).inc()
+    logger.debug(f"Cache hit: {key}")
+    return pickle.loads(payload)
+
+
+async def set_cached_analysis(key: str, result: Any) -> None:
+    """Store an analysis result under `key` for settings.analysis_cache_ttl seconds."""
+    ttl_seconds = settings.analysis_cache_ttl
+    if ttl_seconds <= 0:
+        return
+
+    payload = pickle.dumps(result)
+    r = await get_redis()
+    if r:
+        try:
+            await r.setex(key, ttl_seconds, payload)
+        except Exception as e:
+            logger.warning(f"Cache set error: {e}")
+    else:
+        local_cache.set(key, payload, ttl_seconds)
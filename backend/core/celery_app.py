@@ -11,6 +11,8 @@ from celery import Celery
 from kombu import Queue
 from typing import Optional
 
+from backend.core.config import settings
+
 logger = logging.getLogger(__name__)
 
 # Redis connection from environment
@@ -52,7 +54,7 @@ def create_celery_app() -> Celery:
         "qorsense_tasks",
         broker=CELERY_BROKER_URL,
         backend=CELERY_RESULT_BACKEND,
-        include=["backend.tasks.analysis_tasks"],
+        include=["backend.tasks.analysis_tasks", "backend.tasks.maintenance_tasks"],
     )
     
     # Celery configuration
@@ -100,6 +102,19 @@ def create_celery_app() -> Celery:
         # Task routes
         task_routes={
             "backend.tasks.analysis_tasks.*": {"queue": "analysis"},
+            "backend.tasks.maintenance_tasks.*": {"queue": "low_priority"},
+        },
+        
+        # Periodic tasks (celery beat)
+        beat_schedule={
+            "refresh-rollups": {
+                "task": "backend.tasks.maintenance_tasks.refresh_rollups",
+                "schedule": settings.rollup_refresh_minutes * 60,
+            },
+            "enforce-retention": {
+                "task": "backend.tasks.maintenance_tasks.enforce_retention",
+                "schedule": settings.retention_interval_hours * 3600,
+            },
         },
         
         # Broker connection retry
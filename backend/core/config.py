@@ -66,6 +66,106 @@ class Settings(BaseSettings):
     max_analysis_points: int = Field(default=10000, ge=100, description="Maximum data points for analysis")
     default_window_size: int = Field(default=1000, ge=10, description="Default analysis window size")
     enable_background_analysis: bool = Field(default=True, description="Enable background analysis")
+    preprocessing_engine: str = Field(
+        default="pandas",
+        description="Gap filling / smoothing implementation: pandas or numpy (opt-in, faster)"
+    )
+    analysis_executor: str = Field(
+        default="inline",
+        description="Where CPU-bound analysis runs: inline (on the event loop), thread or process"
+    )
+    analysis_workers: int = Field(
+        default=2, ge=1,
+        description="Worker count for the analysis executor"
+    )
+    analysis_cache_ttl: int = Field(
+        default=300, ge=0,
+        description="Seconds to keep memoized analysis results (0 disables)"
+    )
+    analysis_cache_size: int = Field(
+        default=256, ge=1,
+        description="Entries in the in-process analysis cache used without Redis"
+    )
+    compact_metrics_storage: bool = Field(
+        default=False,
+        description="Store analysis series as base64 float32 instead of JSON lists (opt-in)"
+    )
+    block_storage_enabled: bool = Field(
+        default=False,
+        description="Merge compressed reading blocks into reading queries"
+    )
+    block_bucket_seconds: int = Field(
+        default=3600, ge=60,
+        description="Time span of one compressed reading block"
+    )
+    rollup_enabled: bool = Field(
+        default=True,
+        description="Maintain min/max/mean rollup tiers on ingest"
+    )
+    rollup_resolutions: str = Field(
+        default="60,900,3600",
+        description="Comma-separated rollup bucket widths in seconds"
+    )
+    rollup_refresh_minutes: int = Field(
+        default=15, ge=1,
+        description="Interval (and lookback) of the periodic rollup rebuild"
+    )
+    raw_retention_days: int = Field(
+        default=0, ge=0,
+        description="Default days raw readings are kept before rollup-only (0 = forever)"
+    )
+    retention_batch_size: int = Field(
+        default=5000, ge=100,
+        description="Raw readings deleted per transaction by the retention job"
+    )
+    retention_interval_hours: int = Field(
+        default=24, ge=1,
+        description="Interval of the periodic retention job"
+    )
+    ingest_mode: str = Field(
+        default="direct",
+        description="Stream ingest: direct (commit per request), or opt-in buffered (ack on enqueue) / durable (ack after batch commit)"
+    )
+    ingest_batch_size: int = Field(
+        default=500, ge=1,
+        description="Buffered readings that trigger an immediate flush"
+    )
+    ingest_flush_ms: int = Field(
+        default=200, ge=1,
+        description="Maximum time a buffered reading waits before being flushed"
+    )
+    ingest_max_pending: int = Field(
+        default=20000, ge=1,
+        description="Buffered readings above which producers wait for a flush"
+    )
+    stream_batch_max_points: int = Field(
+        default=10000, ge=1,
+        description="Maximum points accepted by one /sensors/stream-batch request"
+    )
+    ingest_ws_ack_points: int = Field(
+        default=500, ge=1,
+        description="Points received on an ingest WebSocket before they are stored and acknowledged"
+    )
+    ingest_ws_ack_ms: int = Field(
+        default=100, ge=1,
+        description="Maximum time received WebSocket points wait before they are stored and acknowledged"
+    )
+    ingest_copy_enabled: bool = Field(
+        default=True,
+        description="Bulk-load CSV imports with binary COPY on PostgreSQL (asyncpg); other databases use INSERT"
+    )
+    csv_import_queue_depth: int = Field(
+        default=4, ge=1,
+        description="Parsed CSV chunks buffered between the parser thread and the database writer"
+    )
+    incremental_refresh_interval: int = Field(
+        default=50, ge=1,
+        description="Streamed points between full (DFA/hysteresis) refreshes of the incremental analyzer"
+    )
+    stream_state_cache_size: int = Field(
+        default=1024, ge=1,
+        description="Sensors whose incremental analyzer state is kept in memory (least recently used evicted)"
+    )
     
     # Rate Limiting
     rate_limit_enabled: bool = Field(default=False, description="Enable rate limiting")
@@ -92,6 +192,36 @@ class Settings(BaseSettings):
             raise ValueError(f"Log level must be one of {allowed}")
         return v_upper
     
+    @field_validator("preprocessing_engine")
+    @classmethod
+    def validate_preprocessing_engine(cls, v: str) -> str:
+        """Validate preprocessing engine."""
+        allowed = ["numpy", "pandas"]
+        v_lower = v.lower()
+        if v_lower not in allowed:
+            raise ValueError(f"Preprocessing engine must be one of {allowed}")
+        return v_lower
+    
+    @field_validator("analysis_executor")
+    @classmethod
+    def validate_analysis_executor(cls, v: str) -> str:
+        """Validate analysis executor mode."""
+        allowed = ["process", "thread", "inline"]
+        v_lower = v.lower()
+        if v_lower not in allowed:
+            raise ValueError(f"Analysis executor must be one of {allowed}")
+        return v_lower
+    
+    @field_validator("ingest_mode")
+    @classmethod
+    def validate_ingest_mode(cls, v: str) -> str:
+        """Validate ingest mode."""
+        allowed = ["direct", "buffered", "durable"]
+        v_lower = v.lower()
+        if v_lower not in allowed:
+            raise ValueError(f"Ingest mode must be one of {allowed}")
+        return v_lower
+    
     @field_validator("environment")
     @classmethod
     def validate_environment(cls, v: str) -> str:
@@ -107,6 +237,11 @@ class Settings(BaseSettings):
         """Parse CORS origins into a list."""
         return [origin.strip() for origin in self.cors_origins.split(",") if origin.strip()]
     
+    @property
+    def rollup_resolutions_list(self) -> List[int]:
+        """Parse rollup resolutions into a sorted list of seconds."""
+        return sorted(int(r) for r in self.rollup_resolutions.split(",") if r.strip())
+    
     @property
     def is_production(self) -> bool:
         """Check if running in production."""
@@ -0,0 +1,423 @@
+"""
+CSV Chunk Parsing
+
+Column-wise parsing of CSV rows for the bulk import path.
+
+A chunk of raw rows is converted at once: values with a NumPy float cast
+(pandas.to_numeric when the chunk holds bad values), naive ISO-8601
+timestamps with pandas.to_datetime, and the value range as an array
+mask. Rows the fast path cannot accept (odd column counts, timezone
+offsets, other timestamp formats, bad or out-of-range values) go
+through the per-row SensorReadingBulk validation, which either accepts
+them or produces the error message reported to the user.
+
+pipeline() runs reading and parsing in a worker thread that feeds parsed
+chunks through a bounded asyncio.Queue to the database writer, so parsing
+the next chunk overlaps with inserting the current one. A full queue
+blocks the parser (backpressure).
+"""
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.schemas.sensor import SensorReadingBase, SensorReadingBulk
+
+# Same bounds as SensorReadingBulk.value
+VALUE_LIMIT = 1e9
+
+
+class ParsedChunk(NamedTuple):
+    """Readings ready for insert plus (row_number, message) for rejected rows, in row order."""
+    rows: List[Dict]
+    errors: List[Tuple[int, str]]
+
+
+def parse_csv_row(
+    row: List[str],
+    row_num: int,
+    sensor_id: str,
+    timestamp_col: int,
+    value_col: int
+) -> dict:
+    """
+    Parse a single CSV row into sensor reading components.
+
+    Handles multiple CSV formats:
+    - 3+ columns: Uses specified column indices
+    - 2 columns: [timestamp, value]
+    - 1 column: [value] with current timestamp
+
+    Args:
+        row: CSV row as list of strings
+        row_num: Row number for error reporting
+        sensor_id: Target sensor ID
+        timestamp_col: Column index for timestamp
+        value_col: Column index for value
+
+    Returns:
+        Dict with 'timestamp' (str or None) and 'value' (str)
+
+    Raises:
+        ValueError: If row cannot be parsed
+    """
+    num_cols = len(row)
+
+    # Handle special case: timestamp_col = -1 means no timestamp column
+    if timestamp_col < 0:
+        # Value-only mode
+        if value_col < num_cols:
+            val_str = row[value_col].strip()
+        elif num_cols >= 1:
+            val_str = row[0].strip()
+        else:
+            raise ValueError("Empty row")
+        return {'timestamp': None, 'value': val_str}
+
+    # Standard column parsing
+    if num_cols >= max(timestamp_col, value_col) + 1:
+        # Use specified column indices
+        ts_str = row[timestamp_col].strip() if timestamp_col < num_cols else None
+        val_str = row[value_col].strip()
+    elif num_cols == 2:
+        # Assume [timestamp, value]
+        ts_str = row[0].strip()
+        val_str = row[1].strip()
+    elif num_cols == 1:
+        # Assume [value] only
+        ts_str = None
+        val_str = row[0].strip()
+    else:
+        raise ValueError(f"Empty row or insufficient columns (got {num_cols})")
+
+    # Validate value is present
+    if not val_str:
+        raise ValueError("Missing value in row")
+
+    return {
+        'timestamp': ts_str if ts_str else None,
+        'value': val_str
+    }
+
+
+def parse_values(values: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert value strings to float64.
+
+    Returns:
+        (values, ok): ok is False for unparseable, non-finite or out-of-range values
+    """
+    strings = np.char.strip(np.asarray(values, dtype=str))
+    try:
+        parsed = strings.astype(np.float64)
+    except ValueError:
+        # At least one bad value: coerce element-wise, bad ones become NaN
+        parsed = pd.to_numeric(pd.Series(strings, dtype=object), errors="coerce").to_numpy(dtype=np.float64)
+    with np.errstate(invalid="ignore"):
+        ok = np.isfinite(parsed) & (np.abs(parsed) <= VALUE_LIMIT)
+    return parsed, ok
+
+
+def parse_timestamps(timestamps: Sequence[str], now: datetime) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert naive ISO-8601 timestamp strings (YYYY-MM-DD[THH:MM[:SS[.ffffff]]])
+    to datetime objects. Empty strings become `now`.
+
+    Returns:
+        (timestamps, ok): object array of datetimes; ok is False where the
+        string has a UTC offset, is in another format or is not a valid date
+    """
+    strings = np.char.strip(np.asarray(timestamps, dtype=str))
+    lengths = np.char.str_len(strings)
+    empty = lengths == 0
+    fast = (
+        (lengths >= 10) & (lengths <= 26)
+        & (np.char.find(strings, "-") == 4)
+        & (np.char.rfind(strings, "-") == 7)  # a later "-" is a UTC offset
+        & (np.char.find(strings, "+") < 0)
+        & ~np.char.endswith(np.char.upper(strings), "Z")
+    )
+
+    parsed = np.full(len(strings), now, dtype=object)
+    ok = empty.copy()
+    if fast.any():
+        converted = pd.to_datetime(strings[fast], format="ISO8601", errors="coerce")
+        if converted.tz is None:
+            valid = converted.notna()
+            idx = np.flatnonzero(fast)[valid]
+            parsed[idx] = converted[valid].to_numpy().astype("datetime64[us]").astype(object)
+            ok[idx] = True
+    return parsed, ok
+
+
+def parse_chunk(
+    raw_rows: List[List[str]],
+    row_nums: List[int],
+    sensor_id: str,
+    timestamp_col: int,
+    value_col: int,
+    now: Optional[datetime] = None,
+) -> ParsedChunk:
+    """
+    Parse a chunk of non-empty CSV rows into reading dicts.
+
+    Args:
+        raw_rows: Rows from csv.reader
+        row_nums: 1-indexed file row number of each row (for error messages)
+        sensor_id: Target sensor ID
+        timestamp_col: Column index for timestamp (-1: no timestamp column)
+        value_col: Column index for value
+        now: Timestamp for rows without one (defaults to datetime.now())
+
+    Returns:
+        ParsedChunk with the accepted readings and the rejected rows' errors
+    """
+    now = now or datetime.now()
+    n = len(raw_rows)
+    min_cols = max(timestamp_col, value_col) + 1
+    regular = np.fromiter((len(row) >= min_cols for row in raw_rows), dtype=bool, count=n)
+    idx = np.flatnonzero(regular)
+
+    ok = regular.copy()
+    values = np.zeros(n)
+    timestamps = np.full(n, now, dtype=object)
+    if len(idx):
+        values[idx], value_ok = parse_values([raw_rows[i][value_col] for i in idx])
+        ok[idx] &= value_ok
+        if timestamp_col >= 0:
+            timestamps[idx], ts_ok = parse_timestamps([raw_rows[i][timestamp_col] for i in idx], now)
+            ok[idx] &= ts_ok
+
+    rows: List[Optional[Dict]] = [
+        {"sensor_id": sensor_id, "timestamp": ts, "value": value} if accepted else None
+        for ts, value, accepted in zip(timestamps.tolist(), values.tolist(), ok.tolist())
+    ]
+
+    # Per-row validation for the rest: accepts what the fast path is too strict for
+    errors: List[Tuple[int, str]] = []
+    for i in np.flatnonzero(~ok):
+        try:
+            parsed = parse_csv_row(raw_rows[i], row_nums[i], sensor_id, timestamp_col, value_col)
+            validated = SensorReadingBulk(timestamp=parsed['timestamp'], value=parsed['value'])
+        except Exception as e:
+            errors.append((row_nums[i], str(e)))
+            continue
+        rows[i] = {"sensor_id": sensor_id, "timestamp": validated.timestamp or now, "value": validated.value}
+
+    return ParsedChunk([row for row in rows if row is not None], errors)
+
+
+# =============================================================================
+# Wide format (one timestamp column, one column per sensor)
+# =============================================================================
+
+@dataclass
+class SensorImportCounts:
+    """Per-sensor outcome of a wide-format import."""
+    imported: int = 0
+    failed: int = 0
+    skipped: int = 0  # empty cells
+
+
+class WideChunk(NamedTuple):
+    """Readings for all mapped sensors, rejected cells and per-sensor counts."""
+    rows: List[Dict]
+    errors: List[Tuple[int, str]]
+    counts: Dict[str, SensorImportCounts]
+
+
+def parse_wide_chunk(
+    raw_rows: List[List[str]],
+    row_nums: List[int],
+    timestamp_col: int,
+    columns: Dict[int, str],
+    now: Optional[datetime] = None,
+) -> WideChunk:
+    """
+    Parse a chunk of wide-format rows into reading dicts for every mapped sensor.
+
+    The timestamp column is parsed once per chunk; each sensor column is
+    parsed as one array. Empty cells (sensor not sampled) are skipped, cells
+    missing from short rows count as empty. A row with an invalid timestamp
+    fails all of its non-empty cells.
+
+    Args:
+        raw_rows: Rows from csv.reader
+        row_nums: 1-indexed file row number of each row (for error messages)
+        timestamp_col: Column index for timestamp
+        columns: Column index -> sensor ID
+        now: Timestamp for rows without one (defaults to datetime.now())
+
+    Returns:
+        WideChunk; errors are (row_number, "<sensor_id>: <message>")
+    """
+    now = now or datetime.now()
+
+    def column(index: int) -> List[str]:
+        return [row[index] if index < len(row) else "" for row in raw_rows]
+
+    timestamps, ts_ok = parse_timestamps(column(timestamp_col), now)
+    ts_errors: Dict[int, str] = {}
+    for i in np.flatnonzero(~ts_ok):
+        try:
+            timestamps[i] = SensorReadingBase.parse_timestamp(raw_rows[i][timestamp_col])
+        except ValueError as e:
+            ts_errors[i] = str(e)
+    timestamp_list = timestamps.tolist()
+
+    rows: List[Dict] = []
+    errors: List[Tuple[int, str]] = []
+    counts: Dict[str, SensorImportCounts] = {}
+    for index, sensor_id in columns.items():
+        cells = column(index)
+        values, ok = parse_values(cells)
+        empty = np.char.str_len(np.char.strip(np.asarray(cells, dtype=str))) == 0
+        counts[sensor_id] = stats = SensorImportCounts(skipped=int(empty.sum()))
+
+        accepted = ok.copy()
+        if ts_errors:
+            accepted[list(ts_errors)] = False
+        rows.extend(
+            {"sensor_id": sensor_id, "timestamp": timestamp_list[i], "value": value}
+            for i, value in zip(np.flatnonzero(accepted).tolist(), values[accepted].tolist())
+        )
+        stats.imported = int(accepted.sum())
+
+        # Per-cell validation for the rest: accepts what the fast path is too strict for
+        for i in np.flatnonzero(~accepted & ~empty):
+            message = ts_errors.get(i)
+            if message is None:
+                try:
+                    value = SensorReadingBulk(value=cells[i]).value
+                except Exception as e:
+                    message = str(e)
+                else:
+                    rows.append({"sensor_id": sensor_id, "timestamp": timestamp_list[i], "value": value})
+                    stats.imported += 1
+                    continue
+            stats.failed += 1
+            errors.append((row_nums[i], f"{sensor_id}: {message}"))
+
+    errors.sort(key=lambda error: error[0])
+    return WideChunk(rows, errors, counts)
+
+
+# =============================================================================
+# Pipelined import
+# =============================================================================
+
+@dataclass
+class PipelineStats:
+    """Row counts and per-stage time of a pipelined import."""
+    total_rows: int = 0
+    skipped_rows: int = 0
+    parse_seconds: float = 0.0  # parser thread: reading and parsing
+    parser_blocked_seconds: float = 0.0  # parser thread: waiting on a full queue
+    writer_idle_seconds: float = 0.0  # writer: waiting for a parsed chunk
+
+
+class _End(NamedTuple):
+    """Queue sentinel; carries the parser's exception, if any."""
+    error: Optional[BaseException] = None
+
+
+def parse_chunks(
+    reader: Iterable[List[str]],
+    row_num: int,
+    chunk_size: int,
+    stats: PipelineStats,
+    parse: Callable[[List[List[str]], List[int]], Any],
+) -> Iterator[Any]:
+    """
+    Parse CSV rows in chunks of `chunk_size` non-empty rows.
+
+    Args:
+        reader: csv.reader positioned after the header
+        row_num: File row number of the last row already consumed (header)
+        chunk_size: Rows per chunk
+        stats: Receives total and skipped (empty) row counts
+        parse: Chunk parser called with (raw_rows, row_nums),
+            e.g. a partial of parse_chunk or parse_wide_chunk
+    """
+    raw_rows: List[List[str]] = []
+    row_nums: List[int] = []
+    for row in reader:
+        row_num += 1
+        stats.total_rows += 1
+
+        # Skip empty rows
+        if not row or all(cell.strip() == '' for cell in row):
+            stats.skipped_rows += 1
+            continue
+
+        raw_rows.append(row)
+        row_nums.append(row_num)
+        if len(raw_rows) >= chunk_size:
+            yield parse(raw_rows, row_nums)
+            raw_rows, row_nums = [], []
+
+    if raw_rows:
+        yield parse(raw_rows, row_nums)
+
+
+async def pipeline(chunks: Iterator[Any], depth: int, stats: PipelineStats) -> AsyncIterator[Any]:
+    """
+    Produce `chunks` in a worker thread and yield them through a bounded queue.
+
+    At most `depth` parsed chunks wait for the consumer. Exceptions from the
+    parser are re-raised in the consumer. Use with contextlib.aclosing so an
+    aborted import stops the parser thread.
+
+    Args:
+        chunks: Iterator that does the reading/parsing work (e.g. parse_chunks)
+        depth: Queue capacity in chunks
+        stats: Receives the per-stage timings
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(item) -> None:
+        started = time.perf_counter()
+        asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+        stats.parser_blocked_seconds += time.perf_counter() - started
+
+    def produce() -> None:
+        error = None
+        try:
+            while not stop.is_set():
+                started = time.perf_counter()
+                chunk = next(chunks, None)
+                stats.parse_seconds += time.perf_counter() - started
+                if chunk is None:
+                    break
+                put(chunk)
+        except BaseException as e:
+            error = e
+        put(_End(error))
+
+    producer = loop.run_in_executor(None, produce)
+    finished = False
+    try:
+        while True:
+            started = time.perf_counter()
+            item = await queue.get()
+            stats.writer_idle_seconds += time.perf_counter() - started
+            if isinstance(item, _End):
+                finished = True
+                if item.error is not None:
+                    raise item.error
+                break
+            yield item
+    finally:
+        # Aborted early: stop the parser and drain so a blocked put returns
+        stop.set()
+        while not finished:
+            finished = isinstance(await queue.get(), _End)
+        await producer
@@ -0,0 +1,112 @@
+"""
+Chart Series Downsampling
+
+Largest-Triangle-Three-Buckets (LTTB) decimation for the chart series in
+analysis results, so responses carry a few hundred points instead of the
+full window while keeping peaks and the visual shape.
+
+All chart series in a result share one x-axis (the frontend indexes
+timestamps, trend, residuals and hysteresis curves by position), so one
+index set is picked from the signal and applied to every series.
+"""
+
+from typing import Any, Dict, Sequence, Union
+
+import numpy as np
+
+from backend.core.encoding import decode_series, encode_series, is_compact
+
+# Series aligned with the input window; DFA scales/fluctuations are not
+CHART_FIELDS = ("timestamps", "trend", "residuals", "hysteresis_x", "hysteresis_y")
+
+
+def lttb_indices(y: Union[np.ndarray, Sequence[float]], n_out: int) -> np.ndarray:
+    """
+    Indices of the `n_out` points LTTB keeps from `y` (x is the position).
+
+    The first and last points are always kept. Each bucket picks the point
+    forming the largest triangle with the previously kept point and the
+    mean of the next bucket; the per-bucket search is vectorized, leaving
+    one Python iteration per output point.
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # Bucket edges over the interior points 1..n-2
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    # Mean of each bucket (used as the third vertex for the bucket before it)
+    sums = np.add.reduceat(y[1:n - 1], edges[:-1] - 1)
+    counts = np.diff(edges)
+    means_y = sums / counts
+    means_x = (edges[:-1] + edges[1:] - 1) / 2.0
+
+    indices = np.empty(n_out, dtype=int)
+    indices[0] = 0
+    indices[-1] = n - 1
+    x = np.arange(n, dtype=float)
+
+    prev = 0
+    for b in range(n_out - 2):
+        start, stop = edges[b], edges[b + 1]
+        if b + 1 < n_out - 2:
+            next_x, next_y = means_x[b + 1], means_y[b + 1]
+        else:
+            next_x, next_y = x[-1], y[-1]
+
+        bx = x[start:stop]
+        by = y[start:stop]
+        # Twice the triangle area (sign dropped)
+        area = np.abs((x[prev] - next_x) * (by - y[prev]) - (x[prev] - bx) * (next_y - y[prev]))
+        prev = start + int(np.argmax(area))
+        indices[b + 1] = prev
+
+    return indices
+
+
+def downsample_metrics(metrics: Dict[str, Any], max_points: int) -> Dict[str, Any]:
+    """
+    Return a copy of `metrics` with every chart series reduced to `max_points`.
+
+    The index set is chosen from trend + residuals (the preprocessed
+    signal). Works on list, numpy and compact (base64) metrics; series whose
+    length differs from the window are left as they are.
+    """
+    compact = is_compact(metrics)
+
+    def as_array(value):
+        return decode_series(value) if compact and isinstance(value, str) else np.asarray(value)
+
+    trend = metrics.get("trend")
+    residuals = metrics.get("residuals")
+    if trend is None or residuals is None:
+        return dict(metrics)
+
+    signal = as_array(trend) + as_array(residuals)
+    n = len(signal)
+    if n <= max_points:
+        return dict(metrics)
+
+    idx = lttb_indices(signal, max_points)
+    out = dict(metrics)
+    for field in CHART_FIELDS:
+        value = out.get(field)
+        if value is None or len(value) == 0:
+            continue
+        if field == "timestamps":
+            if len(value) == n:
+                out[field] = [value[i] for i in idx]
+            continue
+
+        arr = as_array(value)
+        if len(arr) != n:
+            continue
+        picked = arr[idx]
+        if compact:
+            out[field] = encode_series(picked)
+        elif isinstance(value, np.ndarray):
+            out[field] = picked
+        else:
+            out[field] = picked.tolist()
+    return out
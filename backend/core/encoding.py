@@ -0,0 +1,80 @@
+"""
+Compact Series Encoding
+
+Encodes the array-valued analysis metrics (trend, residuals, hysteresis
+curves, DFA scales/fluctuations) as base64 little-endian float32 buffers.
+
+A compact metrics dict keeps the usual field names, holds base64 strings
+for the series and carries "encoding": "f32-base64" so readers can tell
+it apart from the plain list form. Scalars are left untouched. float32
+keeps ~7 significant digits, which is plenty for plotting.
+
+Client-side decoding (JavaScript):
+    new Float32Array(Uint8Array.from(atob(s), c => c.charCodeAt(0)).buffer)
+"""
+
+import base64
+from typing import Any, Dict, Sequence, Union
+
+import numpy as np
+
+COMPACT_ENCODING = "f32-base64"
+
+SERIES_FIELDS = (
+    "hysteresis_x",
+    "hysteresis_y",
+    "dfa_scales",
+    "dfa_fluctuations",
+    "trend",
+    "residuals",
+)
+
+
+def encode_series(values: Union[np.ndarray, Sequence[float]]) -> str:
+    """Encode a numeric series as base64 float32 (little-endian)."""
+    buffer = np.ascontiguousarray(values, dtype="<f4").tobytes()
+    return base64.b64encode(buffer).decode("ascii")
+
+
+def decode_series(data: str) -> np.ndarray:
+    """Decode a base64 float32 series into a float64 array."""
+    return np.frombuffer(base64.b64decode(data), dtype="<f4").astype(np.float64)
+
+
+def is_compact(metrics: Dict[str, Any]) -> bool:
+    """True if `metrics` holds encoded series."""
+    return metrics.get("encoding") == COMPACT_ENCODING
+
+
+def compact_metrics(metrics: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a copy of `metrics` with every series encoded."""
+    if is_compact(metrics):
+        return dict(metrics)
+
+    compact = dict(metrics)
+    for field in SERIES_FIELDS:
+        if compact.get(field) is not None:
+            compact[field] = encode_series(compact[field])
+    compact["encoding"] = COMPACT_ENCODING
+    return compact
+
+
+def expand_metrics(metrics: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Return a copy of `metrics` with every series as a list of floats.
+
+    Accepts compact dicts, plain dicts with lists and dicts holding numpy
+    arrays (as returned by SensorAnalyzer.analyze(return_arrays=True)).
+    """
+    compact = is_compact(metrics)
+    expanded = dict(metrics)
+    expanded.pop("encoding", None)
+    for field in SERIES_FIELDS:
+        value = expanded.get(field)
+        if value is None:
+            continue
+        if compact:
+            expanded[field] = decode_series(value).tolist()
+        elif isinstance(value, np.ndarray):
+            expanded[field] = value.tolist()
+    return expanded
@@ -0,0 +1,147 @@
+"""
+Analysis Executor
+
+Runs CPU-bound sensor analysis off the event loop.
+
+Modes (settings.analysis_executor):
+- process: ProcessPoolExecutor whose workers import numpy/scipy and the
+  analysis module up front, so the first request does not pay for it
+- thread: ThreadPoolExecutor (numpy releases the GIL in most kernels)
+- inline (default): run in the calling coroutine, as before the executor
+  existed; blocks the event loop for the duration of each analysis
+
+Jobs must be module-level functions with picklable arguments so the
+same call works in every mode.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from backend.core.config import settings
+from backend.core.metrics import ANALYSIS_QUEUE_DEPTH, ANALYSIS_QUEUE_WAIT, ANALYSIS_RUN_LATENCY
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# Worker-side functions
+# =============================================================================
+
+def _warm_worker() -> None:
+    """Process pool initializer: import the numeric stack and prime caches."""
+    import numpy as np
+    from backend.analysis import SensorAnalyzer
+
+    # One small run compiles the lru_cached DFA operators and x-axes
+    SensorAnalyzer().analyze(np.sin(np.linspace(0, 20, 200)).tolist())
+
+
+def _timed_call(submitted_at: float, func: Callable, args: Tuple) -> Tuple[float, float, Any]:
+    """Run `func(*args)` and report (queue wait, run time, result)."""
+    started_at = time.time()
+    result = func(*args)
+    return started_at - submitted_at, time.time() - started_at, result
+
+
+def analyze_values(values: List[float], config: Any = None, return_arrays: bool = False) -> Dict[str, Any]:
+    """Full SensorAnalyzer.analyze run for one window."""
+    from backend.analysis import SensorAnalyzer
+
+    analyzer = SensorAnalyzer(config) if config else SensorAnalyzer()
+    return analyzer.analyze(values, return_arrays=return_arrays)
+
+
+def analyze_rolling_values(values: List[float], window: int, step: int, config: Any = None) -> Dict[str, Any]:
+    """SensorAnalyzer.analyze_rolling run for one series."""
+    from backend.analysis import SensorAnalyzer
+
+    analyzer = SensorAnalyzer(config) if config else SensorAnalyzer()
+    return analyzer.analyze_rolling(values, window, step)
+
+
+def seed_stream_state(state: Any, values: List[float]) -> Any:
+    """Seed an IncrementalSensorAnalyzer and return it (a copy in process mode)."""
+    state.seed(values)
+    return state
+
+
+# =============================================================================
+# Executor
+# =============================================================================
+
+class AnalysisExecutor:
+    """
+    Dispatches analysis jobs to a process pool, a thread pool or inline.
+
+    The pool is created lazily on first use (or by start()), so code paths
+    that never reach the application lifespan still work.
+    """
+
+    def __init__(self, mode: str = "process", max_workers: int = 2):
+        self.mode = mode
+        self.max_workers = max_workers
+        self._pool: Optional[Executor] = None
+
+    def start(self) -> None:
+        """Create the worker pool (no-op for inline mode or if already running)."""
+        if self._pool is not None or self.mode == "inline":
+            return
+        if self.mode == "process":
+            # spawn: forking a process that already runs an event loop and
+            # DB driver threads is unsafe
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_warm_worker,
+            )
+        else:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="analysis",
+            )
+        logger.info(f"Analysis executor started ({self.mode}, {self.max_workers} workers)")
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker pool."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+            logger.info("Analysis executor stopped")
+
+    async def run(self, func: Callable, *args: Any) -> Any:
+        """
+        Run `func(*args)` in the executor and await the result.
+
+        Exceptions raised by the job propagate to the caller. A broken
+        process pool is discarded so the next call starts a fresh one.
+        """
+        ANALYSIS_QUEUE_DEPTH.inc()
+        try:
+            if self.mode == "inline":
+                wait, run_time, result = _timed_call(time.time(), func, args)
+            else:
+                self.start()
+                loop = asyncio.get_running_loop()
+                try:
+                    wait, run_time, result = await loop.run_in_executor(
+                        self._pool, _timed_call, time.time(), func, args
+                    )
+                except BrokenProcessPool:
+                    logger.error("Analysis process pool broke; it will be recreated")
+                    self.shutdown(wait=False)
+                    raise
+        finally:
+            ANALYSIS_QUEUE_DEPTH.dec()
+
+        ANALYSIS_QUEUE_WAIT.observe(max(wait, 0.0))
+        ANALYSIS_RUN_LATENCY.observe(run_time)
+        return result
+
+
+# Shared executor, started/stopped by the application lifespan
+analysis_executor = AnalysisExecutor(settings.analysis_executor, settings.analysis_workers)
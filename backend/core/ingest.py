@@ -0,0 +1,328 @@
+"""
+Ingest Buffer
+
+Write-behind buffer for streamed sensor readings.
+
+Readings from concurrent requests are appended to one in-memory batch
+that is written with a single multi-row INSERT (plus rollup upserts) and
+one commit, when it reaches settings.ingest_batch_size rows or when its
+oldest reading has waited settings.ingest_flush_ms.
+
+Durability (settings.ingest_mode, buffering is opt-in):
+- direct (default): the buffer is bypassed by the routes (one commit per request)
+- durable: add() returns once the batch holding the readings is committed
+  (flush before ack); a failed flush raises in every waiting request
+- buffered: add() returns once the readings are queued; a failed flush
+  is logged and counted, and its readings are lost
+
+Producers wait for a flush when more than settings.ingest_max_pending
+readings are queued (backpressure).
+
+Bulk loads (CSV import) can use the driver's binary COPY protocol on
+PostgreSQL (asyncpg); other databases use the multi-row INSERT.
+
+WebSocket ingest frames are decoded by parse_frame().
+"""
+
+import asyncio
+import json
+import logging
+import math
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.config import settings
+from backend.core.metrics import INGEST_BATCH_SIZE, INGEST_FLUSH_FAILURES, INGEST_FLUSH_LATENCY, INGEST_PENDING
+from backend.models_db import SensorReading
+
+logger = logging.getLogger(__name__)
+
+
+INSERT_MODE_EXECUTEMANY = "executemany"
+INSERT_MODE_COPY = "copy"
+
+
+def copy_supported(db: AsyncSession) -> bool:
+    """True if bulk loads on this session can use COPY (PostgreSQL via asyncpg)."""
+    dialect = db.get_bind().dialect
+    return settings.ingest_copy_enabled and dialect.name == "postgresql" and dialect.driver == "asyncpg"
+
+
+async def _copy_readings(db: AsyncSession, rows: List[Dict]) -> None:
+    """
+    Load rows with asyncpg's binary COPY on the session's connection.
+
+    The COPY joins the session's open transaction, so it is committed or
+    rolled back together with the rest of the unit of work.
+    """
+    connection = await db.connection()
+    raw = await connection.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        SensorReading.__tablename__,
+        records=[(row["sensor_id"], row["timestamp"], row["value"]) for row in rows],
+        columns=["sensor_id", "timestamp", "value"],
+    )
+
+
+async def write_readings(db: AsyncSession, rows: List[Dict], use_copy: bool = False) -> str:
+    """
+    Insert reading rows and fold them into the rollup tiers. Does not commit.
+
+    Args:
+        db: Database session
+        rows: Dicts with sensor_id, timestamp (datetime) and value
+        use_copy: Bulk-load with COPY when the database supports it
+
+    Returns:
+        Insert mode used: "copy" or "executemany"
+    """
+    mode = INSERT_MODE_COPY if use_copy and copy_supported(db) else INSERT_MODE_EXECUTEMANY
+    if not rows:
+        return mode
+    if mode == INSERT_MODE_COPY:
+        await _copy_readings(db, rows)
+    else:
+        await db.execute(insert(SensorReading), rows)
+
+    if settings.rollup_enabled:
+        from backend.repositories.rollups import RollupStore
+
+        by_sensor = defaultdict(list)
+        for row in rows:
+            by_sensor[row["sensor_id"]].append(row)
+        rollups = RollupStore(db)
+        for sensor_id, sensor_rows in by_sensor.items():
+            await rollups.add(
+                sensor_id,
+                np.array([row["timestamp"] for row in sensor_rows], dtype="datetime64[us]"),
+                np.array([row["value"] for row in sensor_rows], dtype=np.float64),
+            )
+    return mode
+
+
+# Same bounds as SensorReadingBase.value
+VALUE_LIMIT = 1e9
+
+
+def parse_frame(frame: Union[str, bytes], now: datetime) -> List[Dict]:
+    """
+    Decode a compact WebSocket ingest frame into reading dicts.
+
+    A frame is a JSON array of points; a point is [sensor_id, value] or
+    [sensor_id, value, timestamp], the timestamp given as Unix epoch
+    seconds or an ISO-8601 string. Points without one get `now`.
+
+    Raises:
+        ValueError: Malformed frame (the whole frame is rejected)
+    """
+    try:
+        points = json.loads(frame)
+    except ValueError:
+        raise ValueError("Frame is not valid JSON")
+    if not isinstance(points, list) or not points:
+        raise ValueError("Frame must be a non-empty array of points")
+    if len(points) > settings.stream_batch_max_points:
+        raise ValueError(f"At most {settings.stream_batch_max_points} points per frame")
+
+    rows = []
+    for i, point in enumerate(points):
+        if not isinstance(point, list) or len(point) not in (2, 3):
+            raise ValueError(f"Point {i}: expected [sensor_id, value] or [sensor_id, value, timestamp]")
+        sensor_id, value = point[0], point[1]
+        if not isinstance(sensor_id, str) or not sensor_id:
+            raise ValueError(f"Point {i}: sensor_id must be a non-empty string")
+        if (
+            isinstance(value, bool) or not isinstance(value, (int, float))
+            or not math.isfinite(value) or abs(value) > VALUE_LIMIT
+        ):
+            raise ValueError(f"Point {i}: value must be a finite number within ±{VALUE_LIMIT:g}")
+
+        timestamp = now
+        if len(point) == 3:
+            raw = point[2]
+            try:
+                if isinstance(raw, (int, float)) and not isinstance(raw, bool):
+                    timestamp = datetime.fromtimestamp(raw)
+                elif isinstance(raw, str):
+                    timestamp = datetime.fromisoformat(raw)
+                else:
+                    raise ValueError
+            except (ValueError, OverflowError, OSError):
+                raise ValueError(f"Point {i}: invalid timestamp {raw!r}")
+        rows.append({"sensor_id": sensor_id, "timestamp": timestamp, "value": float(value)})
+    return rows
+
+
+class IngestBuffer:
+    """
+    Coalesces streamed readings into batched inserts.
+
+    The flusher task is started lazily on first use (or by start()), and
+    is restarted if the event loop changed, so code paths that never reach
+    the application lifespan still work.
+    """
+
+    def __init__(
+        self,
+        session_factory=None,
+        batch_size: int = 500,
+        flush_interval: float = 0.2,
+        max_pending: int = 20000,
+    ):
+        """
+        Initialize buffer.
+
+        Args:
+            session_factory: Async session factory (defaults to backend.database.AsyncSessionLocal)
+            batch_size: Rows that trigger an immediate flush
+            flush_interval: Seconds a row may wait before being flushed
+            max_pending: Rows above which add() waits for a flush
+        """
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._rows: List[Dict] = []
+        self._done: Optional[asyncio.Future] = None  # resolved when the current batch is committed
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+
+    @property
+    def pending(self) -> int:
+        """Rows queued and not yet handed to a flush."""
+        return len(self._rows)
+
+    def start(self) -> None:
+        """Start the flusher task on the running loop (no-op if already running there)."""
+        loop = self._bind_loop()
+        if self._task is not None and not self._task.done():
+            return
+        self._task = loop.create_task(self._run(), name="ingest-buffer")
+        logger.info(
+            f"Ingest buffer started (batch {self.batch_size}, {self.flush_interval * 1000:.0f} ms)"
+        )
+
+    async def stop(self) -> None:
+        """Flush what is queued and stop the flusher task."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        await self.flush()
+        logger.info("Ingest buffer stopped")
+
+    async def add(self, rows: List[Dict], wait: bool = False) -> None:
+        """
+        Queue reading rows (sensor_id, timestamp, value) for the next flush.
+
+        Args:
+            rows: Reading dicts
+            wait: Return only after the rows are committed (raises if the flush fails)
+        """
+        self.start()
+        while self.pending >= self.max_pending:
+            await self.flush()
+
+        if self._done is None:
+            self._done = self._loop.create_future()
+        done = self._done
+        was_empty = not self._rows
+        self._rows.extend(rows)
+        INGEST_PENDING.set(self.pending)
+        if was_empty or self.pending >= self.batch_size:
+            # First row starts the flush_interval timer; a full batch flushes now
+            self._wakeup.set()
+
+        if wait:
+            await asyncio.shield(done)
+
+    async def flush(self) -> int:
+        """Write the queued rows now. Returns the number of rows written."""
+        self._bind_loop()
+        async with self._flush_lock:
+            rows, done = self._rows, self._done
+            self._rows, self._done = [], None
+            INGEST_PENDING.set(0)
+            if not rows:
+                return 0
+
+            started = time.time()
+            try:
+                async with self._session_factory()() as db:
+                    await write_readings(db, rows)
+                    await db.commit()
+            except Exception as e:
+                INGEST_FLUSH_FAILURES.inc()
+                logger.error(f"Ingest flush of {len(rows)} readings failed: {e}")
+                if done is not None and not done.done():
+                    done.set_exception(e)
+                    # Mark retrieved: buffered producers never await it
+                    done.exception()
+                return 0
+
+            INGEST_BATCH_SIZE.observe(len(rows))
+            INGEST_FLUSH_LATENCY.observe(time.time() - started)
+            if done is not None and not done.done():
+                done.set_result(len(rows))
+            return len(rows)
+
+    def _bind_loop(self) -> asyncio.AbstractEventLoop:
+        """(Re)create loop-bound primitives when first used on a new event loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._wakeup = asyncio.Event()
+            self._flush_lock = asyncio.Lock()
+            self._task = None
+            self._done = loop.create_future() if self._rows else None
+        return loop
+
+    def _session_factory(self):
+        if self.session_factory is None:
+            from backend.database import AsyncSessionLocal
+            return AsyncSessionLocal
+        return self.session_factory
+
+    async def _run(self) -> None:
+        """Flush whenever the batch is full or its oldest row is flush_interval old."""
+        while True:
+            if not self._rows:
+                # Idle until the first row arrives
+                await self._wait_for_wakeup(None)
+                if not self._rows:
+                    continue
+            if self.pending < self.batch_size:
+                # Drop the first-row signal and wait for a full batch or the interval
+                self._wakeup.clear()
+                await self._wait_for_wakeup(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Ingest flusher error: {e}", exc_info=True)
+
+    async def _wait_for_wakeup(self, timeout: Optional[float]) -> None:
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+
+# Shared buffer, started/stopped by the application lifespan
+ingest_buffer = IngestBuffer(
+    batch_size=settings.ingest_batch_size,
+    flush_interval=settings.ingest_flush_ms / 1000,
+    max_pending=settings.ingest_max_pending,
+)
@@ -8,7 +8,7 @@ import time
 import logging
 from typing import Callable
 from functools import wraps
-from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client import Counter, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +44,79 @@ DB_OPERATION_LATENCY = Histogram(
     ["operation", "table"]
 )
 
+# Analysis Executor Metrics
+ANALYSIS_QUEUE_DEPTH = Gauge(
+    "analysis_executor_queue_depth",
+    "Analysis jobs submitted to the executor and not yet finished"
+)
+
+ANALYSIS_QUEUE_WAIT = Histogram(
+    "analysis_executor_wait_seconds",
+    "Time analysis jobs spend queued before a worker picks them up"
+)
+
+ANALYSIS_RUN_LATENCY = Histogram(
+    "analysis_executor_run_seconds",
+    "Time analysis jobs spend running in a worker"
+)
+
+# Analysis Cache Metrics
+ANALYSIS_CACHE_HITS = Counter(
+    "analysis_cache_hits_total",
+    "Analysis results served from the result cache",
+    ["backend"]
+)
+
+ANALYSIS_CACHE_MISSES = Counter(
+    "analysis_cache_misses_total",
+    "Analysis requests not found in the result cache",
+    ["backend"]
+)
+
+# Retention Metrics
+RETENTION_ROWS_DELETED = Counter(
+    "retention_rows_deleted_total",
+    "Raw readings removed by the retention job",
+    ["table"]
+)
+
+RETENTION_RUN_DURATION = Histogram(
+    "retention_run_duration_seconds",
+    "Duration of retention job runs"
+)
+
+# Ingest Buffer Metrics
+INGEST_BATCH_SIZE = Histogram(
+    "ingest_flush_batch_rows",
+    "Readings written per ingest buffer flush",
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+)
+
+INGEST_FLUSH_LATENCY = Histogram(
+    "ingest_flush_duration_seconds",
+    "Time to insert and commit one ingest buffer batch"
+)
+
+INGEST_PENDING = Gauge(
+    "ingest_pending_rows",
+    "Readings buffered and not yet flushed"
+)
+
+INGEST_FLUSH_FAILURES = Counter(
+    "ingest_flush_failures_total",
+    "Ingest buffer flushes that failed (rows in buffered mode are lost)"
+)
+
+INGEST_WS_CONNECTIONS = Gauge(
+    "ingest_websocket_connections",
+    "Open WebSocket ingest connections"
+)
+
+INGEST_WS_POINTS = Counter(
+    "ingest_websocket_points_total",
+    "Points acknowledged on WebSocket ingest connections"
+)
+
 
 def track_time(metric: Histogram, labels: dict = None):
     """Decorator to track execution time of a function."""
@@ -0,0 +1,68 @@
+"""
+Keyset Pagination
+
+Opaque cursors and page totals for list endpoints.
+
+A cursor encodes the (timestamp, id) key of the last row of a page as
+URL-safe base64 JSON. The next page is fetched with a row-value
+comparison on the same key, which the (…, timestamp) indexes answer
+with a seek instead of reading and discarding OFFSET rows.
+
+Totals are optional: "exact" runs a full COUNT(*), "estimate" counts at
+most TOTAL_ESTIMATE_CAP rows and flags the result as an estimate when
+the cap is hit, "none" skips counting.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Rows counted at most for total="estimate"
+TOTAL_ESTIMATE_CAP = 10_000
+
+
+def encode_cursor(timestamp: datetime, key: Any) -> str:
+    """Opaque cursor for the row with this (timestamp, id) key."""
+    raw = json.dumps([timestamp.isoformat(), key], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, Any]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, key = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(timestamp), key
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+async def page_total(db: AsyncSession, rows: Select, mode: str) -> Tuple[Optional[int], bool]:
+    """
+    Count the rows matched by `rows` according to `mode`.
+
+    Args:
+        db: Database session
+        rows: Filtered select of the listed rows (no ordering or limit)
+        mode: "exact", "estimate" or "none"
+
+    Returns:
+        (total or None, whether the total is a capped estimate)
+    """
+    if mode == "none":
+        return None, False
+    if mode == "estimate":
+        capped = await db.scalar(
+            select(func.count()).select_from(rows.limit(TOTAL_ESTIMATE_CAP + 1).subquery())
+        )
+        return min(capped, TOTAL_ESTIMATE_CAP), capped > TOTAL_ESTIMATE_CAP
+    return await db.scalar(select(func.count()).select_from(rows.subquery())), False
@@ -17,6 +17,8 @@ import logging
 # Core imports
 from backend.core.config import settings
 from backend.database import engine, Base
+from backend.core.executor import analysis_executor
+from backend.core.ingest import ingest_buffer
 
 # Router imports
 from backend.api.routes import health, sensors, analytics, synthetic, reports, auth
@@ -45,8 +47,8 @@ async def lifespan(app: FastAPI):
     Application lifespan manager.
     
     Handles startup and shutdown events:
-    - Startup: Create database tables
-    - Shutdown: Dispose database engine
+    - Startup: Create database tables, start the analysis executor and ingest buffer
+    - Shutdown: Flush the ingest buffer, stop the analysis executor, dispose database engine
     """
     # Startup
     logger.info(f"🚀 Starting {settings.app_name} v{settings.app_version}")
@@ -57,10 +59,15 @@ async def lifespan(app: FastAPI):
         await conn.run_sync(Base.metadata.create_all)
         logger.info("✓ Database tables created")
     
+    analysis_executor.start()
+    ingest_buffer.start()
+    
     yield
     
     # Shutdown
     logger.info("Shutting down backend...")
+    await ingest_buffer.stop()
+    analysis_executor.shutdown()
     await engine.dispose()
     logger.info("✓ Database connections closed")
 
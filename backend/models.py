@@ -17,6 +17,7 @@ class SensorCreate(BaseModel):
     location: str
     source_type: str = "CSV"
     organization_id: Optional[str] = None
+    raw_retention_days: Optional[int] = None
 
 class SensorResponse(BaseModel):
     id: str
@@ -24,6 +25,7 @@ class SensorResponse(BaseModel):
     location: str
     source_type: str
     organization_id: Optional[str] = None
+    raw_retention_days: Optional[int] = None
     latest_health_score: Optional[float] = 100.0
     latest_status: Optional[str] = "Normal"
     latest_analysis_timestamp: Optional[datetime] = None
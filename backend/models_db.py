@@ -7,7 +7,7 @@ Supports organizations, users with role-based access, and sensor data management
 
 from sqlalchemy import (
     Column, Integer, String, Float, ForeignKey, DateTime, 
-    Enum, JSON, Text, Boolean
+    Enum, JSON, Text, Boolean, Index, LargeBinary, UniqueConstraint
 )
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import relationship
@@ -71,6 +71,8 @@ class Organization(Base):
     )
     name = Column(String(255), unique=True, index=True, nullable=False)
     subscription_plan = Column(String(50), default="Free")
+    # Days raw readings are kept (None: settings.raw_retention_days)
+    raw_retention_days = Column(Integer, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -142,6 +144,8 @@ class Sensor(Base):
     location = Column(String(255), nullable=True)
     source_type = Column(Enum(SourceType), default=SourceType.CSV)
     config = Column(JSON, nullable=True)  # For SCADA IP/Protocol details
+    # Overrides the organization's raw_retention_days when set
+    raw_retention_days = Column(Integer, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -159,8 +163,14 @@ class SensorReading(Base):
     Sensor reading model for time-series data storage.
     
     Stores individual sensor measurements with timestamps.
+    
+    The (sensor_id, timestamp, value) index serves the per-sensor window
+    and time-range fetches as index-only scans in timestamp order.
     """
     __tablename__ = "sensor_readings"
+    __table_args__ = (
+        Index("ix_sensor_readings_sensor_ts_value", "sensor_id", "timestamp", "value"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     sensor_id = Column(
@@ -179,13 +189,82 @@ class SensorReading(Base):
         return f"<SensorReading(id={self.id}, sensor={self.sensor_id}, value={self.value})>"
 
 
+class ReadingBlock(Base):
+    """
+    Compressed block of readings for one sensor and time bucket.
+    
+    Optional storage tier: older rows of sensor_readings can be packed into
+    blocks (see backend/core/block_codec.py) and are read back
+    transparently by ReadingStore when block storage is enabled.
+    """
+    __tablename__ = "sensor_reading_blocks"
+    __table_args__ = (
+        UniqueConstraint("sensor_id", "bucket_start", name="uq_reading_blocks_sensor_bucket"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    sensor_id = Column(
+        String(50),
+        ForeignKey("sensors.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    bucket_start = Column(DateTime, nullable=False)
+    first_ts = Column(DateTime, nullable=False)
+    last_ts = Column(DateTime, nullable=False)
+    count = Column(Integer, nullable=False)
+    payload = Column(LargeBinary, nullable=False)
+
+    def __repr__(self):
+        return f"<ReadingBlock(sensor={self.sensor_id}, bucket={self.bucket_start}, count={self.count})>"
+
+
+class ReadingRollup(Base):
+    """
+    Pre-aggregated readings for one sensor, resolution and time bucket.
+    
+    Tiers (settings.rollup_resolutions) are updated additively on ingest
+    and rebuilt from raw readings by a periodic task; long date ranges
+    are read from the coarsest tier that still gives enough points.
+    """
+    __tablename__ = "sensor_reading_rollups"
+
+    sensor_id = Column(
+        String(50),
+        ForeignKey("sensors.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    resolution = Column(Integer, primary_key=True)  # Bucket width in seconds
+    bucket_start = Column(DateTime, primary_key=True)
+    value_count = Column(Integer, nullable=False)
+    value_sum = Column(Float, nullable=False)
+    value_sum_sq = Column(Float, nullable=False)
+    value_min = Column(Float, nullable=False)
+    value_max = Column(Float, nullable=False)
+
+    def __repr__(self):
+        return f"<ReadingRollup(sensor={self.sensor_id}, res={self.resolution}s, bucket={self.bucket_start})>"
+
+
 class AnalysisResultDB(Base):
     """
     Analysis result model for storing sensor health analysis outcomes.
     
     Contains health scores, diagnostic metrics, and recommendations.
+    
+    Scalar metrics are typed columns; the bulky chart series (trend,
+    residuals, hysteresis curves, DFA points, timestamps) live in
+    AnalysisArtifact and are only loaded when explicitly requested.
     """
     __tablename__ = "analysis_results"
+    __table_args__ = (
+        Index("ix_analysis_results_sensor_ts", "sensor_id", "timestamp"),
+    )
+
+    # Metric names stored as columns (everything else goes to the artifact)
+    SCALAR_METRICS = (
+        "bias", "slope", "noise_std", "snr_db", "hysteresis",
+        "hurst", "hurst_r2", "dfa_alpha", "dfa_r_squared",
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     sensor_id = Column(
@@ -197,12 +276,57 @@ class AnalysisResultDB(Base):
     timestamp = Column(DateTime, default=datetime.utcnow, index=True)
     health_score = Column(Float, nullable=True)
     status = Column(String(50), nullable=True)  # 'Normal', 'Warning', 'Critical', 'Unknown'
-    metrics = Column(JSON, nullable=True)  # Stores bias, slope, hysteresis curves, etc.
+    bias = Column(Float, nullable=True)
+    slope = Column(Float, nullable=True)
+    noise_std = Column(Float, nullable=True)
+    snr_db = Column(Float, nullable=True)
+    hysteresis = Column(Float, nullable=True)
+    hurst = Column(Float, nullable=True)
+    hurst_r2 = Column(Float, nullable=True)
+    dfa_alpha = Column(Float, nullable=True)
+    dfa_r_squared = Column(Float, nullable=True)
     diagnosis = Column(Text, nullable=True)
     recommendation = Column(Text, nullable=True)
 
     # Relationships
     sensor = relationship("Sensor", back_populates="analyses")
+    # lazy="raise": series must be loaded explicitly (selectinload)
+    artifact = relationship(
+        "AnalysisArtifact",
+        uselist=False,
+        lazy="raise",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+
+    @property
+    def scalar_metrics(self) -> dict:
+        """Scalar metrics that are set, keyed by metric name."""
+        return {
+            name: getattr(self, name)
+            for name in self.SCALAR_METRICS
+            if getattr(self, name) is not None
+        }
 
     def __repr__(self):
         return f"<AnalysisResult(id={self.id}, sensor={self.sensor_id}, score={self.health_score})>"
+
+
+class AnalysisArtifact(Base):
+    """
+    Chart series of one analysis result.
+    
+    `series` holds the non-scalar metrics, base64/float32-encoded when
+    settings.compact_metrics_storage is enabled (see backend/core/encoding.py).
+    """
+    __tablename__ = "analysis_artifacts"
+
+    analysis_id = Column(
+        Integer,
+        ForeignKey("analysis_results.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    series = Column(JSON, nullable=False)
+
+    def __repr__(self):
+        return f"<AnalysisArtifact(analysis={self.analysis_id})>"
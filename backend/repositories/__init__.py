@@ -1,5 +1,6 @@
 """Repositories package."""
 
 from backend.repositories.base import BaseRepository
+from backend.repositories.readings import ReadingSeries, ReadingStore
 
-__all__ = ["BaseRepository"]
+__all__ = ["BaseRepository", "ReadingSeries", "ReadingStore"]
@@ -0,0 +1,168 @@
+"""
+Reading Block Repository
+
+Reads and writes compressed reading blocks (sensor_reading_blocks).
+
+Each block holds one sensor's readings for one fixed time bucket
+(settings.block_bucket_seconds), encoded with backend/core/block_codec.py.
+Reads decode whole blocks into NumPy arrays and trim them to the
+requested range; writes merge into the bucket's existing block.
+"""
+
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.block_codec import decode_block, encode_block
+from backend.core.config import settings
+from backend.models_db import ReadingBlock, SensorReading
+from backend.repositories.readings import ReadingSeries, merge_series
+
+
+class BlockStore:
+    """
+    Repository for compressed reading blocks.
+
+    Example:
+        store = BlockStore(db)
+        await store.append("pH-01", timestamps, values)
+        series = await store.range("pH-01", start, end)
+    """
+
+    def __init__(self, session: AsyncSession, bucket_seconds: Optional[int] = None):
+        """
+        Initialize store.
+
+        Args:
+            session: Database session
+            bucket_seconds: Block time span (defaults to settings.block_bucket_seconds)
+        """
+        self.session = session
+        self.bucket = np.timedelta64(bucket_seconds or settings.block_bucket_seconds, "s").astype("timedelta64[us]")
+
+    def _bucket_starts(self, timestamps: np.ndarray) -> np.ndarray:
+        origin = np.datetime64(0, "us")
+        return origin + ((timestamps - origin) // self.bucket) * self.bucket
+
+    @staticmethod
+    def _decode(blocks) -> ReadingSeries:
+        decoded = [decode_block(block.payload) for block in blocks]
+        return merge_series(*(ReadingSeries(ts, values) for ts, values in decoded))
+
+    async def range(self, sensor_id: str, start: datetime, end: datetime) -> ReadingSeries:
+        """Readings with start <= timestamp <= end from all overlapping blocks, oldest first."""
+        stmt = (
+            select(ReadingBlock.payload)
+            .where(
+                ReadingBlock.sensor_id == sensor_id,
+                ReadingBlock.bucket_start <= end,
+                ReadingBlock.last_ts >= start,
+            )
+            .order_by(ReadingBlock.bucket_start)
+        )
+        series = self._decode((await self.session.execute(stmt)).all())
+        mask = (series.timestamps >= np.datetime64(start, "us")) & (series.timestamps <= np.datetime64(end, "us"))
+        return ReadingSeries(series.timestamps[mask], series.values[mask])
+
+    async def latest(self, sensor_id: str, limit: int) -> ReadingSeries:
+        """Most recent `limit` block-stored readings, oldest first."""
+        stmt = (
+            select(ReadingBlock.payload, ReadingBlock.count)
+            .where(ReadingBlock.sensor_id == sensor_id)
+            .order_by(ReadingBlock.bucket_start.desc())
+        )
+        # Walk back from the newest block until `limit` readings are covered
+        blocks, total, page = [], 0, 8
+        while total < limit:
+            rows = (await self.session.execute(stmt.offset(len(blocks)).limit(page))).all()
+            blocks.extend(rows)
+            total += sum(row.count for row in rows)
+            if len(rows) < page:
+                break
+        series = self._decode(blocks)
+        return ReadingSeries(series.timestamps[-limit:], series.values[-limit:])
+
+    async def append(self, sensor_id: str, timestamps: np.ndarray, values: np.ndarray) -> int:
+        """
+        Add readings to the sensor's blocks, merging into existing buckets.
+
+        Does not commit. Returns the number of blocks written.
+        """
+        timestamps = np.asarray(timestamps, dtype="datetime64[us]")
+        values = np.asarray(values, dtype=np.float64)
+        if len(timestamps) == 0:
+            return 0
+
+        order = np.argsort(timestamps, kind="stable")
+        timestamps, values = timestamps[order], values[order]
+        buckets = self._bucket_starts(timestamps)
+        starts, split_at = np.unique(buckets, return_index=True)
+
+        written = 0
+        for bucket_start, ts, vals in zip(starts, np.split(timestamps, split_at[1:]), np.split(values, split_at[1:])):
+            bucket_dt = bucket_start.item()
+            existing = await self.session.scalar(
+                select(ReadingBlock).where(
+                    ReadingBlock.sensor_id == sensor_id,
+                    ReadingBlock.bucket_start == bucket_dt,
+                )
+            )
+            if existing is not None:
+                old_ts, old_vals = decode_block(existing.payload)
+                merged = merge_series(ReadingSeries(old_ts, old_vals), ReadingSeries(ts, vals))
+                ts, vals = merged.timestamps, merged.values
+            else:
+                existing = ReadingBlock(sensor_id=sensor_id, bucket_start=bucket_dt)
+                self.session.add(existing)
+
+            existing.first_ts = ts[0].item()
+            existing.last_ts = ts[-1].item()
+            existing.count = len(ts)
+            existing.payload = encode_block(ts, vals)
+            written += 1
+
+        await self.session.flush()
+        return written
+
+    async def convert_rows(self, sensor_id: str, before: datetime) -> int:
+        """
+        Move a sensor's sensor_readings rows older than `before` into blocks.
+
+        Works one bucket at a time and commits after each, so an
+        interrupted conversion can simply be re-run. Returns the number of
+        rows converted.
+        """
+        converted = 0
+        while True:
+            first = await self.session.scalar(
+                select(func.min(SensorReading.timestamp)).where(
+                    SensorReading.sensor_id == sensor_id,
+                    SensorReading.timestamp < before,
+                )
+            )
+            if first is None:
+                return converted
+
+            bucket_start = self._bucket_starts(np.array([first], dtype="datetime64[us]"))[0]
+            bucket_end = min((bucket_start + self.bucket).item(), before)
+            in_bucket = (
+                SensorReading.sensor_id == sensor_id,
+                SensorReading.timestamp >= first,
+                SensorReading.timestamp < bucket_end,
+            )
+
+            rows = (await self.session.execute(
+                select(SensorReading.timestamp, SensorReading.value).where(*in_bucket)
+            )).all()
+            timestamps, values = zip(*rows)
+            await self.append(
+                sensor_id,
+                np.array(timestamps, dtype="datetime64[us]"),
+                np.array(values, dtype=np.float64),
+            )
+            await self.session.execute(delete(SensorReading).where(*in_bucket))
+            await self.session.commit()
+            converted += len(rows)
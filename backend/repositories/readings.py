@@ -0,0 +1,165 @@
+"""
+Reading Repository
+
+Columnar access to sensor readings for the analysis paths.
+
+The statement builders select only (timestamp, value) and filter on
+sensor_id with an optional timestamp range, so they are answered from the
+(sensor_id, timestamp, value) covering index without a sort step.
+ReadingStore runs them through Core (no ORM objects or identity map) and
+returns contiguous NumPy arrays. With settings.block_storage_enabled it
+also merges in readings from the compressed block tier
+(backend/repositories/blocks.py).
+"""
+
+from datetime import datetime
+from typing import List, NamedTuple, Optional
+
+import numpy as np
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.config import settings
+from backend.models_db import SensorReading
+
+
+def latest_readings_stmt(sensor_id: str, limit: int) -> Select:
+    """Most recent `limit` readings of a sensor, newest first."""
+    return (
+        select(SensorReading.timestamp, SensorReading.value)
+        .where(SensorReading.sensor_id == sensor_id)
+        .order_by(SensorReading.timestamp.desc())
+        .limit(limit)
+    )
+
+
+def range_readings_stmt(
+    sensor_id: str,
+    start: datetime,
+    end: datetime,
+    limit: Optional[int] = None,
+) -> Select:
+    """Readings of a sensor with start <= timestamp <= end, oldest first."""
+    stmt = (
+        select(SensorReading.timestamp, SensorReading.value)
+        .where(
+            SensorReading.sensor_id == sensor_id,
+            SensorReading.timestamp >= start,
+            SensorReading.timestamp <= end,
+        )
+        .order_by(SensorReading.timestamp.asc())
+    )
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
+
+
+class ReadingSeries(NamedTuple):
+    """Readings of one sensor in chronological order."""
+    timestamps: np.ndarray  # datetime64[us]
+    values: np.ndarray      # float64
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def isoformat(self) -> List[str]:
+        """Timestamps as ISO-8601 strings (seconds unless sub-second values exist)."""
+        if len(self.timestamps) == 0:
+            return []
+        whole_seconds = (self.timestamps.astype("datetime64[s]") == self.timestamps).all()
+        return np.datetime_as_string(self.timestamps, unit="s" if whole_seconds else "us").tolist()
+
+
+def merge_series(*parts: ReadingSeries) -> ReadingSeries:
+    """Concatenate series and sort by timestamp (stable, so earlier parts win ties)."""
+    parts = [p for p in parts if len(p)]
+    if not parts:
+        return ReadingSeries(np.empty(0, dtype="datetime64[us]"), np.empty(0, dtype=np.float64))
+    if len(parts) == 1:
+        return parts[0]
+    timestamps = np.concatenate([p.timestamps for p in parts])
+    values = np.concatenate([p.values for p in parts])
+    order = np.argsort(timestamps, kind="stable")
+    return ReadingSeries(timestamps[order], values[order])
+
+
+class ReadingStore:
+    """
+    Read-only repository returning sensor readings as NumPy arrays.
+    
+    Example:
+        series = await ReadingStore(db).latest("pH-01", 1000)
+        analyzer.analyze(series.values)
+    """
+    
+    def __init__(self, session: AsyncSession, use_blocks: Optional[bool] = None):
+        """
+        Initialize store.
+        
+        Args:
+            session: Database session
+            use_blocks: Include block storage (defaults to settings.block_storage_enabled)
+        """
+        self.session = session
+        self.blocks = None
+        if settings.block_storage_enabled if use_blocks is None else use_blocks:
+            # Imported here: blocks.py builds on ReadingSeries from this module
+            from backend.repositories.blocks import BlockStore
+            self.blocks = BlockStore(session)
+    
+    async def latest(self, sensor_id: str, limit: int) -> ReadingSeries:
+        """
+        Most recent `limit` readings of a sensor, oldest first.
+        
+        Args:
+            sensor_id: Sensor identifier
+            limit: Maximum number of readings
+            
+        Returns:
+            ReadingSeries in chronological order
+        """
+        result = await self.session.execute(latest_readings_stmt(sensor_id, limit))
+        series = self._to_series(result.all(), reverse=True)
+        if self.blocks is not None:
+            merged = merge_series(await self.blocks.latest(sensor_id, limit), series)
+            series = ReadingSeries(merged.timestamps[-limit:], merged.values[-limit:])
+        return series
+    
+    async def range(
+        self,
+        sensor_id: str,
+        start: datetime,
+        end: datetime,
+        limit: Optional[int] = None,
+    ) -> ReadingSeries:
+        """
+        Readings of a sensor with start <= timestamp <= end, oldest first.
+        
+        Args:
+            sensor_id: Sensor identifier
+            start: Range start (inclusive)
+            end: Range end (inclusive)
+            limit: Maximum number of readings
+            
+        Returns:
+            ReadingSeries in chronological order
+        """
+        result = await self.session.execute(range_readings_stmt(sensor_id, start, end, limit))
+        series = self._to_series(result.all())
+        if self.blocks is not None:
+            series = merge_series(await self.blocks.range(sensor_id, start, end), series)
+            if limit is not None:
+                series = ReadingSeries(series.timestamps[:limit], series.values[:limit])
+        return series
+    
+    @staticmethod
+    def _to_series(rows, reverse: bool = False) -> ReadingSeries:
+        if not rows:
+            return merge_series()
+        if reverse:
+            rows = rows[::-1]
+        timestamps, values = zip(*rows)
+        return ReadingSeries(
+            np.array(timestamps, dtype="datetime64[us]"),
+            np.array(values, dtype=np.float64),
+        )
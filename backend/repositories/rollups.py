@@ -0,0 +1,275 @@
+"""
+Rollup Repository
+
+Multi-resolution rollups of sensor readings (sensor_reading_rollups).
+
+Every tier in settings.rollup_resolutions stores count, sum, sum of
+squares, min and max per bucket, so mean/std/min/max of any bucket (and
+any union of buckets) can be derived without touching raw rows.
+
+- add(): additive upsert of freshly ingested readings
+- rebuild(): recompute a time span from raw readings (replace semantics)
+- series(): read one tier for a date range as NumPy arrays
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.config import settings
+from backend.models_db import ReadingRollup
+from backend.repositories.readings import ReadingStore
+
+
+class RollupSeries(NamedTuple):
+    """One rollup tier over a date range, oldest bucket first."""
+    resolution: int
+    timestamps: np.ndarray  # bucket starts, datetime64[us]
+    count: np.ndarray
+    mean: np.ndarray
+    std: np.ndarray
+    min: np.ndarray
+    max: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+
+def aggregate_readings(
+    sensor_id: str,
+    timestamps: np.ndarray,
+    values: np.ndarray,
+    resolution: int,
+) -> List[Dict]:
+    """
+    Aggregate readings into rollup rows for one resolution (vectorized).
+
+    Args:
+        sensor_id: Sensor identifier
+        timestamps: datetime64 array (any order)
+        values: float array, same length
+        resolution: Bucket width in seconds
+
+    Returns:
+        List of ReadingRollup column dicts, one per non-empty bucket
+    """
+    ts = np.asarray(timestamps, dtype="datetime64[us]").astype(np.int64)
+    vals = np.asarray(values, dtype=np.float64)
+    finite = np.isfinite(vals)
+    ts, vals = ts[finite], vals[finite]
+    if len(ts) == 0:
+        return []
+
+    width = resolution * 1_000_000
+    buckets = ts // width
+    order = np.argsort(buckets, kind="stable")
+    buckets, vals = buckets[order], vals[order]
+    starts, first = np.unique(buckets, return_index=True)
+
+    counts = np.diff(np.append(first, len(vals)))
+    sums = np.add.reduceat(vals, first)
+    sums_sq = np.add.reduceat(vals * vals, first)
+    mins = np.minimum.reduceat(vals, first)
+    maxs = np.maximum.reduceat(vals, first)
+    bucket_starts = (starts * width).astype("datetime64[us]").tolist()
+
+    return [
+        {
+            "sensor_id": sensor_id,
+            "resolution": resolution,
+            "bucket_start": bucket_starts[i],
+            "value_count": int(counts[i]),
+            "value_sum": float(sums[i]),
+            "value_sum_sq": float(sums_sq[i]),
+            "value_min": float(mins[i]),
+            "value_max": float(maxs[i]),
+        }
+        for i in range(len(starts))
+    ]
+
+
+def resolution_for_span(start: datetime, end: datetime, max_points: int) -> Optional[int]:
+    """
+    Finest configured tier that keeps [start, end] within `max_points` buckets.
+
+    Falls back to the coarsest tier when even that exceeds `max_points`.
+    """
+    tiers = settings.rollup_resolutions_list
+    if not tiers:
+        return None
+    span = max((end - start).total_seconds(), 0.0)
+    for tier in tiers:
+        if span / tier <= max_points:
+            return tier
+    return tiers[-1]
+
+
+def select_resolution(resolution: float) -> Optional[int]:
+    """Coarsest configured tier not coarser than `resolution` seconds (None: use raw)."""
+    eligible = [tier for tier in settings.rollup_resolutions_list if tier <= resolution]
+    return eligible[-1] if eligible else None
+
+
+class RollupStore:
+    """
+    Repository for rollup tiers.
+
+    Example:
+        rollups = RollupStore(db)
+        await rollups.add("pH-01", timestamps, values)
+        series = await rollups.series("pH-01", start, end, resolution=900)
+    """
+
+    # Rows per multi-VALUES statement (8 bind parameters each)
+    _CHUNK = 1000
+
+    def __init__(self, session: AsyncSession):
+        """
+        Initialize store.
+
+        Args:
+            session: Database session
+        """
+        self.session = session
+
+    def _insert(self):
+        """Dialect-specific INSERT supporting ON CONFLICT."""
+        if self.session.bind.dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+            return dialect_insert(ReadingRollup), func.least, func.greatest
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        # SQLite's multi-argument min()/max() are scalar functions
+        return dialect_insert(ReadingRollup), func.min, func.max
+
+    async def add(self, sensor_id: str, timestamps: np.ndarray, values: np.ndarray) -> None:
+        """Fold new readings into every tier (additive upsert). Does not commit."""
+        for resolution in settings.rollup_resolutions_list:
+            rows = aggregate_readings(sensor_id, timestamps, values, resolution)
+            for i in range(0, len(rows), self._CHUNK):
+                stmt, least, greatest = self._insert()
+                stmt = stmt.values(rows[i:i + self._CHUNK])
+                excluded = stmt.excluded
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=["sensor_id", "resolution", "bucket_start"],
+                    set_={
+                        "value_count": ReadingRollup.value_count + excluded.value_count,
+                        "value_sum": ReadingRollup.value_sum + excluded.value_sum,
+                        "value_sum_sq": ReadingRollup.value_sum_sq + excluded.value_sum_sq,
+                        "value_min": least(ReadingRollup.value_min, excluded.value_min),
+                        "value_max": greatest(ReadingRollup.value_max, excluded.value_max),
+                    },
+                )
+                await self.session.execute(stmt)
+
+    async def rebuild(
+        self,
+        sensor_id: str,
+        start: datetime,
+        end: datetime,
+        use_blocks: Optional[bool] = None,
+    ) -> int:
+        """
+        Recompute every tier for the buckets overlapping [start, end) from raw readings.
+
+        Replaces whatever the tiers held for those buckets, which repairs
+        drift from late or deleted readings. Does not commit. Returns the
+        number of rollup rows written.
+
+        Args:
+            use_blocks: Include compressed blocks (defaults to settings.block_storage_enabled)
+        """
+        written = 0
+        store = ReadingStore(self.session, use_blocks=use_blocks)
+        for resolution in settings.rollup_resolutions_list:
+            width = timedelta(seconds=resolution)
+            epoch = datetime(1970, 1, 1)
+            lo = epoch + ((start - epoch) // width) * width
+            hi = epoch + -((epoch - end) // width) * width
+
+            series = await store.range(sensor_id, lo, hi)
+            keep = series.timestamps < np.datetime64(hi, "us")
+            rows = aggregate_readings(sensor_id, series.timestamps[keep], series.values[keep], resolution)
+
+            await self.session.execute(
+                delete(ReadingRollup).where(
+                    ReadingRollup.sensor_id == sensor_id,
+                    ReadingRollup.resolution == resolution,
+                    ReadingRollup.bucket_start >= lo,
+                    ReadingRollup.bucket_start < hi,
+                )
+            )
+            # Upsert (replacing) so a concurrent add() of the same bucket cannot collide
+            for i in range(0, len(rows), self._CHUNK):
+                stmt, _, _ = self._insert()
+                stmt = stmt.values(rows[i:i + self._CHUNK])
+                excluded = stmt.excluded
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=["sensor_id", "resolution", "bucket_start"],
+                    set_={
+                        "value_count": excluded.value_count,
+                        "value_sum": excluded.value_sum,
+                        "value_sum_sq": excluded.value_sum_sq,
+                        "value_min": excluded.value_min,
+                        "value_max": excluded.value_max,
+                    },
+                )
+                await self.session.execute(stmt)
+            written += len(rows)
+        return written
+
+    async def count(self, sensor_id: str, start: datetime, end: datetime) -> int:
+        """Approximate raw reading count in [start, end] from the coarsest tier."""
+        tiers = settings.rollup_resolutions_list
+        if not tiers:
+            return 0
+        resolution = tiers[-1]
+        total = await self.session.scalar(
+            select(func.sum(ReadingRollup.value_count)).where(
+                ReadingRollup.sensor_id == sensor_id,
+                ReadingRollup.resolution == resolution,
+                ReadingRollup.bucket_start > start - timedelta(seconds=resolution),
+                ReadingRollup.bucket_start <= end,
+            )
+        )
+        return int(total or 0)
+
+    async def series(self, sensor_id: str, start: datetime, end: datetime, resolution: int) -> RollupSeries:
+        """Buckets of one tier whose start lies in [start, end], oldest first."""
+        stmt = (
+            select(
+                ReadingRollup.bucket_start,
+                ReadingRollup.value_count,
+                ReadingRollup.value_sum,
+                ReadingRollup.value_sum_sq,
+                ReadingRollup.value_min,
+                ReadingRollup.value_max,
+            )
+            .where(
+                ReadingRollup.sensor_id == sensor_id,
+                ReadingRollup.resolution == resolution,
+                ReadingRollup.bucket_start >= start,
+                ReadingRollup.bucket_start <= end,
+            )
+            .order_by(ReadingRollup.bucket_start)
+        )
+        rows = (await self.session.execute(stmt)).all()
+        if not rows:
+            empty = np.empty(0, dtype=np.float64)
+            return RollupSeries(resolution, np.empty(0, dtype="datetime64[us]"), empty, empty, empty, empty, empty)
+
+        bucket_start, count, total, total_sq, mins, maxs = zip(*rows)
+        count = np.array(count, dtype=np.float64)
+        mean = np.array(total, dtype=np.float64) / count
+        variance = np.maximum(np.array(total_sq, dtype=np.float64) / count - mean * mean, 0.0)
+        return RollupSeries(
+            resolution,
+            np.array(bucket_start, dtype="datetime64[us]"),
+            count,
+            mean,
+            np.sqrt(variance),
+            np.array(mins, dtype=np.float64),
+            np.array(maxs, dtype=np.float64),
+        )
@@ -0,0 +1,63 @@
+"""
+Sensor Repository
+
+Statement builders for sensor listings.
+
+with_latest_analysis() attaches each sensor's most recent analysis result
+(health score, status, timestamp) in the same statement via a
+ROW_NUMBER() window over analysis_results, restricted to the sensors of
+the page. A page of sensors is therefore one query, whatever its size.
+"""
+
+from sqlalchemy import Select, and_, func, select
+from sqlalchemy.orm import aliased
+
+from backend.models_db import AnalysisResultDB, Sensor
+
+# Listing order, also the keyset of cursor pagination
+SENSOR_ORDER = (Sensor.created_at, Sensor.id)
+
+
+def with_latest_analysis(sensor_stmt: Select) -> Select:
+    """
+    Wrap a Sensor query so each row also carries its latest analysis.
+
+    Args:
+        sensor_stmt: select(Sensor) with any filters, offset and limit
+            (order it by SENSOR_ORDER so pages are stable)
+
+    Returns:
+        Statement yielding (Sensor, health_score, status, analysis_timestamp)
+        in SENSOR_ORDER; the last three are None for sensors without
+        analyses.
+    """
+    page = sensor_stmt.subquery("page")
+    sensor = aliased(Sensor, page)
+
+    ranked = (
+        select(
+            AnalysisResultDB.sensor_id,
+            AnalysisResultDB.health_score,
+            AnalysisResultDB.status,
+            AnalysisResultDB.timestamp,
+            func.row_number()
+            .over(
+                partition_by=AnalysisResultDB.sensor_id,
+                order_by=AnalysisResultDB.timestamp.desc(),
+            )
+            .label("rank"),
+        )
+        .where(AnalysisResultDB.sensor_id.in_(select(page.c.id)))
+        .subquery("ranked")
+    )
+
+    return (
+        select(
+            sensor,
+            ranked.c.health_score,
+            ranked.c.status,
+            ranked.c.timestamp.label("analysis_timestamp"),
+        )
+        .outerjoin(ranked, and_(ranked.c.sensor_id == sensor.id, ranked.c.rank == 1))
+        .order_by(sensor.created_at, sensor.id)
+    )
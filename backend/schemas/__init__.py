@@ -18,12 +18,16 @@ from backend.schemas.sensor import (
     SensorReadingBase,
     SensorReadingCreate,
     SensorReadingBulk,
+    StreamPoint,
+    StreamBatch,
     # Sensor management
     SensorCreate,
     SensorResponse,
     # CSV Import
     CSVImportConfig,
     CSVImportResult,
+    CSVSensorImportStats,
+    CSVWideImportResult,
     CSVValidationError,
 )
 from backend.schemas.auth import (
@@ -56,12 +60,16 @@ __all__ = [
     "SensorReadingBase",
     "SensorReadingCreate",
     "SensorReadingBulk",
+    "StreamPoint",
+    "StreamBatch",
     # Sensors
     "SensorCreate",
     "SensorResponse",
     # CSV Import
     "CSVImportConfig",
     "CSVImportResult",
+    "CSVSensorImportStats",
+    "CSVWideImportResult",
     "CSVValidationError",
     # Auth - Tokens
     "Token",
@@ -1,15 +1,27 @@
-from typing import Generic, TypeVar, List, Optional
+from typing import Generic, TypeVar, List, Literal, Optional
 from pydantic import BaseModel, Field
 
 T = TypeVar("T")
 
 class PaginationParams(BaseModel):
-    page: int = Field(1, ge=1, description="Page number")
+    page: int = Field(1, ge=1, description="Page number (ignored when a cursor is given)")
     size: int = Field(20, ge=1, le=100, description="Items per page")
+    cursor: Optional[str] = Field(None, description="Opaque next_cursor of the previous page (keyset mode)")
+    total: Optional[Literal["exact", "estimate", "none"]] = Field(
+        None,
+        description="How to count total items (default: exact in page mode, none in cursor mode)"
+    )
+
+    @property
+    def total_mode(self) -> str:
+        """Effective total mode for this request."""
+        return self.total or ("none" if self.cursor else "exact")
 
 class PaginatedResponse(BaseModel, Generic[T]):
     items: List[T]
-    total: int
-    page: int
+    total: Optional[int] = None
+    page: Optional[int] = None
     size: int
-    pages: int
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None
+    total_is_estimate: bool = False
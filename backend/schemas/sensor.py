@@ -171,6 +171,34 @@ class SensorReadingCreate(SensorReadingBase):
     pass
 
 
+class StreamPoint(SensorReadingBase):
+    """
+    Single point of a /sensors/stream-batch request.
+    
+    Same rules as SensorReadingBase; the timestamp defaults to the time
+    the batch is received.
+    """
+    timestamp: Optional[datetime] = Field(
+        default=None,
+        description="Reading timestamp (optional, defaults to now)"
+    )
+
+
+class StreamBatch(BaseModel):
+    """
+    Batch of streamed points, possibly for many sensors.
+    
+    Used by edge gateways to ship many readings in one request.
+    """
+    points: List[StreamPoint] = Field(
+        ...,
+        min_length=1,
+        description="Readings to ingest"
+    )
+    
+    model_config = ConfigDict(extra="forbid")
+
+
 class SensorReadingBulk(BaseModel):
     """
     Schema for validating a single row during bulk CSV import.
@@ -404,6 +432,12 @@ class CSVImportResult(BaseModel):
         error_samples: Sample of error messages (max 10)
         import_duration_ms: Import processing time
         chunks_processed: Number of chunks processed
+        rows_per_second: Imported rows per second of import time
+        insert_mode: Bulk insert method ("copy" or "executemany")
+        parse_duration_ms: Parser thread time reading and parsing
+        insert_duration_ms: Writer time spent in database inserts
+        parser_blocked_ms: Parser time blocked on a full queue (backpressure)
+        writer_idle_ms: Writer time waiting for parsed chunks
     """
     success: bool = Field(..., description="Import completed successfully")
     sensor_id: str = Field(..., description="Target sensor ID")
@@ -418,6 +452,12 @@ class CSVImportResult(BaseModel):
     )
     import_duration_ms: int = Field(..., ge=0, description="Processing time in ms")
     chunks_processed: int = Field(1, ge=1, description="Number of chunks")
+    rows_per_second: float = Field(0.0, ge=0, description="Import throughput (rows/s)")
+    insert_mode: str = Field("executemany", description="Bulk insert method: copy or executemany")
+    parse_duration_ms: int = Field(0, ge=0, description="Parser thread time (read + parse) in ms")
+    insert_duration_ms: int = Field(0, ge=0, description="Database insert time in ms")
+    parser_blocked_ms: int = Field(0, ge=0, description="Parser time blocked by backpressure in ms")
+    writer_idle_ms: int = Field(0, ge=0, description="Writer time waiting for parsed chunks in ms")
     
     @property
     def success_rate(self) -> float:
@@ -429,6 +469,72 @@ class CSVImportResult(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class CSVSensorImportStats(BaseModel):
+    """
+    Per-sensor statistics of a wide-format (multi-sensor) CSV import.
+    
+    Attributes:
+        sensor_id: Target sensor identifier
+        column: CSV column index the sensor was read from
+        imported_rows: Readings imported for this sensor
+        failed_rows: Cells that failed validation
+        skipped_rows: Empty cells (sensor not sampled in that row)
+    """
+    sensor_id: str = Field(..., description="Target sensor ID")
+    column: int = Field(..., ge=0, description="Source column index")
+    imported_rows: int = Field(0, ge=0, description="Successfully imported")
+    failed_rows: int = Field(0, ge=0, description="Failed validation")
+    skipped_rows: int = Field(0, ge=0, description="Skipped cells (empty)")
+
+
+class CSVWideImportResult(BaseModel):
+    """
+    Result summary for wide-format CSV imports (one timestamp column,
+    one column per sensor).
+    
+    Row counters other than total_rows/skipped_rows count readings
+    (cells), summed over all sensors.
+    
+    Attributes:
+        success: Whether import completed (may have partial errors)
+        total_rows: Total rows in the CSV file
+        skipped_rows: Rows skipped (empty lines)
+        imported_rows: Readings imported across all sensors
+        failed_rows: Readings that failed validation
+        sensors: Per-sensor statistics
+        error_samples: Sample of error messages (max 10)
+        import_duration_ms: Import processing time
+        chunks_processed: Number of chunks processed
+        rows_per_second: Imported readings per second of import time
+        insert_mode: Bulk insert method ("copy" or "executemany")
+        parse_duration_ms: Parser thread time reading and parsing
+        insert_duration_ms: Writer time spent in database inserts
+        parser_blocked_ms: Parser time blocked on a full queue (backpressure)
+        writer_idle_ms: Writer time waiting for parsed chunks
+    """
+    success: bool = Field(..., description="Import completed successfully")
+    total_rows: int = Field(..., ge=0, description="Total rows in CSV")
+    skipped_rows: int = Field(0, ge=0, description="Skipped rows (empty)")
+    imported_rows: int = Field(..., ge=0, description="Readings imported (all sensors)")
+    failed_rows: int = Field(..., ge=0, description="Readings failed validation (all sensors)")
+    sensors: List[CSVSensorImportStats] = Field(default_factory=list, description="Per-sensor statistics")
+    error_samples: List[str] = Field(
+        default_factory=list,
+        max_length=10,
+        description="Sample error messages (max 10)"
+    )
+    import_duration_ms: int = Field(..., ge=0, description="Processing time in ms")
+    chunks_processed: int = Field(0, ge=0, description="Number of chunks")
+    rows_per_second: float = Field(0.0, ge=0, description="Import throughput (readings/s)")
+    insert_mode: str = Field("executemany", description="Bulk insert method: copy or executemany")
+    parse_duration_ms: int = Field(0, ge=0, description="Parser thread time (read + parse) in ms")
+    insert_duration_ms: int = Field(0, ge=0, description="Database insert time in ms")
+    parser_blocked_ms: int = Field(0, ge=0, description="Parser time blocked by backpressure in ms")
+    writer_idle_ms: int = Field(0, ge=0, description="Writer time waiting for parsed chunks in ms")
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
 class CSVValidationError(BaseModel):
     """
     Detailed validation error for a CSV row.
@@ -10,10 +10,13 @@ from backend.tasks.analysis_tasks import (
     calculate_statistics,
     batch_analyze,
 )
+from backend.tasks.maintenance_tasks import enforce_retention, refresh_rollups
 
 __all__ = [
     "analyze_sensor_data",
     "calculate_dfa",
     "calculate_statistics",
     "batch_analyze",
+    "refresh_rollups",
+    "enforce_retention",
 ]
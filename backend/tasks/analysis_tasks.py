@@ -256,16 +256,20 @@ def batch_analyze(
     self,
     sensor_ids: List[str],
     config: Optional[Dict[str, Any]] = None,
+    values: Optional[List[List[float]]] = None,
 ) -> Dict[str, Any]:
     """
     Batch analysis for multiple sensors.
     
-    Long-running task with extended timeouts.
+    Long-running task with extended timeouts. When `values` holds one
+    equal-length window per sensor, the whole fleet is scored in a single
+    vectorized SensorAnalyzer.analyze_batch pass.
     
     Args:
         self: Celery task instance
         sensor_ids: List of sensor IDs to analyze
         config: Optional shared configuration
+        values: Optional windows, one per sensor_id (same length)
         
     Returns:
         Dictionary with results for each sensor.
@@ -276,29 +280,43 @@ def batch_analyze(
     results = {}
     total = len(sensor_ids)
     
-    for i, sensor_id in enumerate(sensor_ids):
-        self.update_state(
-            state="PROGRESS",
-            meta={
-                "current": i + 1,
-                "total": total,
-                "sensor_id": sensor_id,
-                "progress": int((i / total) * 100)
-            }
-        )
+    if values is not None:
+        from backend.analysis import SensorAnalyzer
+        from backend.models import SensorConfig
+        
+        if len(values) != total:
+            raise ValueError(f"Got {len(values)} windows for {total} sensors")
         
-        try:
-            # Note: In production, fetch actual data from database
-            # This is a placeholder for batch processing structure
+        analyzer = SensorAnalyzer(config=SensorConfig(**config)) if config else SensorAnalyzer()
+        for sensor_id, result in zip(sensor_ids, analyzer.analyze_batch(values)):
             results[sensor_id] = {
                 "status": "processed",
-                "message": f"Sensor {sensor_id} analyzed"
-            }
-        except Exception as e:
-            results[sensor_id] = {
-                "status": "error",
-                "error": str(e)
+                "result": result
             }
+    else:
+        for i, sensor_id in enumerate(sensor_ids):
+            self.update_state(
+                state="PROGRESS",
+                meta={
+                    "current": i + 1,
+                    "total": total,
+                    "sensor_id": sensor_id,
+                    "progress": int((i / total) * 100)
+                }
+            )
+        
+            try:
+                # Note: In production, fetch actual data from database
+                # This is a placeholder for batch processing structure
+                results[sensor_id] = {
+                    "status": "processed",
+                    "message": f"Sensor {sensor_id} analyzed"
+                }
+            except Exception as e:
+                results[sensor_id] = {
+                    "status": "error",
+                    "error": str(e)
+                }
     
     logger.info(f"[Task {task_id}] Batch analysis completed")
     
@@ -0,0 +1,375 @@
+"""
+Maintenance Tasks Module.
+
+Contains periodic Celery tasks that keep derived reading tables in sync
+and enforce raw reading retention. Scheduled by Celery beat (see backend/core/celery_app.py).
+"""
+
+from celery import shared_task
+from typing import Dict, Any, Optional
+import asyncio
+import logging
+import math
+import time
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+
+async def _refresh_rollups(since: datetime, until: datetime) -> Dict[str, int]:
+    """Rebuild the rollup tiers of every sensor with readings in [since, until]."""
+    from sqlalchemy import select
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+    from sqlalchemy.pool import NullPool
+
+    from backend.core.config import settings
+    from backend.models_db import SensorReading
+    from backend.repositories.rollups import RollupStore
+
+    # Each task run owns its event loop, so no pooled connections across runs
+    engine = create_async_engine(settings.database_url, poolclass=NullPool)
+    try:
+        async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+            sensor_ids = (await session.scalars(
+                select(SensorReading.sensor_id)
+                .where(SensorReading.timestamp >= since, SensorReading.timestamp <= until)
+                .distinct()
+            )).all()
+
+            rows = 0
+            store = RollupStore(session)
+            for sensor_id in sensor_ids:
+                rows += await store.rebuild(sensor_id, since, until)
+                await session.commit()
+            return {"sensors": len(sensor_ids), "rollup_rows": rows}
+    finally:
+        await engine.dispose()
+
+
+def _aligned_span(tiers) -> tuple:
+    """
+    Boundary shared by all rollup tiers and a span of about a day aligned to it.
+
+    Spans on these boundaries never split a bucket of any tier, so each
+    span can be rebuilt (and committed) on its own.
+    """
+    align = timedelta(seconds=math.lcm(*tiers)) if tiers else timedelta(seconds=1)
+    return align, align * max(1, math.ceil(86400 / align.total_seconds()))
+
+
+async def _backfill_rollups(session, until: datetime) -> Dict[str, int]:
+    """
+    Build the rollup tiers of every sensor from its oldest raw reading up to `until`.
+
+    Walks each sensor in aligned spans of about a day, one transaction per
+    span, skipping over gaps without readings. Safe to re-run: rebuild()
+    replaces the buckets it covers.
+    """
+    from sqlalchemy import func, select
+
+    from backend.core.config import settings
+    from backend.models_db import SensorReading
+    from backend.repositories.rollups import RollupStore
+
+    align, span = _aligned_span(settings.rollup_resolutions_list)
+    epoch = datetime(1970, 1, 1)
+
+    sensor_ids = (await session.scalars(select(SensorReading.sensor_id).distinct())).all()
+    stats = {"sensors": len(sensor_ids), "spans": 0, "rollup_rows": 0}
+    rollups = RollupStore(session)
+    for sensor_id in sensor_ids:
+        next_reading = select(func.min(SensorReading.timestamp)).where(SensorReading.sensor_id == sensor_id)
+        oldest = await session.scalar(next_reading)
+        while oldest is not None and oldest < until:
+            span_start = epoch + ((oldest - epoch) // align) * align
+            span_end = span_start + span
+            stats["rollup_rows"] += await rollups.rebuild(sensor_id, span_start, span_end)
+            await session.commit()
+            stats["spans"] += 1
+            oldest = await session.scalar(next_reading.where(SensorReading.timestamp >= span_end))
+    return stats
+
+
+async def _enforce_retention(session, now: datetime, batch_size: int) -> Dict[str, int]:
+    """
+    Roll up and delete raw readings older than each sensor's retention.
+
+    Retention is the sensor's raw_retention_days, else its organization's,
+    else settings.raw_retention_days; 0 keeps raw readings forever. The
+    cutoff is aligned to a boundary shared by all rollup tiers, so every
+    rebuilt bucket still has all of its raw readings. Compressed blocks
+    (rows packed by BlockStore.convert_rows) are rolled up together with
+    the raw rows and deleted once they end before the cutoff, even when
+    no raw rows have expired.
+    """
+    from sqlalchemy import delete, func, select
+
+    from backend.core.config import settings
+    from backend.core.metrics import RETENTION_ROWS_DELETED
+    from backend.models_db import Organization, ReadingBlock, Sensor, SensorReading
+    from backend.repositories.rollups import RollupStore
+
+    tiers = settings.rollup_resolutions_list if settings.rollup_enabled else []
+    # Rebuild/delete one aligned span (about a day) per transaction
+    align, span = _aligned_span(tiers)
+    epoch = datetime(1970, 1, 1)
+
+    policies = (await session.execute(
+        select(Sensor.id, Sensor.raw_retention_days, Organization.raw_retention_days)
+        .outerjoin(Organization, Sensor.organization_id == Organization.id)
+    )).all()
+
+    stats = {"sensors": 0, "rows_deleted": 0, "blocks_deleted": 0}
+    rollups = RollupStore(session)
+    for sensor_id, sensor_days, org_days in policies:
+        days = next((d for d in (sensor_days, org_days) if d is not None), settings.raw_retention_days)
+        if days <= 0:
+            continue
+        cutoff = now - timedelta(days=days)
+        cutoff = epoch + ((cutoff - epoch) // align) * align
+
+        oldest_row = await session.scalar(
+            select(func.min(SensorReading.timestamp)).where(
+                SensorReading.sensor_id == sensor_id,
+                SensorReading.timestamp < cutoff,
+            )
+        )
+        oldest_block = await session.scalar(
+            select(func.min(ReadingBlock.first_ts)).where(
+                ReadingBlock.sensor_id == sensor_id,
+                ReadingBlock.last_ts < cutoff,
+            )
+        )
+        starts = [ts for ts in (oldest_row, oldest_block) if ts is not None]
+        if not starts:
+            continue
+        oldest = min(starts)
+        stats["sensors"] += 1
+
+        span_start = epoch + ((oldest - epoch) // align) * align
+        while span_start < cutoff:
+            span_end = min(span_start + span, cutoff)
+            if tiers:
+                await rollups.rebuild(sensor_id, span_start, span_end, use_blocks=True)
+                await session.commit()
+
+            # Bounded batches keep each delete transaction (and its locks) short
+            while True:
+                batch = (
+                    select(SensorReading.id)
+                    .where(SensorReading.sensor_id == sensor_id, SensorReading.timestamp < span_end)
+                    .limit(batch_size)
+                )
+                result = await session.execute(delete(SensorReading).where(SensorReading.id.in_(batch)))
+                await session.commit()
+                stats["rows_deleted"] += result.rowcount
+                RETENTION_ROWS_DELETED.labels(table="sensor_readings").inc(result.rowcount)
+                if result.rowcount < batch_size:
+                    break
+            span_start = span_end
+
+        result = await session.execute(
+            delete(ReadingBlock).where(ReadingBlock.sensor_id == sensor_id, ReadingBlock.last_ts < cutoff)
+        )
+        await session.commit()
+        stats["blocks_deleted"] += result.rowcount
+        RETENTION_ROWS_DELETED.labels(table="sensor_reading_blocks").inc(result.rowcount)
+
+    return stats
+
+
+async def _compact_tables(engine) -> None:
+    """Refresh planner statistics (and reclaim space on PostgreSQL) after large deletes."""
+    from sqlalchemy import text
+
+    async with engine.connect() as conn:
+        if engine.dialect.name == "postgresql":
+            # VACUUM cannot run inside a transaction block
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.execute(text("VACUUM (ANALYZE) sensor_readings"))
+            await conn.execute(text("VACUUM (ANALYZE) sensor_reading_blocks"))
+        else:
+            # A full SQLite VACUUM rewrites the whole file; freed pages are reused by new inserts
+            await conn.execute(text("ANALYZE sensor_readings"))
+            await conn.commit()
+
+
+async def _run_retention(now: datetime) -> Dict[str, int]:
+    """Run the retention pass on a dedicated engine."""
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+    from sqlalchemy.pool import NullPool
+
+    from backend.core.config import settings
+
+    engine = create_async_engine(settings.database_url, poolclass=NullPool)
+    try:
+        async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+            stats = await _enforce_retention(session, now, settings.retention_batch_size)
+        if stats["rows_deleted"] or stats["blocks_deleted"]:
+            await _compact_tables(engine)
+        return stats
+    finally:
+        await engine.dispose()
+
+
+@shared_task(
+    bind=True,
+    name="backend.tasks.maintenance_tasks.refresh_rollups",
+    max_retries=2,
+    default_retry_delay=30,
+    track_started=True,
+)
+def refresh_rollups(
+    self,
+    lookback_minutes: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Rebuild rollup tiers from raw readings for the recent past.
+
+    Ingest updates the tiers additively; this pass recomputes the buckets
+    touched in the lookback window so late, edited or deleted readings
+    are reflected. Existing history is built by backfill_rollups.
+
+    Args:
+        self: Celery task instance
+        lookback_minutes: Window to rebuild (default: twice settings.rollup_refresh_minutes)
+
+    Returns:
+        Dictionary with the number of sensors and rollup rows rebuilt.
+    """
+    from backend.core.config import settings
+
+    task_id = self.request.id
+    if not settings.rollup_enabled:
+        return {"success": True, "task_id": task_id, "skipped": "rollups disabled"}
+
+    # Overlap consecutive runs so no bucket falls between two of them
+    lookback = lookback_minutes or 2 * settings.rollup_refresh_minutes
+    until = datetime.now()
+    since = until - timedelta(minutes=lookback)
+    logger.info(f"[Task {task_id}] Refreshing rollups since {since.isoformat()}")
+
+    try:
+        stats = asyncio.run(_refresh_rollups(since, until))
+        logger.info(f"[Task {task_id}] Rollups refreshed: {stats}")
+        return {
+            "success": True,
+            "task_id": task_id,
+            **stats,
+            "completed_at": datetime.utcnow().isoformat()
+        }
+    except Exception as e:
+        logger.error(f"[Task {task_id}] Rollup refresh failed: {e}", exc_info=True)
+        return {
+            "success": False,
+            "task_id": task_id,
+            "error": str(e)
+        }
+
+
+async def _run_backfill(until: datetime) -> Dict[str, int]:
+    """Run the rollup backfill on a dedicated engine."""
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+    from sqlalchemy.pool import NullPool
+
+    from backend.core.config import settings
+
+    engine = create_async_engine(settings.database_url, poolclass=NullPool)
+    try:
+        async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+            return await _backfill_rollups(session, until)
+    finally:
+        await engine.dispose()
+
+
+@shared_task(
+    bind=True,
+    name="backend.tasks.maintenance_tasks.backfill_rollups",
+    max_retries=0,
+    track_started=True,
+)
+def backfill_rollups(self) -> Dict[str, Any]:
+    """
+    Build rollup tiers for all existing raw readings (one-off).
+
+    Run once after the sensor_reading_rollups migration, or after changing
+    settings.rollup_resolutions; ingest and refresh_rollups only cover new
+    readings. Not scheduled.
+
+    Args:
+        self: Celery task instance
+
+    Returns:
+        Dictionary with sensors, spans and rollup rows rebuilt.
+    """
+    from backend.core.config import settings
+
+    task_id = self.request.id
+    if not settings.rollup_enabled:
+        return {"success": True, "task_id": task_id, "skipped": "rollups disabled"}
+
+    logger.info(f"[Task {task_id}] Backfilling rollups")
+    try:
+        stats = asyncio.run(_run_backfill(datetime.now()))
+        logger.info(f"[Task {task_id}] Rollups backfilled: {stats}")
+        return {
+            "success": True,
+            "task_id": task_id,
+            **stats,
+            "completed_at": datetime.utcnow().isoformat()
+        }
+    except Exception as e:
+        logger.error(f"[Task {task_id}] Rollup backfill failed: {e}", exc_info=True)
+        return {
+            "success": False,
+            "task_id": task_id,
+            "error": str(e)
+        }
+
+
+@shared_task(
+    bind=True,
+    name="backend.tasks.maintenance_tasks.enforce_retention",
+    max_retries=1,
+    track_started=True,
+    soft_time_limit=3600,
+    time_limit=3660,
+)
+def enforce_retention(self) -> Dict[str, Any]:
+    """
+    Apply raw reading retention policies.
+
+    Raw readings past their sensor's retention are folded into the rollup
+    tiers and deleted in batches of settings.retention_batch_size, then
+    table statistics are refreshed.
+
+    Args:
+        self: Celery task instance
+
+    Returns:
+        Dictionary with sensors processed and rows reclaimed.
+    """
+    from backend.core.metrics import RETENTION_RUN_DURATION
+
+    task_id = self.request.id
+    logger.info(f"[Task {task_id}] Enforcing raw reading retention")
+    started = time.time()
+
+    try:
+        stats = asyncio.run(_run_retention(datetime.now()))
+        logger.info(f"[Task {task_id}] Retention applied: {stats}")
+        return {
+            "success": True,
+            "task_id": task_id,
+            **stats,
+            "completed_at": datetime.utcnow().isoformat()
+        }
+    except Exception as e:
+        logger.error(f"[Task {task_id}] Retention failed: {e}", exc_info=True)
+        return {
+            "success": False,
+            "task_id": task_id,
+            "error": str(e)
+        }
+    finally:
+        RETENTION_RUN_DURATION.observe(time.time() - started)
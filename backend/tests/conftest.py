@@ -8,7 +8,7 @@ import pytest
 import asyncio
 from typing import AsyncGenerator
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import StaticPool
 from httpx import AsyncClient, ASGITransport
 
 from backend.main import app
@@ -34,11 +34,14 @@ def event_loop():
 async def test_db_engine():
     """
     Create a test database engine for each test function.
+    
+    All sessions share one in-memory connection (StaticPool), so tables
+    and committed rows are visible across sessions and queries.
     """
     engine = create_async_engine(
         TEST_DATABASE_URL,
         echo=False,
-        poolclass=NullPool,
+        poolclass=StaticPool,
     )
     
     async with engine.begin() as conn:
@@ -53,17 +56,26 @@ async def test_db_engine():
 
 
 @pytest.fixture(scope="function")
-async def db_session(test_db_engine) -> AsyncGenerator[AsyncSession, None]:
+def session_factory(test_db_engine) -> async_sessionmaker:
     """
-    Create a database session for each test.
+    Session factory on the test database engine.
+    
+    For code under test that opens its own sessions (ingest buffer, routes
+    using AsyncSessionLocal).
     """
-    async_session = async_sessionmaker(
+    return async_sessionmaker(
         test_db_engine,
         class_=AsyncSession,
         expire_on_commit=False
     )
-    
-    async with async_session() as session:
+
+
+@pytest.fixture(scope="function")
+async def db_session(session_factory) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Create a database session for each test.
+    """
+    async with session_factory() as session:
         yield session
 
 
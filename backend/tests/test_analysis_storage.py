@@ -0,0 +1,104 @@
+"""
+Analysis Storage Tests
+
+Tests for the split storage of analysis results: typed scalar columns on
+analysis_results and chart series in analysis_artifacts.
+"""
+
+import pytest
+import numpy as np
+from datetime import datetime
+from sqlalchemy import event, select
+
+from backend.analysis import SensorAnalyzer
+from backend.api.routes.analytics import save_analysis_result
+from backend.api.routes.sensors import get_sensor_history
+from backend.models import AnalysisMetrics, AnalysisResult
+from backend.models_db import AnalysisArtifact, AnalysisResultDB, Role, Sensor, User
+from backend.schemas.common import PaginationParams
+
+
+@pytest.fixture
+def metrics():
+    """Metrics (with numpy series) of a 500-point window."""
+    values = (20 + np.sin(np.linspace(0, 30, 500)) + np.random.default_rng(0).normal(0, 0.1, 500)).tolist()
+    return SensorAnalyzer().analyze(values, return_arrays=True)["metrics"]
+
+
+@pytest.fixture
+async def db_session(session_factory, metrics):
+    """Session with one sensor and one saved analysis."""
+    async with session_factory() as session:
+        session.add(Sensor(id="S1", name="Sensor", location="Lab"))
+        await session.commit()
+
+        result = AnalysisResult(
+            sensor_id="S1",
+            timestamp=datetime(2024, 1, 1).isoformat(),
+            health_score=90.0,
+            status="Normal",
+            diagnosis="Stable",
+            metrics=AnalysisMetrics(**{k: v for k, v in metrics.items() if not isinstance(v, np.ndarray)}),
+            flags=[],
+            recommendation="None",
+        )
+        await save_analysis_result(session, "S1", result, metrics)
+        yield session
+
+
+@pytest.fixture
+def statements(test_db_engine):
+    captured = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        captured.append(statement)
+
+    event.listen(test_db_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    yield captured
+    event.remove(test_db_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def admin():
+    return User(email="admin@example.com", role=Role.SUPER_ADMIN)
+
+
+async def _history(db_session, admin, include_series, max_points=None):
+    return await get_sensor_history(
+        "S1", pagination=PaginationParams(), max_points=max_points,
+        include_series=include_series, db=db_session, current_user=admin,
+    )
+
+
+async def test_scalars_in_columns_series_in_artifact(db_session, metrics):
+    """Scalar metrics land in typed columns; series (JSON lists by default) in the artifact."""
+    row = await db_session.scalar(select(AnalysisResultDB))
+    assert row.bias == pytest.approx(metrics["bias"])
+    assert row.snr_db == pytest.approx(metrics["snr_db"])
+    assert set(row.scalar_metrics) <= set(AnalysisResultDB.SCALAR_METRICS)
+
+    artifact = await db_session.scalar(select(AnalysisArtifact))
+    assert artifact.analysis_id == row.id
+    assert "trend" in artifact.series and "bias" not in artifact.series
+    assert isinstance(artifact.series["trend"], list) and "encoding" not in artifact.series
+
+
+async def test_history_skips_artifacts_by_default(db_session, metrics, admin, statements):
+    """Scalar-only history never touches analysis_artifacts."""
+    page = await _history(db_session, admin, include_series=False)
+
+    item = page.items[0]
+    assert item.metrics.bias == pytest.approx(metrics["bias"])
+    assert item.metrics.trend is None
+    assert not any("analysis_artifacts" in sql for sql in statements)
+
+
+async def test_history_with_series(db_session, metrics, admin, statements):
+    """include_series loads artifacts in one extra query and honours max_points."""
+    page = await _history(db_session, admin, include_series=True, max_points=100)
+
+    item = page.items[0]
+    assert len(item.metrics.trend) == 100
+    assert len(item.metrics.residuals) == 100
+    np.testing.assert_allclose(item.metrics.trend[0], metrics["trend"][0], rtol=1e-6)
+    assert sum("analysis_artifacts" in sql for sql in statements) == 1
@@ -86,3 +86,104 @@ async def test_synthetic_generation_types(client: AsyncClient):
         data = response.json()
         assert data["type"] == signal_type
         assert len(data["data"]) == 50
+
+
+@pytest.mark.asyncio
+async def test_analyze_repeated_window_served_from_cache(client: AsyncClient, sample_readings):
+    """Re-posting an identical window is answered from the result cache."""
+    from backend.core.cache import local_cache
+    from backend.core.metrics import ANALYSIS_CACHE_HITS
+
+    local_cache.clear()
+    hits = ANALYSIS_CACHE_HITS.labels(backend="memory")
+    analysis_request = {
+        "sensor_id": "TEST001",
+        "values": sample_readings[:80],
+        "timestamps": [f"2024-01-01T00:{i // 60:02d}:{i % 60:02d}" for i in range(80)],
+    }
+
+    first = await client.post("/analyze", json=analysis_request)
+    hits_before = hits._value.get()
+    second = await client.post("/analyze", json=analysis_request)
+
+    assert second.status_code == 200
+    assert hits._value.get() == hits_before + 1
+    assert second.json()["metrics"] == first.json()["metrics"]
+
+
+def test_analysis_cache_key_covers_request_content():
+    """Keys change with values, timestamps and config."""
+    from backend.core.cache import analysis_cache_key
+    from backend.models import SensorConfig
+
+    base = analysis_cache_key([1.0, 2.0, 3.0], ["a", "b", "c"], SensorConfig())
+    assert base == analysis_cache_key([1, 2, 3], ["a", "b", "c"], SensorConfig())
+    assert base != analysis_cache_key([1.0, 2.0, 3.5], ["a", "b", "c"], SensorConfig())
+    assert base != analysis_cache_key([1.0, 2.0, 3.0], ["a", "b", "d"], SensorConfig())
+    assert base != analysis_cache_key([1.0, 2.0, 3.0], ["a", "b", "c"], SensorConfig(slope_critical=0.2))
+
+
+@pytest.mark.asyncio
+async def test_analyze_compact_response(client: AsyncClient, sample_readings):
+    """compact=true returns base64 float32 series that decode to the JSON lists."""
+    import numpy as np
+    from backend.core.encoding import decode_series
+
+    analysis_request = {"sensor_id": "TEST002", "values": sample_readings}
+
+    plain = (await client.post("/analyze", json=analysis_request)).json()
+    response = await client.post("/analyze?compact=true", json=analysis_request)
+    assert response.status_code == 200
+
+    metrics = response.json()["metrics"]
+    assert metrics["encoding"] == "f32-base64"
+    assert metrics["bias"] == plain["metrics"]["bias"]
+    np.testing.assert_allclose(decode_series(metrics["trend"]), plain["metrics"]["trend"], rtol=1e-6, atol=1e-5)
+    assert len(metrics["timestamps"]) == len(sample_readings)
+
+
+@pytest.mark.asyncio
+async def test_analyze_max_points_downsamples_chart_series(client: AsyncClient):
+    """max_points caps every chart series at the requested length."""
+    import numpy as np
+
+    values = (np.sin(np.linspace(0, 50, 2000)) * 10).tolist()
+    response = await client.post("/analyze?max_points=250", json={"sensor_id": "TEST003", "values": values})
+    assert response.status_code == 200
+
+    metrics = response.json()["metrics"]
+    for field in ("timestamps", "trend", "residuals"):
+        assert len(metrics[field]) == 250
+    assert metrics["trend"][0] == pytest.approx(values[0], abs=0.5)
+
+
+@pytest.mark.asyncio
+async def test_analyze_rolling(client: AsyncClient, sample_readings):
+    """Rolling analysis returns one health entry per window."""
+    request = {"sensor_id": "TEST004", "values": sample_readings, "window": 50, "step": 10}
+    response = await client.post("/analyze/rolling", json=request)
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data["end_index"] == [49, 59, 69, 79, 89, 99]
+    assert len(data["health_score"]) == len(data["status"]) == 6
+
+    too_short = await client.post("/analyze/rolling", json={**request, "window": 500})
+    assert too_short.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_analyze_rolling_size_limits(client: AsyncClient, monkeypatch):
+    """Series above max_analysis_points and oversized windows are rejected before analysis."""
+    from backend.core.config import settings
+
+    monkeypatch.setattr(settings, "max_analysis_points", 200)
+    values = [float(i % 17) for i in range(201)]
+
+    too_many = await client.post("/analyze/rolling", json={"sensor_id": "TEST004", "values": values})
+    assert too_many.status_code == 413
+
+    too_wide = await client.post(
+        "/analyze/rolling", json={"sensor_id": "TEST004", "values": values[:100], "window": 10**9}
+    )
+    assert too_wide.status_code == 422
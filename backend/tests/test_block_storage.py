@@ -0,0 +1,75 @@
+"""
+Block Storage Tests
+
+Tests for the reading block codec and the block-backed ReadingStore.
+"""
+
+import pytest
+import numpy as np
+from datetime import datetime, timedelta
+from sqlalchemy import func, insert, select
+
+from backend.core.block_codec import decode_block, encode_block
+from backend.models_db import ReadingBlock, SensorReading
+from backend.repositories import ReadingStore
+from backend.repositories.blocks import BlockStore
+
+START = datetime(2024, 1, 1)
+
+
+@pytest.mark.parametrize("n_points", [0, 1, 2, 5000])
+def test_codec_roundtrip_is_lossless(n_points):
+    """Timestamps (incl. jitter) and float bit patterns survive encoding exactly."""
+    rng = np.random.default_rng(1)
+    timestamps = np.datetime64(START, "us") + np.cumsum(rng.integers(900_000, 1_100_000, n_points)).astype("timedelta64[us]")
+    values = np.round(20 + np.cumsum(rng.normal(0, 0.01, n_points)), 3)
+    if n_points > 3:
+        values[3] = np.nan
+
+    block = encode_block(timestamps, values)
+    decoded_ts, decoded_values = decode_block(block)
+
+    np.testing.assert_array_equal(decoded_ts, timestamps)
+    np.testing.assert_array_equal(decoded_values.view(np.uint64), values.view(np.uint64))
+
+
+def test_codec_compresses_regular_series():
+    """Regular sampling and slowly varying values pack well below 16 bytes/reading."""
+    n_points = 3600
+    timestamps = np.datetime64(START, "us") + np.arange(n_points).astype("timedelta64[s]")
+    values = np.round(20 + np.cumsum(np.random.default_rng(2).normal(0, 0.01, n_points)), 2)
+
+    assert len(encode_block(timestamps, values)) < 16 * n_points / 4
+
+
+async def test_converted_rows_read_back_transparently(db_session):
+    """Rows moved into blocks are merged with remaining rows by ReadingStore."""
+    n = 500
+    rows = [
+        {"sensor_id": "S1", "timestamp": START + timedelta(seconds=10 * i), "value": float(i)}
+        for i in range(n)
+    ]
+    await db_session.execute(insert(SensorReading), rows)
+    await db_session.commit()
+
+    cutoff = START + timedelta(seconds=10 * 400)
+    converted = await BlockStore(db_session, bucket_seconds=600).convert_rows("S1", cutoff)
+
+    assert converted == 400
+    assert await db_session.scalar(select(func.count()).select_from(SensorReading)) == 100
+    assert await db_session.scalar(select(func.count()).select_from(ReadingBlock)) == 7
+
+    store = ReadingStore(db_session, use_blocks=True)
+    latest = await store.latest("S1", 150)
+    np.testing.assert_array_equal(latest.values, np.arange(350, 500, dtype=float))
+
+    window = await store.range("S1", START + timedelta(seconds=3000), START + timedelta(seconds=4200))
+    np.testing.assert_array_equal(window.values, np.arange(300, 421, dtype=float))
+    assert window.isoformat()[0] == (START + timedelta(seconds=3000)).isoformat()
+
+    # Appending into an existing bucket merges in timestamp order
+    await BlockStore(db_session, bucket_seconds=600).append(
+        "S1", np.array([START + timedelta(seconds=5)], dtype="datetime64[us]"), np.array([-1.0])
+    )
+    head = await store.range("S1", START, START + timedelta(seconds=20))
+    np.testing.assert_array_equal(head.values, [0.0, -1.0, 1.0, 2.0])
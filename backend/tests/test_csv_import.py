@@ -0,0 +1,241 @@
+"""
+CSV Import Tests
+
+Tests for the /sensors/upload-csv and /sensors/upload-csv-wide bulk load
+paths: column-wise chunk parsing, the parse/insert pipeline, insert mode
+selection and the statistics reported in the import results.
+"""
+
+import asyncio
+import io
+import threading
+import pytest
+from contextlib import aclosing
+from datetime import datetime
+from sqlalchemy import func, select
+from fastapi import HTTPException, UploadFile
+
+from backend.api.routes import sensors as sensor_routes
+from backend.core.csv_import import PipelineStats, parse_chunk, parse_csv_row, pipeline
+from backend.models_db import Role, Sensor, SensorReading, User
+from backend.schemas.sensor import SensorReadingBulk
+
+NOW = datetime(2024, 6, 1, 12, 0)
+
+
+@pytest.fixture
+async def db_session(session_factory):
+    async with session_factory() as session:
+        session.add(Sensor(id="S1", name="Sensor", location="Lab"))
+        await session.commit()
+        yield session
+
+
+@pytest.fixture
+def admin():
+    return User(email="admin@example.com", role=Role.SUPER_ADMIN)
+
+
+def _csv(lines):
+    content = "timestamp,value\n" + "\n".join(lines) + "\n"
+    return UploadFile(file=io.BytesIO(content.encode()), filename="data.csv")
+
+
+async def _upload(db_session, admin, lines, **kwargs):
+    params = dict(
+        sensor_id="S1", has_header=True, timestamp_col=0, value_col=1,
+        chunk_size=100, skip_errors=True, db=db_session, current_user=admin,
+    )
+    params.update(kwargs)
+    return await sensor_routes.upload_csv(file=_csv(lines), **params)
+
+
+async def test_sqlite_uses_executemany(db_session, admin):
+    """Without COPY support rows go through the bulk INSERT and throughput is reported."""
+    lines = [f"2024-01-01T00:{i // 60:02d}:{i % 60:02d},{i}.5" for i in range(250)]
+
+    result = await _upload(db_session, admin, lines)
+
+    assert result.insert_mode == "executemany"
+    assert result.imported_rows == 250 and result.chunks_processed == 3
+    assert result.rows_per_second > 0
+    assert result.insert_duration_ms >= 0 and result.parse_duration_ms >= 0
+    assert await db_session.scalar(select(func.count()).select_from(SensorReading)) == 250
+
+
+async def test_copy_mode_dispatch(db_session, admin, monkeypatch):
+    """When COPY is supported every chunk is loaded through it."""
+    copied = []
+
+    async def fake_copy(db, rows):
+        copied.append(len(rows))
+
+    monkeypatch.setattr("backend.core.ingest.copy_supported", lambda db: True)
+    monkeypatch.setattr(sensor_routes, "copy_supported", lambda db: True)
+    monkeypatch.setattr("backend.core.ingest._copy_readings", fake_copy)
+
+    result = await _upload(db_session, admin, [f"2024-01-01T00:00:{i:02d},{i}" for i in range(50)], chunk_size=100)
+
+    assert result.insert_mode == "copy"
+    assert copied == [50]
+
+
+def test_parse_chunk_matches_per_row_validation():
+    """The column-wise parser accepts and rejects exactly what per-row validation does."""
+    rows = [
+        ["2024-01-15T10:30:00", "1.5"],
+        ["2024-01-15 10:30:00.123", " -2e3 "],
+        ["2024-01-15", "7"],
+        ["2024-01-15T10:30:00+03:00", "3"],      # offset: per-row path
+        ["2024-01-15T10:30:00Z", "4"],
+        ["", "5"],                               # no timestamp: now
+        ["15/01/2024", "6"],                     # unsupported format
+        ["2024-13-40T00:00:00", "6"],            # invalid date
+        ["2024-01-15T10:30:00", "abc"],
+        ["2024-01-15T10:30:00", "nan"],
+        ["2024-01-15T10:30:00", "2e9"],          # out of range
+        ["2024-01-15T10:30:00", ""],
+        ["8.5"],                                 # single column: value only
+    ]
+    row_nums = list(range(2, len(rows) + 2))
+
+    parsed = parse_chunk(rows, row_nums, "S1", 0, 1, now=NOW)
+
+    expected, expected_errors = [], []
+    for row, row_num in zip(rows, row_nums):
+        try:
+            fields = parse_csv_row(row, row_num, "S1", 0, 1)
+            reading = SensorReadingBulk(timestamp=fields["timestamp"], value=fields["value"])
+        except Exception as e:
+            expected_errors.append((row_num, str(e)))
+            continue
+        expected.append({"sensor_id": "S1", "timestamp": reading.timestamp or NOW, "value": reading.value})
+
+    assert parsed.rows == expected
+    assert parsed.errors == expected_errors
+    assert [row_num for row_num, _ in parsed.errors] == [8, 9, 10, 11, 12, 13]
+
+
+async def test_invalid_rows_reported(db_session, admin):
+    """Rejected rows are counted and sampled; fail-fast mode raises on the first one."""
+    lines = ["2024-01-01T00:00:00,1", "2024-01-01T00:00:01,oops", "", "2024-01-01T00:00:02,3"]
+
+    result = await _upload(db_session, admin, lines)
+
+    assert (result.imported_rows, result.failed_rows, result.skipped_rows) == (2, 1, 1)
+    assert result.error_samples[0].startswith("Row 3:")
+
+    with pytest.raises(HTTPException) as exc:
+        await _upload(db_session, admin, lines, skip_errors=False)
+    assert exc.value.status_code == 400 and "Row 3" in exc.value.detail
+
+
+async def test_pipeline_bounds_queue_and_preserves_order():
+    """The parser runs at most `depth` chunks (+1 in hand) ahead of a slow consumer."""
+    produced = []
+    ahead = []
+
+    def chunks():
+        for i in range(20):
+            produced.append(i)
+            yield i
+
+    stats = PipelineStats()
+    consumed = []
+    async with aclosing(pipeline(chunks(), 2, stats)) as items:
+        async for item in items:
+            await asyncio.sleep(0.005)
+            ahead.append(len(produced) - len(consumed))
+            consumed.append(item)
+
+    assert consumed == list(range(20))
+    assert max(ahead) <= 4
+    assert stats.parser_blocked_seconds > 0
+
+
+async def test_pipeline_reraises_parser_errors():
+    """An exception in the parser thread surfaces in the consumer."""
+    def chunks():
+        yield 1
+        raise ValueError("bad file")
+
+    with pytest.raises(ValueError, match="bad file"):
+        async with aclosing(pipeline(chunks(), 2, PipelineStats())) as items:
+            async for _ in items:
+                pass
+
+
+async def test_pipeline_abort_stops_parser():
+    """Leaving the consumer early stops the parser thread instead of parsing the rest."""
+    produced = []
+    parser_threads = set()
+
+    def chunks():
+        for i in range(1000):
+            parser_threads.add(threading.get_ident())
+            produced.append(i)
+            yield i
+
+    async with aclosing(pipeline(chunks(), 1, PipelineStats())) as items:
+        async for item in items:
+            if item == 2:
+                break
+
+    assert len(produced) < 10
+    assert threading.get_ident() not in parser_threads
+
+
+async def _upload_wide(db_session, user, content, **kwargs):
+    params = dict(
+        sensor_columns=None, has_header=True, timestamp_col=0,
+        chunk_size=100, skip_errors=True, db=db_session, current_user=user,
+    )
+    params.update(kwargs)
+    file = UploadFile(file=io.BytesIO(content.encode()), filename="wide.csv")
+    return await sensor_routes.upload_csv_wide(file=file, **params)
+
+
+async def test_wide_import_per_sensor_stats(db_session, admin):
+    """One pass imports every sensor column and reports per-sensor counts."""
+    db_session.add_all([Sensor(id="S2", name="B", location="Lab"), Sensor(id="S3", name="C", location="Lab")])
+    await db_session.commit()
+    content = (
+        "time,S1,S2,S3\n"
+        "2024-01-01T00:00:00,1,2,3\n"
+        "2024-01-01T00:00:01,1.5,,3.5\n"       # S2 not sampled
+        "2024-01-01T00:00:02,x,2.5,1e12\n"     # bad and out-of-range cells
+        "not-a-date,1,2,3\n"                   # fails every cell of the row
+        "2024-01-01T00:00:04,4\n"              # short row: S2/S3 empty
+    )
+
+    result = await _upload_wide(db_session, admin, content)
+
+    stats = {s.sensor_id: (s.column, s.imported_rows, s.failed_rows, s.skipped_rows) for s in result.sensors}
+    assert stats == {"S1": (1, 3, 2, 0), "S2": (2, 2, 1, 2), "S3": (3, 2, 2, 1)}
+    assert (result.total_rows, result.imported_rows, result.failed_rows) == (5, 7, 5)
+    counts = dict((await db_session.execute(
+        select(SensorReading.sensor_id, func.count()).group_by(SensorReading.sensor_id)
+    )).all())
+    assert counts == {"S1": 3, "S2": 2, "S3": 2}
+
+
+async def test_wide_import_column_mapping_and_ownership(db_session):
+    """Explicit mappings pick columns by header or index; foreign sensors are rejected up front."""
+    db_session.add_all([
+        Sensor(id="A", name="A", location="Lab", organization_id="org"),
+        Sensor(id="B", name="B", location="Lab", organization_id="other"),
+    ])
+    await db_session.commit()
+    user = User(email="user@example.com", role=Role.ENGINEER, organization_id="org")
+    content = "time,TT-101,PT-201\n2024-01-01T00:00:00,1,2\n"
+
+    result = await _upload_wide(db_session, user, content, sensor_columns='{"TT-101": "A"}')
+    assert [(s.sensor_id, s.column, s.imported_rows) for s in result.sensors] == [("A", 1, 1)]
+
+    with pytest.raises(HTTPException) as exc:
+        await _upload_wide(db_session, user, content, sensor_columns='{"1": "A", "2": "B"}')
+    assert exc.value.status_code == 404 and "B" in exc.value.detail
+
+    with pytest.raises(HTTPException) as exc:
+        await _upload_wide(db_session, user, content, sensor_columns='{"missing": "A"}')
+    assert exc.value.status_code == 400
@@ -0,0 +1,40 @@
+"""
+Downsampling Tests
+
+Tests for LTTB decimation of chart series.
+"""
+
+import numpy as np
+from backend.analysis import SensorAnalyzer
+from backend.core.downsample import downsample_metrics, lttb_indices
+from backend.core.encoding import compact_metrics, decode_series
+
+
+def test_lttb_keeps_endpoints_and_peaks():
+    """LTTB returns sorted indices, keeps both ends and an isolated spike."""
+    y = np.sin(np.linspace(0, 20, 5000))
+    y[2345] = 25.0
+
+    idx = lttb_indices(y, 200)
+    assert len(idx) == 200
+    assert idx[0] == 0 and idx[-1] == len(y) - 1
+    assert np.all(np.diff(idx) > 0)
+    assert 2345 in idx
+    np.testing.assert_array_equal(lttb_indices(y[:50], 100), np.arange(50))
+
+
+def test_downsample_metrics_uses_one_index_set():
+    """All chart series are reduced with the same indices; DFA series are untouched."""
+    values = (np.sin(np.linspace(0, 40, 3000)) * 5 + np.random.default_rng(2).normal(0, 0.2, 3000)).tolist()
+    metrics = SensorAnalyzer().analyze(values)["metrics"]
+    metrics["timestamps"] = [str(i) for i in range(len(values))]
+
+    reduced = downsample_metrics(metrics, 300)
+    idx = np.array([int(t) for t in reduced["timestamps"]])
+    assert len(idx) == 300
+    for field in ("trend", "residuals", "hysteresis_x", "hysteresis_y"):
+        np.testing.assert_array_equal(reduced[field], np.asarray(metrics[field])[idx])
+    assert reduced["dfa_scales"] == metrics["dfa_scales"]
+
+    compact = downsample_metrics(compact_metrics(metrics), 300)
+    np.testing.assert_allclose(decode_series(compact["trend"]), np.asarray(metrics["trend"])[idx], rtol=1e-6)
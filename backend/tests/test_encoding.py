@@ -0,0 +1,38 @@
+"""
+Series Encoding Tests
+
+Tests for the base64 float32 encoding of analysis series.
+"""
+
+import numpy as np
+from backend.analysis import SensorAnalyzer
+from backend.core.encoding import (
+    COMPACT_ENCODING, SERIES_FIELDS, compact_metrics, decode_series, encode_series, expand_metrics,
+)
+
+
+def test_encode_decode_roundtrip():
+    """Series survive encoding up to float32 precision."""
+    values = np.random.default_rng(3).normal(20.0, 5.0, 1000)
+    decoded = decode_series(encode_series(values))
+    np.testing.assert_allclose(decoded, values, rtol=1e-6)
+    assert decode_series(encode_series([])).size == 0
+
+
+def test_compact_metrics_from_arrays_matches_lists():
+    """Array results compact and expand to the same metrics as the list results."""
+    values = (np.sin(np.linspace(0, 30, 500)) * 10).tolist()
+    analyzer = SensorAnalyzer()
+    as_lists = analyzer.analyze(values)["metrics"]
+    as_arrays = analyzer.analyze(values, return_arrays=True)["metrics"]
+
+    compact = compact_metrics(as_arrays)
+    assert compact["encoding"] == COMPACT_ENCODING
+    assert all(isinstance(compact[f], str) for f in SERIES_FIELDS)
+
+    expanded = expand_metrics(compact)
+    assert "encoding" not in expanded
+    for field in SERIES_FIELDS:
+        np.testing.assert_allclose(expanded[field], as_lists[field], rtol=1e-6, atol=1e-5)
+    assert expanded["hurst"] == as_lists["hurst"]
+    assert expand_metrics(as_lists) == as_lists
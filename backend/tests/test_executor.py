@@ -0,0 +1,45 @@
+"""
+Analysis Executor Tests
+
+Tests that every executor mode returns the same result as a direct call.
+"""
+
+import pytest
+import numpy as np
+from backend.analysis import SensorAnalyzer, IncrementalSensorAnalyzer
+from backend.core.executor import AnalysisExecutor, analyze_values, seed_stream_state
+from backend.core.metrics import ANALYSIS_QUEUE_DEPTH
+
+
+@pytest.fixture
+def values():
+    rng = np.random.default_rng(5)
+    return (20 + np.cumsum(rng.normal(0, 0.1, 300))).tolist()
+
+
+@pytest.mark.parametrize("mode", ["inline", "thread", "process"])
+async def test_executor_modes_match_direct_call(mode, values):
+    """Jobs return the same analysis in every mode and leave no queued work."""
+    executor = AnalysisExecutor(mode, max_workers=1)
+    try:
+        result = await executor.run(analyze_values, values, None)
+        state = await executor.run(seed_stream_state, IncrementalSensorAnalyzer(200), values)
+    finally:
+        executor.shutdown()
+
+    expected = SensorAnalyzer().analyze(values)
+    assert result["health"] == expected["health"]
+    assert result["metrics"]["hurst"] == pytest.approx(expected["metrics"]["hurst"])
+    np.testing.assert_allclose(state.window(), values[-200:])
+    assert ANALYSIS_QUEUE_DEPTH._value.get() == 0
+
+
+async def test_executor_propagates_errors():
+    """Analysis errors surface to the awaiting caller."""
+    executor = AnalysisExecutor("thread", max_workers=1)
+    try:
+        with pytest.raises(ValueError):
+            await executor.run(analyze_values, [1.0, 2.0], None)
+    finally:
+        executor.shutdown()
+    assert ANALYSIS_QUEUE_DEPTH._value.get() == 0
@@ -0,0 +1,129 @@
+"""
+Incremental Analyzer Tests
+
+Tests that the streaming analyzer tracks the batch SensorAnalyzer.
+"""
+
+import pytest
+import numpy as np
+from backend.analysis import SensorAnalyzer, IncrementalSensorAnalyzer
+
+
+@pytest.fixture
+def stream():
+    """Drifting signal with a large DC offset."""
+    rng = np.random.default_rng(11)
+    return 1000 + np.cumsum(rng.normal(0, 0.05, 1500)) + rng.normal(0, 0.5, 1500)
+
+
+def _ols_residuals(values):
+    x = np.arange(len(values))
+    return values - np.polyval(np.polyfit(x, values, 1), x)
+
+
+def test_running_metrics_match_batch(stream):
+    """O(1) metrics track the raw-window calculations, anchored at the last refresh."""
+    analyzer = SensorAnalyzer()
+    inc = IncrementalSensorAnalyzer(400, refresh_interval=10_000)
+    inc.seed(stream[:100].tolist())
+    for value in stream[100:]:
+        inc.update(value)
+
+    window = stream[-400:]
+    np.testing.assert_allclose(inc.window(), window)
+    assert inc.slope() == pytest.approx(analyzer.calc_slope(window), abs=1e-12)
+    # bias: raw-window bias plus the batch/raw offset of the last refresh (the seed)
+    seed = stream[:100]
+    offset = analyzer.calc_bias(analyzer.preprocessing(seed.tolist())) - analyzer.calc_bias(seed)
+    assert inc.bias() == pytest.approx(analyzer.calc_bias(window) + offset, abs=1e-9)
+    # noise_std: OLS residual of the window, scaled at the last refresh
+    scale = analyzer.analyze(seed.tolist())["metrics"]["noise_std"] / np.std(_ols_residuals(seed))
+    assert inc.noise_std() == pytest.approx(np.std(_ols_residuals(window)) * scale, rel=1e-6)
+
+
+def test_refresh_matches_batch_pipeline(stream):
+    """After a refresh, bias, SNR, noise and DFA equal SensorAnalyzer.analyze on the window."""
+    analyzer = SensorAnalyzer()
+    inc = IncrementalSensorAnalyzer(500, refresh_interval=50)
+    inc.seed(stream[:500].tolist())
+    for value in stream[500:550]:
+        inc.update(value)
+    assert inc.needs_refresh
+    inc.refresh()
+    assert not inc.needs_refresh
+
+    window = stream[50:550]
+    metrics = inc.metrics()
+    batch = analyzer.analyze(window.tolist())["metrics"]
+    for name in ("bias", "snr_db", "noise_std", "hurst", "hurst_r2"):
+        assert metrics[name] == pytest.approx(batch[name], rel=1e-9, abs=1e-9), name
+    assert inc.rul() == analyzer.calc_rul(window, analyzer.calc_slope(window))
+
+
+def test_noise_matches_batch_on_trending_series():
+    """noise_std tracks analyze() on a trending sensor instead of the raw window spread."""
+    rng = np.random.default_rng(5)
+    stream = 50 + 0.05 * np.arange(1200) + rng.normal(0, 0.5, 1200)
+    analyzer = SensorAnalyzer()
+    inc = IncrementalSensorAnalyzer(500, refresh_interval=50)
+    inc.seed(stream[:500].tolist())
+
+    batch_noise = analyzer.analyze(stream[:500].tolist())["metrics"]["noise_std"]
+    assert inc.noise_std() == pytest.approx(batch_noise, rel=1e-9)
+    assert np.std(stream[:500]) > 10 * batch_noise
+
+    assert inc.metrics()["hurst"] < 0.8  # DFA runs on residuals, as in analyze()
+
+    for value in stream[500:540]:  # no refresh in between
+        inc.update(value)
+    batch_noise = analyzer.analyze(stream[40:540].tolist())["metrics"]["noise_std"]
+    assert inc.noise_std() == pytest.approx(batch_noise, rel=0.1)
+    assert inc.metrics()["noise_std"] < 2.0
+
+
+def test_non_finite_values_are_rejected():
+    """NaN/inf points do not corrupt the running sums."""
+    inc = IncrementalSensorAnalyzer(20)
+    inc.seed([1.0, 2.0, 3.0])
+    assert inc.update(float("nan")) is False
+    assert inc.update(4.0) is True
+    assert inc.count == 4
+    assert inc.slope() == pytest.approx(1.0)
+
+
+def test_stream_states_are_bounded():
+    """Least recently analyzed sensors are evicted; deleted sensors are forgotten."""
+    from backend.api.routes.analytics import StreamStates
+
+    states = StreamStates(maxsize=2)
+    for sensor_id in ["A", "B"]:
+        states.set(sensor_id, IncrementalSensorAnalyzer(20))
+    states.get("A")
+    states.set("C", IncrementalSensorAnalyzer(20))
+
+    assert len(states) == 2
+    assert states.get("B") is None and states.get("A") is not None
+    states.discard("A")
+    assert states.get("A") is None
+
+
+async def test_stream_state_lock_serializes_sensor():
+    """Concurrent analyses of one sensor share a lock; other sensors do not wait."""
+    import asyncio
+    from backend.api.routes.analytics import StreamStates
+
+    states = StreamStates()
+    lock = states.lock("A")
+    assert states.lock("A") is lock
+    assert states.lock("B") is not lock
+
+    order = []
+
+    async def analysis(tag):
+        async with states.lock("A"):
+            order.append(f"{tag} start")
+            await asyncio.sleep(0.01)
+            order.append(f"{tag} end")
+
+    await asyncio.gather(analysis(1), analysis(2))
+    assert order == ["1 start", "1 end", "2 start", "2 end"]
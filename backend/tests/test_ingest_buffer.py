@@ -0,0 +1,122 @@
+"""
+Ingest Buffer Tests
+
+Tests for the write-behind buffer behind /sensors/stream-data: batching of
+concurrent writes, time-based flushes, flush-before-ack and shutdown.
+"""
+
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import event, func, select
+
+from backend.core.ingest import IngestBuffer
+from backend.models_db import Sensor, SensorReading
+
+START = datetime(2024, 1, 1)
+
+
+@pytest.fixture
+async def session_factory(session_factory):
+    """Shared session factory with the sensor seeded."""
+    async with session_factory() as session:
+        session.add(Sensor(id="S1", name="Sensor", location="Lab"))
+        await session.commit()
+    return session_factory
+
+
+@pytest.fixture
+def inserts(test_db_engine):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO sensor_readings"):
+            statements.append(statement)
+
+    event.listen(test_db_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(test_db_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+def _row(i):
+    return {"sensor_id": "S1", "timestamp": START + timedelta(seconds=i), "value": float(i)}
+
+
+async def _count(session_factory):
+    async with session_factory() as session:
+        return await session.scalar(select(func.count()).select_from(SensorReading))
+
+
+async def test_concurrent_adds_share_flushes(session_factory, inserts):
+    """Durable writes from concurrent producers are committed in a few batched inserts."""
+    buffer = IngestBuffer(session_factory, batch_size=50, flush_interval=0.05)
+
+    await asyncio.gather(*(buffer.add([_row(i)], wait=True) for i in range(200)))
+
+    assert await _count(session_factory) == 200
+    assert len(inserts) <= 8
+    await buffer.stop()
+
+
+async def test_flush_after_interval(session_factory):
+    """A partial batch is written once flush_interval elapses."""
+    buffer = IngestBuffer(session_factory, batch_size=1000, flush_interval=0.05)
+
+    await buffer.add([_row(0), _row(1)])
+    assert buffer.pending == 2
+    await asyncio.sleep(0.3)
+
+    assert buffer.pending == 0
+    assert await _count(session_factory) == 2
+    await buffer.stop()
+
+
+async def test_durable_failure_raises(session_factory):
+    """A failed flush is raised in every producer waiting on it."""
+    buffer = IngestBuffer(session_factory, batch_size=2, flush_interval=0.05)
+    bad = {"sensor_id": "S1", "timestamp": None, "value": 1.0}  # timestamp is NOT NULL
+
+    results = await asyncio.gather(
+        buffer.add([_row(0)], wait=True), buffer.add([bad], wait=True), return_exceptions=True,
+    )
+
+    assert all(isinstance(r, Exception) for r in results)
+    assert await _count(session_factory) == 0
+    await buffer.stop()
+
+
+async def test_stop_flushes_pending(session_factory):
+    """stop() writes what is still queued."""
+    buffer = IngestBuffer(session_factory, batch_size=1000, flush_interval=60)
+
+    await buffer.add([_row(i) for i in range(10)])
+    await buffer.stop()
+
+    assert await _count(session_factory) == 10
+
+
+async def test_backpressure_at_max_pending(session_factory):
+    """A producer arriving with max_pending rows queued waits until they are flushed."""
+    buffer = IngestBuffer(session_factory, batch_size=1000, flush_interval=60, max_pending=10)
+
+    await buffer.add([_row(i) for i in range(10)])
+    assert buffer.pending == 10
+
+    await buffer.add([_row(10)])
+
+    assert buffer.pending == 1
+    assert await _count(session_factory) == 10
+    await buffer.stop()
+
+
+async def test_add_after_idle_flushes_partial_batch(session_factory):
+    """A durable add() to an idle, already started flusher returns after flush_interval."""
+    buffer = IngestBuffer(session_factory, batch_size=1000, flush_interval=0.05)
+    buffer.start()
+    await asyncio.sleep(0.05)  # flusher is now idle waiting for rows
+
+    await asyncio.wait_for(buffer.add([_row(0)], wait=True), timeout=2)
+
+    assert buffer.pending == 0
+    assert await _count(session_factory) == 1
+    await buffer.stop()
@@ -0,0 +1,203 @@
+"""
+Ingest WebSocket Tests
+
+Tests for /sensors/ws/ingest: token check on connect, compact frames,
+batched acknowledgements, per-sensor ownership and rejected frames.
+"""
+
+import asyncio
+import pytest
+from datetime import datetime
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from fastapi.websockets import WebSocketDisconnect
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from backend.api.routes import sensors as sensor_routes
+from backend.core.config import settings
+from backend.core.ingest import IngestBuffer, parse_frame
+from backend.core.security import create_access_token
+from backend.database import Base
+from backend.models_db import Organization, Role, Sensor, SensorReading, User
+
+NOW = datetime(2024, 6, 1, 12, 0)
+
+
+@pytest.fixture
+def database(tmp_path):
+    """File-backed SQLite (the test client runs the app on its own event loop)."""
+    path = tmp_path / "ingest.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all([Organization(id="org", name="Org"), Organization(id="other", name="Other")])
+        session.add(User(id="u1", email="gw@example.com", hashed_password="x", role=Role.ENGINEER, organization_id="org"))
+        session.add_all([
+            Sensor(id="S1", name="A", location="Lab", organization_id="org"),
+            Sensor(id="S2", name="B", location="Lab", organization_id="org"),
+            Sensor(id="X", name="Foreign", location="Lab", organization_id="other"),
+        ])
+        session.commit()
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def client(database, monkeypatch):
+    session_factory = async_sessionmaker(
+        create_async_engine(database.url.set(drivername="sqlite+aiosqlite"), poolclass=NullPool),
+        class_=AsyncSession, expire_on_commit=False,
+    )
+    monkeypatch.setattr(sensor_routes, "AsyncSessionLocal", session_factory)
+    monkeypatch.setattr(sensor_routes, "ingest_buffer", IngestBuffer(session_factory, flush_interval=0.01))
+    monkeypatch.setattr(settings, "ingest_mode", "direct")
+    monkeypatch.setattr(settings, "ingest_ws_ack_points", 4)
+    monkeypatch.setattr(settings, "ingest_ws_ack_ms", 50)
+
+    analyses = []
+
+    async def record_analysis(sensor_id, db_session_factory, value=None):
+        analyses.append((sensor_id, value))
+
+    monkeypatch.setattr("backend.api.routes.analytics.run_background_analysis", record_analysis)
+
+    app = FastAPI()
+    app.include_router(sensor_routes.router)
+    test_client = TestClient(app)
+    test_client.analyses = analyses
+    return test_client
+
+
+@pytest.fixture
+def token():
+    return create_access_token({"sub": "u1", "org_id": "org", "role": "engineer"})
+
+
+def _readings(database):
+    with Session(database) as session:
+        return dict(session.execute(
+            select(SensorReading.sensor_id, func.count()).group_by(SensorReading.sensor_id)
+        ).all())
+
+
+def test_parse_frame():
+    """Compact frames decode to reading dicts; malformed frames are rejected whole."""
+    rows = parse_frame('[["S1", 1.5], ["S2", 2, 1717243200], ["S1", -3, "2024-06-01T10:00:00"]]', NOW)
+
+    assert [(r["sensor_id"], r["value"]) for r in rows] == [("S1", 1.5), ("S2", 2.0), ("S1", -3.0)]
+    assert rows[0]["timestamp"] == NOW
+    assert rows[1]["timestamp"] == datetime.fromtimestamp(1717243200)
+    assert rows[2]["timestamp"] == datetime(2024, 6, 1, 10)
+
+    for frame in ['{"S1": 1}', "[]", '[["S1"]]', '[["S1", "x"]]', '[["S1", NaN]]', '[["S1", 1, true]]', "not json"]:
+        with pytest.raises(ValueError):
+            parse_frame(frame, NOW)
+
+
+def test_rejects_missing_or_invalid_token(client):
+    for url in ["/sensors/ws/ingest", "/sensors/ws/ingest?token=invalid"]:
+        with pytest.raises(WebSocketDisconnect) as exc:
+            with client.websocket_connect(url) as ws:
+                ws.receive_json()
+        assert exc.value.code == 1008
+
+
+def test_stream_with_batched_acks(client, database, token):
+    """Points are stored and acknowledged per batch; one analysis per sensor and batch."""
+    with client.websocket_connect(f"/sensors/ws/ingest?token={token}") as ws:
+        assert ws.receive_json() == {"type": "ready", "ack_points": 4, "ack_ms": 50}
+
+        ws.send_text('[["S1", 1], ["S2", 2]]')
+        ws.send_text('[["S1", 3], ["S1", 4]]')          # 4 points: stored and acked
+        assert ws.receive_json() == {"type": "ack", "seq": 2, "points": 4}
+
+        ws.send_text('[["S2", 5]]')                       # acked after ingest_ws_ack_ms
+        assert ws.receive_json() == {"type": "ack", "seq": 3, "points": 1}
+
+    assert _readings(database) == {"S1": 3, "S2": 2}
+    assert sorted(client.analyses) == [("S1", None), ("S2", 2.0), ("S2", 5.0)]
+
+
+def test_rejected_frames(client, database):
+    """Malformed frames and foreign sensors get an error; the connection keeps working."""
+    token = create_access_token({"sub": "u1", "org_id": "org", "role": "engineer"})
+    with client.websocket_connect("/sensors/ws/ingest", headers={"Authorization": f"Bearer {token}"}) as ws:
+        ws.receive_json()
+
+        ws.send_text('[["S1", "oops"]]')
+        error = ws.receive_json()
+        assert (error["type"], error["seq"]) == ("error", 1)
+
+        ws.send_text('[["S1", 1], ["X", 2]]')
+        error = ws.receive_json()
+        assert (error["type"], error["seq"]) == ("error", 2) and "X" in error["detail"]
+
+        ws.send_text('[["S1", 1], ["S1", 2], ["S1", 3], ["S1", 4]]')
+        assert ws.receive_json() == {"type": "ack", "seq": 3, "points": 4}
+
+    assert _readings(database) == {"S1": 4}
+
+
+def test_durable_mode_acks_partial_batches(client, database, token, monkeypatch):
+    """In durable mode a time-triggered batch is committed through the idle ingest buffer, then acked."""
+    monkeypatch.setattr(settings, "ingest_mode", "durable")
+    buffer = sensor_routes.ingest_buffer
+    client.app.router.on_startup.append(buffer.start)
+    client.app.router.on_shutdown.append(buffer.stop)
+
+    with client:  # runs startup on the loop the WebSocket uses, so the flusher is idle when points arrive
+        with client.websocket_connect(f"/sensors/ws/ingest?token={token}") as ws:
+            ws.receive_json()
+
+            ws.send_text('[["S1", 1], ["S2", 2]]')
+            assert ws.receive_json() == {"type": "ack", "seq": 1, "points": 2}
+
+            ws.send_text('[["S1", 3]]')
+            assert ws.receive_json() == {"type": "ack", "seq": 2, "points": 1}
+
+    assert _readings(database) == {"S1": 2, "S2": 1}
+
+
+def test_failed_write_sends_error(client, database, token, monkeypatch):
+    """A database error in direct mode is reported as an error frame; the connection stays open."""
+    async def failing_write(db, rows, use_copy=False):
+        raise OperationalError("INSERT", {}, Exception("database is locked"))
+
+    monkeypatch.setattr(sensor_routes, "write_readings", failing_write)
+
+    with client.websocket_connect(f"/sensors/ws/ingest?token={token}") as ws:
+        ws.receive_json()
+
+        ws.send_text('[["S1", 1], ["S1", 2], ["S1", 3], ["S1", 4]]')
+        error = ws.receive_json()
+        assert (error["type"], error["seq"]) == ("error", 1)
+
+        ws.send_text('[["S1", "oops"]]')
+        assert ws.receive_json()["seq"] == 2
+
+    assert _readings(database) == {}
+
+
+def test_disconnect_cancels_analyses(client, token, monkeypatch):
+    """Analyses still running when the connection closes are cancelled."""
+    cancelled = []
+
+    async def slow_analysis(sensor_id, db_session_factory, value=None):
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.append(sensor_id)
+            raise
+
+    monkeypatch.setattr("backend.api.routes.analytics.run_background_analysis", slow_analysis)
+
+    with client.websocket_connect(f"/sensors/ws/ingest?token={token}") as ws:
+        ws.receive_json()
+        ws.send_text('[["S1", 1], ["S1", 2], ["S2", 3], ["S2", 4]]')
+        assert ws.receive_json()["type"] == "ack"
+
+    assert sorted(cancelled) == ["S1", "S2"]
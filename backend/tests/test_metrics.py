@@ -6,6 +6,7 @@ Tests for sensor analysis metrics calculation functions.
 
 import pytest
 import numpy as np
+from scipy import stats
 from backend.analysis import SensorAnalyzer
 
 
@@ -149,3 +150,148 @@ def test_analyze_end_to_end(analyzer, clean_signal):
     assert "diagnosis" in health
     assert "flags" in health
     assert "recommendation" in health
+
+
+def _polyfit_fluctuations(data, scales, order):
+    """Per-segment np.polyfit reference for the batched DFA kernel."""
+    y = np.cumsum(data - np.mean(data))
+    flucts = []
+    for scale in scales:
+        n_segments = len(y) // scale
+        x = np.arange(scale)
+        total = 0.0
+        for seg in y[:n_segments * scale].reshape(n_segments, scale):
+            total += np.sum((seg - np.polyval(np.polyfit(x, seg, order), x)) ** 2)
+        flucts.append(np.sqrt(total / (n_segments * scale)))
+    return np.array(flucts)
+
+
+@pytest.mark.parametrize("order", [1, 2])
+def test_calc_dfa_matches_polyfit_reference(analyzer, order):
+    """Batched DFA detrending reproduces the per-segment polyfit result."""
+    rng = np.random.default_rng(7)
+    data = np.cumsum(rng.normal(0, 1, 2000))
+
+    hurst, r2, scales, fluctuations = analyzer.calc_dfa(data, order=order)
+    expected = _polyfit_fluctuations(data, scales, order)
+
+    np.testing.assert_allclose(fluctuations, expected, rtol=1e-9)
+    slope, _, r_value, _, _ = stats.linregress(np.log(scales), np.log(expected))
+    assert hurst == pytest.approx(slope, abs=1e-9)
+    assert r2 == pytest.approx(r_value ** 2, abs=1e-9)
+
+
+def test_dfa_fluctuation_rows_are_independent():
+    """A 2D profile yields the same fluctuation per row as the 1D kernel."""
+    from backend.analysis import _dfa_fluctuation
+
+    rng = np.random.default_rng(3)
+    profiles = np.cumsum(rng.normal(0, 1, (4, 512)), axis=1)
+
+    batched = _dfa_fluctuation(profiles, 16, 1)
+    single = np.array([_dfa_fluctuation(row, 16, 1) for row in profiles])
+
+    np.testing.assert_allclose(batched, single, rtol=1e-12)
+
+
+def test_analyze_batch_matches_analyze(analyzer):
+    """Vectorized fleet analysis reproduces per-sensor analyze() results."""
+    rng = np.random.default_rng(5)
+    t = np.linspace(0, 20, 300)
+    matrix = np.array([
+        np.sin(t) * 10 + rng.normal(0, 0.5, 300),
+        np.linspace(0, 5, 300) + rng.normal(0, 0.1, 300),
+        rng.normal(0, 3.0, 300),
+        np.ones(300),
+    ])
+    matrix[0, 40:43] = np.nan
+
+    batch = analyzer.analyze_batch(matrix)
+
+    assert len(batch) == len(matrix)
+    for row, result in zip(matrix, batch):
+        expected = analyzer.analyze(row.tolist())
+        assert result["health"] == expected["health"]
+        assert result["prediction"] == expected["prediction"]
+        for key, value in expected["metrics"].items():
+            if isinstance(value, list):
+                np.testing.assert_allclose(result["metrics"][key], value, rtol=1e-7, atol=1e-9)
+            else:
+                assert result["metrics"][key] == pytest.approx(value, rel=1e-7, abs=1e-9)
+
+
+def test_analyze_batch_rejects_short_windows(analyzer):
+    """Batch analysis enforces the same minimum length as preprocessing."""
+    with pytest.raises(ValueError):
+        analyzer.analyze_batch(np.zeros((3, 10)))
+
+
+def test_regression_context_matches_linregress(drifting_signal):
+    """Shared OLS context reproduces scipy's linregress fit."""
+    from backend.analysis import RegressionContext
+
+    ctx = RegressionContext(drifting_signal)
+    expected = stats.linregress(np.arange(len(drifting_signal)), drifting_signal)
+
+    assert ctx.slope == pytest.approx(expected.slope, rel=1e-12)
+    assert ctx.intercept == pytest.approx(expected.intercept, rel=1e-12)
+    np.testing.assert_allclose(
+        ctx.residuals(),
+        drifting_signal - (expected.slope * np.arange(len(drifting_signal)) + expected.intercept),
+        atol=1e-10,
+    )
+
+
+@pytest.mark.parametrize("gaps", [
+    [(0, 3)],             # leading gap
+    [(40, 48)],           # gap longer than the interpolation limit
+    [(95, 100)],          # trailing gap
+    [(10, 12), (60, 75)],
+])
+def test_numpy_preprocessing_matches_pandas(gaps):
+    """The NumPy gap fill and smoothing reproduce the pandas reference."""
+    rng = np.random.default_rng(7)
+    data = rng.normal(20.0, 1.0, 100)
+    for start, stop in gaps:
+        data[start:stop] = np.nan
+
+    numpy_analyzer = SensorAnalyzer(engine="numpy")
+    pandas_analyzer = SensorAnalyzer(engine="pandas")
+
+    clean = numpy_analyzer.preprocessing(data.tolist())
+    np.testing.assert_allclose(clean, pandas_analyzer.preprocessing(data.tolist()), rtol=1e-12)
+    np.testing.assert_allclose(numpy_analyzer._smooth(clean), pandas_analyzer._smooth(clean), rtol=1e-12)
+    np.testing.assert_allclose(
+        numpy_analyzer._preprocess_batch(np.vstack([data, data[::-1]])),
+        pandas_analyzer._preprocess_batch(np.vstack([data, data[::-1]])),
+        rtol=1e-12,
+    )
+
+
+def test_analyze_rolling_chunks_match_single_pass(drifting_signal, monkeypatch):
+    """Processing the windows in small chunks gives the same result as one pass."""
+    analyzer = SensorAnalyzer()
+    single = analyzer.analyze_rolling(drifting_signal.tolist(), window=60, step=3)
+    monkeypatch.setattr(SensorAnalyzer, "ROLLING_CHUNK_POINTS", 500)  # 8 windows per chunk
+    chunked = analyzer.analyze_rolling(drifting_signal.tolist(), window=60, step=3)
+
+    for name in ("bias", "slope", "noise_std", "snr_db"):
+        np.testing.assert_allclose(chunked[name], single[name], rtol=1e-12, atol=1e-12)
+    assert chunked["health_score"] == single["health_score"]
+
+
+def test_analyze_rolling_matches_per_window_metrics(drifting_signal):
+    """Rolling metrics equal the scalar calculations on each preprocessed window."""
+    analyzer = SensorAnalyzer()
+    rolling = analyzer.analyze_rolling(drifting_signal.tolist(), window=60, step=7)
+
+    clean = analyzer.preprocessing(drifting_signal.tolist())
+    assert rolling["end_index"][0] == 59
+    assert len(rolling["health_score"]) == (len(clean) - 60) // 7 + 1
+    for i, end in enumerate(rolling["end_index"]):
+        window = clean[end - 59:end + 1]
+        trend, residuals = analyzer.decompose_signal(window)
+        assert rolling["slope"][i] == pytest.approx(analyzer.calc_slope(trend), abs=1e-12)
+        assert rolling["noise_std"][i] == pytest.approx(np.std(residuals), rel=1e-9)
+        assert rolling["bias"][i] == pytest.approx(analyzer.calc_bias(window), abs=1e-12)
+        assert rolling["snr_db"][i] == pytest.approx(analyzer.calc_snr_db(window), rel=1e-9)
@@ -0,0 +1,70 @@
+"""
+Query Plan Tests
+
+Checks with EXPLAIN QUERY PLAN (SQLite) that the per-sensor reading and
+history fetches are served by the composite indexes without a sort step.
+"""
+
+import pytest
+from datetime import datetime
+from sqlalchemy import create_engine, desc, select, tuple_
+from sqlalchemy.dialects import sqlite
+
+from backend.database import Base
+from backend.models_db import AnalysisResultDB
+from backend.repositories.readings import latest_readings_stmt, range_readings_stmt
+
+
+@pytest.fixture
+def sqlite_conn():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with engine.connect() as conn:
+        yield conn
+    engine.dispose()
+
+
+def query_plan(conn, stmt) -> str:
+    sql = str(stmt.compile(dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True}))
+    return "\n".join(row[3] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}"))
+
+
+@pytest.mark.parametrize("stmt", [
+    latest_readings_stmt("TEST001", 1000),
+    range_readings_stmt("TEST001", datetime(2024, 1, 1), datetime(2024, 2, 1), limit=10000),
+])
+def test_reading_fetches_use_covering_index(sqlite_conn, stmt):
+    """Window and date-range fetches are index-only scans in timestamp order."""
+    plan = query_plan(sqlite_conn, stmt)
+    assert "COVERING INDEX ix_sensor_readings_sensor_ts_value" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_history_page_uses_sensor_timestamp_index(sqlite_conn):
+    """History paging walks the (sensor_id, timestamp) index instead of sorting."""
+    stmt = (
+        select(AnalysisResultDB)
+        .where(AnalysisResultDB.sensor_id == "TEST001")
+        .order_by(desc(AnalysisResultDB.timestamp))
+        .offset(20)
+        .limit(20)
+    )
+    plan = query_plan(sqlite_conn, stmt)
+    assert "ix_analysis_results_sensor_ts" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_history_cursor_page_seeks_index(sqlite_conn):
+    """Keyset history pages seek the (sensor_id, timestamp) index instead of sorting."""
+    stmt = (
+        select(AnalysisResultDB)
+        .where(
+            AnalysisResultDB.sensor_id == "TEST001",
+            tuple_(AnalysisResultDB.timestamp, AnalysisResultDB.id) < tuple_(datetime(2024, 1, 1), 500),
+        )
+        .order_by(desc(AnalysisResultDB.timestamp), desc(AnalysisResultDB.id))
+        .limit(21)
+    )
+    plan = query_plan(sqlite_conn, stmt)
+    assert "ix_analysis_results_sensor_ts" in plan
+    assert "TEMP B-TREE" not in plan
@@ -0,0 +1,49 @@
+"""
+Reading Store Tests
+
+Tests for the columnar ReadingStore repository.
+"""
+
+import numpy as np
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+
+from backend.models_db import SensorReading
+from backend.repositories import ReadingStore
+
+START = datetime(2024, 1, 1)
+
+
+async def seed_readings(db_session, n: int = 30):
+    rows = [
+        {"sensor_id": sensor_id, "timestamp": START + timedelta(minutes=i), "value": float(i) + offset}
+        for sensor_id, offset in (("S1", 0.0), ("S2", 1000.0))
+        for i in range(n)
+    ]
+    await db_session.execute(insert(SensorReading), rows)
+    await db_session.commit()
+
+
+async def test_latest_returns_chronological_arrays(db_session):
+    """latest() returns the newest N readings, oldest first, as float64/datetime64."""
+    await seed_readings(db_session)
+
+    series = await ReadingStore(db_session).latest("S1", 10)
+
+    assert series.values.dtype == np.float64
+    assert series.timestamps.dtype == np.dtype("datetime64[us]")
+    np.testing.assert_array_equal(series.values, np.arange(20, 30, dtype=float))
+    assert series.isoformat()[0] == (START + timedelta(minutes=20)).isoformat()
+
+
+async def test_range_is_inclusive_and_empty_sensor_is_empty(db_session):
+    """range() includes both bounds; unknown sensors give empty arrays."""
+    await seed_readings(db_session)
+    store = ReadingStore(db_session)
+
+    series = await store.range("S2", START + timedelta(minutes=5), START + timedelta(minutes=9))
+    np.testing.assert_array_equal(series.values, 1000.0 + np.arange(5, 10))
+
+    empty = await store.latest("missing", 10)
+    assert len(empty) == 0
+    assert empty.isoformat() == []
@@ -0,0 +1,118 @@
+"""
+Retention Tests
+
+Tests for the raw reading retention pass of the maintenance tasks.
+"""
+
+import numpy as np
+from datetime import datetime, timedelta
+from sqlalchemy import func, insert, select
+
+from backend.models_db import Organization, ReadingBlock, ReadingRollup, Sensor, SensorReading
+from backend.repositories.blocks import BlockStore
+from backend.tasks.maintenance_tasks import _enforce_retention
+
+NOW = datetime(2024, 3, 1, 12, 30)
+
+
+async def _seed(session, sensor_id, days, step_minutes=10):
+    """One reading every `step_minutes` for the `days` before NOW."""
+    n_points = days * 24 * 60 // step_minutes
+    start = NOW - timedelta(days=days)
+    await session.execute(insert(SensorReading), [
+        {"sensor_id": sensor_id, "timestamp": start + timedelta(minutes=step_minutes * i), "value": float(i % 7)}
+        for i in range(n_points)
+    ])
+    await session.commit()
+    return n_points
+
+
+async def _raw_count(session, sensor_id):
+    return await session.scalar(select(func.count()).where(SensorReading.sensor_id == sensor_id))
+
+
+async def test_retention_precedence_and_rollups(db_session):
+    """Sensor overrides organization; expired rows are deleted in batches and kept as rollups."""
+    db_session.add(Organization(id="org", name="Org", raw_retention_days=5))
+    db_session.add_all([
+        Sensor(id="org-default", organization_id="org"),
+        Sensor(id="override", organization_id="org", raw_retention_days=2),
+        Sensor(id="forever", raw_retention_days=0),
+    ])
+    await db_session.commit()
+    total = {sensor_id: await _seed(db_session, sensor_id, days=10) for sensor_id in ("org-default", "override", "forever")}
+
+    stats = await _enforce_retention(db_session, NOW, batch_size=100)
+
+    assert stats["sensors"] == 2
+    assert await _raw_count(db_session, "forever") == total["forever"]
+    for sensor_id, days in (("org-default", 5), ("override", 2)):
+        # Cutoff is floored to the hour (lcm of the default 60/900/3600 tiers)
+        cutoff = (NOW - timedelta(days=days)).replace(minute=0)
+        oldest = await db_session.scalar(
+            select(func.min(SensorReading.timestamp)).where(SensorReading.sensor_id == sensor_id)
+        )
+        assert oldest == cutoff
+
+        rolled = await db_session.scalar(
+            select(func.sum(ReadingRollup.value_count)).where(
+                ReadingRollup.sensor_id == sensor_id,
+                ReadingRollup.resolution == 3600,
+            )
+        )
+        assert rolled + await _raw_count(db_session, sensor_id) == total[sensor_id]
+    assert stats["rows_deleted"] == 2 * total["forever"] - await _raw_count(db_session, "org-default") - await _raw_count(db_session, "override")
+
+
+async def test_retention_is_idempotent(db_session):
+    """A second run finds nothing to delete and leaves the rollups unchanged."""
+    db_session.add(Sensor(id="s1", raw_retention_days=3))
+    await db_session.commit()
+    await _seed(db_session, "s1", days=6)
+
+    await _enforce_retention(db_session, NOW, batch_size=500)
+    before = (await db_session.execute(
+        select(ReadingRollup.bucket_start, ReadingRollup.value_count, ReadingRollup.value_sum)
+        .where(ReadingRollup.resolution == 900)
+        .order_by(ReadingRollup.bucket_start)
+    )).all()
+
+    stats = await _enforce_retention(db_session, NOW, batch_size=500)
+    after = (await db_session.execute(
+        select(ReadingRollup.bucket_start, ReadingRollup.value_count, ReadingRollup.value_sum)
+        .where(ReadingRollup.resolution == 900)
+        .order_by(ReadingRollup.bucket_start)
+    )).all()
+
+    assert stats["rows_deleted"] == 0
+    assert after == before
+    # Seeded from 12:30, cutoff floored to 12:00: three days of 10-minute readings minus 30 minutes
+    assert np.sum([row.value_count for row in before]) == 3 * 24 * 6 - 3
+
+
+async def test_retention_rolls_up_and_deletes_blocks(db_session):
+    """Sensors whose expired rows were all packed into blocks still get rolled up and reclaimed."""
+    db_session.add(Sensor(id="s1", raw_retention_days=3))
+    await db_session.commit()
+    total = await _seed(db_session, "s1", days=6)
+    cutoff = datetime(2024, 2, 27, 12)  # NOW - 3 days, floored to the hour
+    await BlockStore(db_session, bucket_seconds=3600).convert_rows("s1", cutoff)
+    blocks = await db_session.scalar(select(func.count()).select_from(ReadingBlock))
+    assert blocks > 0
+    assert await db_session.scalar(
+        select(func.count()).where(SensorReading.sensor_id == "s1", SensorReading.timestamp < cutoff)
+    ) == 0
+
+    stats = await _enforce_retention(db_session, NOW, batch_size=500)
+
+    assert stats["sensors"] == 1 and stats["rows_deleted"] == 0
+    assert stats["blocks_deleted"] == blocks
+    assert await db_session.scalar(select(func.count()).select_from(ReadingBlock)) == 0
+    rolled = await db_session.scalar(
+        select(func.sum(ReadingRollup.value_count)).where(
+            ReadingRollup.sensor_id == "s1",
+            ReadingRollup.resolution == 3600,
+            ReadingRollup.bucket_start < cutoff,
+        )
+    )
+    assert rolled + await _raw_count(db_session, "s1") == total
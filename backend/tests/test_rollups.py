@@ -0,0 +1,149 @@
+"""
+Rollup Tests
+
+Tests for rollup aggregation, incremental upserts, rebuilds, tier selection
+and the history backfill.
+"""
+
+import pytest
+import numpy as np
+from datetime import datetime, timedelta
+from sqlalchemy import insert, select
+
+from backend.models_db import ReadingRollup, SensorReading
+from backend.repositories.rollups import (
+    RollupStore,
+    aggregate_readings,
+    resolution_for_span,
+    select_resolution,
+)
+
+START = datetime(2024, 1, 1)
+
+
+def _readings(n_points, step_seconds=1, seed=0):
+    timestamps = np.datetime64(START, "us") + (np.arange(n_points) * step_seconds).astype("timedelta64[s]")
+    values = 20 + np.random.default_rng(seed).normal(0, 1, n_points)
+    return timestamps, values
+
+
+def test_aggregate_matches_per_bucket_statistics():
+    """Vectorized bucket stats equal a plain per-bucket computation (unsorted input)."""
+    timestamps, values = _readings(1000)
+    order = np.random.default_rng(1).permutation(len(values))
+
+    rows = aggregate_readings("s1", timestamps[order], values[order], 60)
+
+    assert len(rows) == 17
+    for i, row in enumerate(rows):
+        bucket = values[i * 60:(i + 1) * 60]
+        assert row["bucket_start"] == START + timedelta(seconds=60 * i)
+        assert row["value_count"] == len(bucket)
+        assert row["value_sum"] == pytest.approx(bucket.sum())
+        assert row["value_sum_sq"] == pytest.approx((bucket ** 2).sum())
+        assert row["value_min"] == bucket.min()
+        assert row["value_max"] == bucket.max()
+
+
+def test_tier_selection():
+    """select_resolution picks the coarsest tier within the request; spans pick the finest that fits."""
+    assert select_resolution(30) is None
+    assert select_resolution(600) == 60
+    assert select_resolution(7200) == 3600
+
+    assert resolution_for_span(START, START + timedelta(hours=1), 1000) == 60
+    assert resolution_for_span(START, START + timedelta(days=7), 1000) == 900
+    assert resolution_for_span(START, START + timedelta(days=365), 1000) == 3600
+
+
+async def test_incremental_add_equals_rebuild(db_session):
+    """Adding readings in pieces yields the same tiers as a rebuild from raw rows."""
+    timestamps, values = _readings(7200)
+    rows = [
+        {"sensor_id": "s1", "timestamp": ts, "value": float(v)}
+        for ts, v in zip(timestamps.tolist(), values)
+    ]
+    await db_session.execute(insert(SensorReading), rows)
+
+    store = RollupStore(db_session)
+    for part in np.array_split(np.arange(len(values)), 7):
+        await store.add("s1", timestamps[part], values[part])
+    await db_session.commit()
+    incremental = await store.series("s1", START, START + timedelta(hours=2), 900)
+
+    await store.rebuild("s1", START, START + timedelta(hours=2))
+    await db_session.commit()
+    rebuilt = await store.series("s1", START, START + timedelta(hours=2), 900)
+
+    assert len(incremental) == len(rebuilt) == 8
+    np.testing.assert_array_equal(incremental.count, rebuilt.count)
+    np.testing.assert_allclose(incremental.mean, rebuilt.mean)
+    np.testing.assert_allclose(incremental.std, rebuilt.std, rtol=1e-6)
+    np.testing.assert_array_equal(incremental.min, rebuilt.min)
+    np.testing.assert_array_equal(incremental.max, rebuilt.max)
+    np.testing.assert_allclose(rebuilt.mean, values.reshape(8, 900).mean(axis=1))
+    np.testing.assert_allclose(rebuilt.std, values.reshape(8, 900).std(axis=1), rtol=1e-6)
+
+
+async def test_rebuild_replaces_stale_buckets(db_session):
+    """Rebuild drops buckets whose raw readings are gone and leaves other ranges alone."""
+    timestamps, values = _readings(600, step_seconds=60)
+    store = RollupStore(db_session)
+    await store.add("s1", timestamps, values)
+    await db_session.commit()
+
+    # No raw rows exist: the first two hours are rebuilt as empty
+    await store.rebuild("s1", START, START + timedelta(hours=2))
+    await db_session.commit()
+
+    hourly = (await db_session.scalars(
+        select(ReadingRollup.bucket_start)
+        .where(ReadingRollup.sensor_id == "s1", ReadingRollup.resolution == 3600)
+        .order_by(ReadingRollup.bucket_start)
+    )).all()
+    assert hourly[0] == START + timedelta(hours=2)
+    assert len(hourly) == 8
+    assert await store.count("s1", START, START + timedelta(hours=10)) == 480
+
+
+async def _insert_readings(db_session, timestamps, values, sensor_id="s1"):
+    await db_session.execute(insert(SensorReading), [
+        {"sensor_id": sensor_id, "timestamp": ts, "value": float(v)}
+        for ts, v in zip(timestamps.tolist(), values)
+    ])
+    await db_session.commit()
+
+
+async def test_range_series_requested_resolution(db_session):
+    """A requested resolution analyzes the coarsest tier within it; finer requests read raw rows."""
+    from backend.api.routes.analytics import _range_series
+
+    timestamps, values = _readings(7200)
+    await _insert_readings(db_session, timestamps, values)
+    await RollupStore(db_session).add("s1", timestamps, values)
+    await db_session.commit()
+    end = START + timedelta(hours=2)
+
+    series = await _range_series(db_session, "s1", START, end, resolution=1200)
+    assert len(series) == 8
+    np.testing.assert_allclose(series.values, values.reshape(8, 900).mean(axis=1))
+
+    assert len(await _range_series(db_session, "s1", START, end, resolution=30)) == 7200
+    assert len(await _range_series(db_session, "s1", START, end)) == 7200
+
+
+async def test_backfill_builds_tiers_for_history(db_session):
+    """The one-off backfill rolls up readings inserted before rollups existed, across gaps."""
+    from backend.tasks.maintenance_tasks import _backfill_rollups
+
+    timestamps, values = _readings(3 * 24 * 60, step_seconds=60)
+    later = timestamps[-1] + np.timedelta64(30, "D")
+    await _insert_readings(db_session, np.concatenate([timestamps, [later]]), np.append(values, 1.0))
+
+    stats = await _backfill_rollups(db_session, datetime(2025, 1, 1))
+
+    assert (stats["sensors"], stats["spans"]) == (1, 4)  # three days, then one span after the gap
+    store = RollupStore(db_session)
+    assert await store.count("s1", START, START + timedelta(days=60)) == len(values) + 1
+    hourly = await store.series("s1", START, START + timedelta(days=3), 3600)
+    np.testing.assert_allclose(hourly.mean, values.reshape(72, 60).mean(axis=1))
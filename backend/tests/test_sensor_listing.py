@@ -0,0 +1,143 @@
+"""
+Sensor Listing Tests
+
+Checks that listing sensors with their latest analysis costs a fixed
+number of queries, independent of page size, and that cursor (keyset)
+pagination walks sensors and history consistently with page mode.
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import event
+
+from fastapi import HTTPException
+
+from backend.api.routes.sensors import get_sensor_history, get_sensors
+from backend.models_db import AnalysisResultDB, Role, Sensor, User
+from backend.schemas.common import PaginationParams
+
+START = datetime(2024, 1, 1)
+METRICS = {"bias": 0.0, "slope": 0.0, "snr_db": 30.0, "hysteresis": 0.0}  # required scalar metrics
+
+
+@pytest.fixture
+async def db_session(session_factory):
+    """Session with 100 sensors, most with analyses."""
+    async with session_factory() as session:
+        for i in range(100):
+            session.add(Sensor(
+                id=f"S{i:03d}", name=f"Sensor {i}", location="Lab", organization_id="org",
+                created_at=START + timedelta(seconds=i // 2),  # ties are broken by id
+            ))
+            for k in range(3 if i % 10 else 0):
+                session.add(AnalysisResultDB(
+                    sensor_id=f"S{i:03d}",
+                    timestamp=START + timedelta(hours=k),
+                    health_score=float(50 + i % 50 - k),
+                    status="Warning" if k == 2 else "Normal",
+                    **METRICS, diagnosis="Stable", recommendation="None",
+                ))
+        await session.commit()
+        yield session
+
+
+@pytest.fixture
+def count_queries(test_db_engine):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(test_db_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(test_db_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def admin():
+    return User(email="admin@example.com", role=Role.SUPER_ADMIN, organization_id="org")
+
+
+@pytest.mark.parametrize("size", [10, 100])
+async def test_listing_query_count_is_constant(db_session, count_queries, size):
+    """One COUNT plus one page query, whatever the page size."""
+    user = User(email="admin@example.com", role=Role.SUPER_ADMIN, organization_id="org")
+
+    page = await get_sensors(pagination=PaginationParams(page=1, size=size), db=db_session, current_user=user)
+
+    assert len(page.items) == size
+    assert page.total == 100
+    assert len(count_queries) == 2
+
+
+async def test_listing_reports_latest_analysis(db_session):
+    """Each sensor carries its most recent analysis; sensors without one get defaults."""
+    user = User(email="admin@example.com", role=Role.SUPER_ADMIN, organization_id="org")
+
+    page = await get_sensors(pagination=PaginationParams(page=1, size=20), db=db_session, current_user=user)
+    items = {item.id: item for item in page.items}
+
+    assert [item.id for item in page.items] == sorted(items)
+    assert items["S000"].latest_health_score == 100.0
+    assert items["S000"].latest_status == "Normal"
+    assert items["S000"].latest_analysis_timestamp is None
+    assert items["S013"].latest_health_score == 61.0
+    assert items["S013"].latest_status == "Warning"
+    assert items["S013"].latest_analysis_timestamp == START + timedelta(hours=2)
+
+
+async def test_cursor_walk_matches_page_mode(db_session, admin):
+    """Following next_cursor visits the same sensors, in the same order, as page numbers."""
+    by_page = []
+    for page_no in range(1, 5):
+        page = await get_sensors(pagination=PaginationParams(page=page_no, size=30), db=db_session, current_user=admin)
+        by_page.extend(item.id for item in page.items)
+
+    page = await get_sensors(pagination=PaginationParams(size=30), db=db_session, current_user=admin)
+    by_cursor = [item.id for item in page.items]
+    while page.next_cursor:
+        page = await get_sensors(pagination=PaginationParams(size=30, cursor=page.next_cursor), db=db_session, current_user=admin)
+        assert page.total is None and page.page is None
+        by_cursor.extend(item.id for item in page.items)
+
+    assert by_cursor == by_page
+    assert len(by_cursor) == 100
+
+
+async def test_history_cursor_walk(db_session, admin):
+    """History pages by (timestamp, id) newest first, including equal timestamps."""
+    for k in range(5):
+        db_session.add(AnalysisResultDB(
+            sensor_id="S001", timestamp=START + timedelta(hours=1), health_score=10.0 + k, status="Normal",
+            **METRICS, diagnosis="Stable", recommendation="None",
+        ))
+    await db_session.commit()
+
+    seen, cursor = [], None
+    while True:
+        page = await get_sensor_history(
+            "S001", pagination=PaginationParams(size=2, cursor=cursor, total="exact"),
+            max_points=None, include_series=False, db=db_session, current_user=admin,
+        )
+        assert page.total == 8
+        seen.extend((item.timestamp, item.health_score) for item in page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert len(seen) == len(set(seen)) == 8
+    assert [ts for ts, _ in seen] == sorted((ts for ts, _ in seen), reverse=True)
+
+
+async def test_estimated_total_and_invalid_cursor(db_session, admin, monkeypatch):
+    """Estimated totals are capped and flagged; malformed cursors are rejected."""
+    monkeypatch.setattr("backend.core.pagination.TOTAL_ESTIMATE_CAP", 50)
+    page = await get_sensors(pagination=PaginationParams(size=10, total="estimate"), db=db_session, current_user=admin)
+    assert (page.total, page.total_is_estimate) == (50, True)
+
+    page = await get_sensors(pagination=PaginationParams(size=10, total="none"), db=db_session, current_user=admin)
+    assert page.total is None and page.pages is None and page.next_cursor is not None
+
+    with pytest.raises(HTTPException) as exc:
+        await get_sensors(pagination=PaginationParams(cursor="not-a-cursor"), db=db_session, current_user=admin)
+    assert exc.value.status_code == 400
@@ -0,0 +1,126 @@
+"""
+Stream Batch Tests
+
+Tests for /sensors/stream-batch: one ownership query, one insert and at
+most one background analysis per sensor, whatever the batch size.
+"""
+
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from fastapi import BackgroundTasks, HTTPException
+from sqlalchemy import event, func, select
+
+from backend.api.routes.sensors import stream_batch
+from backend.core.config import settings
+from backend.core.ingest import IngestBuffer
+from backend.models_db import Role, Sensor, SensorReading, User
+from backend.schemas.sensor import StreamBatch
+
+START = datetime(2024, 1, 1)
+
+
+@pytest.fixture
+async def session_factory(session_factory):
+    """Shared session factory with the sensors seeded."""
+    async with session_factory() as session:
+        session.add_all([
+            Sensor(id=f"S{i}", name=f"Sensor {i}", location="Lab", organization_id="org") for i in range(3)
+        ])
+        session.add(Sensor(id="X", name="Foreign", location="Lab", organization_id="other"))
+        await session.commit()
+    return session_factory
+
+
+@pytest.fixture
+def statements(test_db_engine):
+    captured = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        captured.append(statement)
+
+    event.listen(test_db_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    yield captured
+    event.remove(test_db_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def user():
+    return User(email="gateway@example.com", role=Role.ENGINEER, organization_id="org")
+
+
+def _batch(points):
+    return StreamBatch(points=[
+        {"sensor_id": sensor_id, "value": float(i), "timestamp": (START + timedelta(seconds=i)).isoformat()}
+        for i, sensor_id in enumerate(points)
+    ])
+
+
+async def _count(db_session):
+    return await db_session.scalar(select(func.count()).select_from(SensorReading))
+
+
+async def test_batch_direct_mode(db_session, user, statements, monkeypatch):
+    """1000 points for 3 sensors: one ownership query, one insert, one analysis per sensor."""
+    monkeypatch.setattr(settings, "ingest_mode", "direct")
+    monkeypatch.setattr(settings, "rollup_enabled", False)
+    background = BackgroundTasks()
+
+    response = await stream_batch(
+        _batch([f"S{i % 3}" for i in range(1000)]), background, db=db_session, current_user=user,
+    )
+
+    assert response["points"] == 1000
+    assert response["sensors"] == {"S0": 334, "S1": 333, "S2": 333}
+    assert sum(sql.startswith("SELECT") for sql in statements) == 1
+    assert sum(sql.startswith("INSERT INTO sensor_readings") for sql in statements) == 1
+    assert [task.args[0] for task in background.tasks] == ["S0", "S1", "S2"]
+    assert all(task.args[2] is None for task in background.tasks)
+    assert await _count(db_session) == 1000
+
+
+async def test_batch_single_point_updates_incrementally(db_session, user, monkeypatch):
+    """A sensor with one point in the batch passes its value to the analysis."""
+    monkeypatch.setattr(settings, "ingest_mode", "direct")
+    background = BackgroundTasks()
+
+    await stream_batch(_batch(["S0", "S1", "S1"]), background, db=db_session, current_user=user)
+
+    assert [(task.args[0], task.args[2]) for task in background.tasks] == [("S0", 0.0), ("S1", None)]
+
+
+async def test_batch_durable_mode_uses_buffer(db_session, session_factory, user, monkeypatch):
+    """In durable mode a partial batch is committed through the idle ingest buffer before the response."""
+    monkeypatch.setattr(settings, "ingest_mode", "durable")
+    buffer = IngestBuffer(session_factory, batch_size=5000, flush_interval=0.01)
+    monkeypatch.setattr("backend.api.routes.sensors.ingest_buffer", buffer)
+    buffer.start()
+    await asyncio.sleep(0.05)  # flusher is idle, as after the application lifespan starts it
+
+    await asyncio.wait_for(
+        stream_batch(_batch(["S0", "S1"] * 50), BackgroundTasks(), db=db_session, current_user=user),
+        timeout=2,
+    )
+
+    assert await _count(db_session) == 100
+    await buffer.stop()
+
+
+async def test_batch_rejects_foreign_sensor(db_session, user, monkeypatch):
+    """One foreign sensor rejects the whole batch before anything is written."""
+    monkeypatch.setattr(settings, "ingest_mode", "direct")
+
+    with pytest.raises(HTTPException) as exc:
+        await stream_batch(_batch(["S0", "X", "S1"]), BackgroundTasks(), db=db_session, current_user=user)
+
+    assert exc.value.status_code == 404
+    assert await _count(db_session) == 0
+
+
+async def test_batch_size_limit(db_session, user, monkeypatch):
+    monkeypatch.setattr(settings, "stream_batch_max_points", 10)
+
+    with pytest.raises(HTTPException) as exc:
+        await stream_batch(_batch(["S0"] * 11), BackgroundTasks(), db=db_session, current_user=user)
+
+    assert exc.value.status_code == 413
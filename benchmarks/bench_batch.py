@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Fleet Analysis Benchmark
+
+Compares SensorAnalyzer.analyze_batch on an (n_sensors, n_points) matrix
+against calling SensorAnalyzer.analyze once per sensor.
+
+Usage:
+    python -m benchmarks.bench_batch --sensors 1000 --points 1000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.analysis import SensorAnalyzer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark fleet-wide batched analysis")
+    parser.add_argument("--sensors", type=int, default=1000)
+    parser.add_argument("--points", type=int, default=1000)
+    args = parser.parse_args()
+
+    analyzer = SensorAnalyzer()
+    rng = np.random.default_rng(42)
+    matrix = np.cumsum(rng.normal(0, 0.1, (args.sensors, args.points)), axis=1) + rng.normal(0, 1, (args.sensors, args.points))
+
+    start = time.perf_counter()
+    analyzer.analyze_batch(matrix)
+    t_batch = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for row in matrix:
+        analyzer.analyze(row.tolist())
+    t_loop = time.perf_counter() - start
+
+    print(f"{args.sensors} sensors x {args.points} points")
+    print(f"  per-sensor analyze(): {t_loop:8.3f} s")
+    print(f"  analyze_batch():      {t_batch:8.3f} s  ({t_loop / t_batch:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+CSV Parsing Benchmark
+
+Compares column-wise chunk parsing (backend.core.csv_import.parse_chunk)
+against per-row parsing with SensorReadingBulk, on [timestamp, value] rows.
+
+Usage:
+    python -m benchmarks.bench_csv_parse --rows 1000000 --chunk 5000
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.core.csv_import import parse_chunk, parse_csv_row
+from backend.schemas.sensor import SensorReadingBulk
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark CSV chunk parsing")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunk", type=int, default=5000)
+    args = parser.parse_args()
+
+    start_ts = datetime(2024, 1, 1)
+    rows = [[(start_ts + timedelta(seconds=i)).isoformat(), f"{20 + (i % 100) / 10:.3f}"] for i in range(args.rows)]
+    row_nums = list(range(2, args.rows + 2))
+
+    start = time.perf_counter()
+    for offset in range(0, args.rows, args.chunk):
+        parse_chunk(rows[offset:offset + args.chunk], row_nums[offset:offset + args.chunk], "S1", 0, 1)
+    t_chunk = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for row, row_num in zip(rows, row_nums):
+        parsed = parse_csv_row(row, row_num, "S1", 0, 1)
+        SensorReadingBulk(timestamp=parsed['timestamp'], value=parsed['value'])
+    t_row = time.perf_counter() - start
+
+    print(f"{args.rows} rows, chunks of {args.chunk}")
+    print(f"  per-row SensorReadingBulk: {t_row:8.3f} s  ({args.rows / t_row:12,.0f} rows/s)")
+    print(f"  parse_chunk():             {t_chunk:8.3f} s  ({args.rows / t_chunk:12,.0f} rows/s, {t_row / t_chunk:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
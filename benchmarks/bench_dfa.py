@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+DFA Kernel Benchmark
+
+Compares the batched least-squares DFA kernel in SensorAnalyzer.calc_dfa
+against the previous per-segment np.polyfit/np.polyval loop.
+
+Usage:
+    python -m benchmarks.bench_dfa
+    python -m benchmarks.bench_dfa --sizes 1000 10000 100000 --repeat 5
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from scipy import stats
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.analysis import SensorAnalyzer
+
+
+def legacy_calc_dfa(data: np.ndarray, order: int = 1):
+    """Reference implementation: one np.polyfit call per segment."""
+    y = np.cumsum(data - np.mean(data))
+    N = len(y)
+    min_scale = 4
+    max_scale = N // 4
+
+    scales = np.unique(np.logspace(np.log10(min_scale), np.log10(max_scale), num=20).astype(int))
+    scales = scales[scales > order + 2]
+
+    fluctuations = []
+    for scale in scales:
+        n_segments = N // scale
+        segments = y[:n_segments * scale].reshape(n_segments, scale)
+        x = np.arange(scale)
+        total_residual_sq = 0.0
+        for seg in segments:
+            coeffs = np.polyfit(x, seg, order)
+            trend = np.polyval(coeffs, x)
+            total_residual_sq += np.sum((seg - trend) ** 2)
+        fluctuations.append(np.sqrt(total_residual_sq / (n_segments * scale)))
+
+    fluctuations = np.array(fluctuations)
+    valid_idx = fluctuations > 1e-10
+    slope, _, r_value, _, _ = stats.linregress(np.log(scales[valid_idx]), np.log(fluctuations[valid_idx]))
+    return float(slope), float(r_value ** 2)
+
+
+def best_of(func, repeat: int) -> float:
+    """Return the fastest wall-clock time (seconds) over `repeat` runs."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the DFA kernel")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    analyzer = SensorAnalyzer()
+    rng = np.random.default_rng(42)
+
+    print(f"{'points':>10} {'legacy (ms)':>12} {'batched (ms)':>13} {'speedup':>9} {'|dH|':>10}")
+    for n in args.sizes:
+        data = rng.normal(0, 1, n)
+
+        hurst_legacy, _ = legacy_calc_dfa(data)
+        hurst_new, _, _, _ = analyzer.calc_dfa(data)
+
+        t_legacy = best_of(lambda: legacy_calc_dfa(data), args.repeat)
+        t_new = best_of(lambda: analyzer.calc_dfa(data), args.repeat)
+
+        print(
+            f"{n:>10} {t_legacy * 1000:>12.2f} {t_new * 1000:>13.2f} "
+            f"{t_legacy / t_new:>8.1f}x {abs(hurst_legacy - hurst_new):>10.2e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
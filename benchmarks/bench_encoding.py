@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Series Encoding Benchmark
+
+Compares serializing an analysis result as Pydantic-validated JSON lists
+against the compact base64 float32 form (backend/core/encoding.py).
+
+Usage:
+    python -m benchmarks.bench_encoding
+    python -m benchmarks.bench_encoding --sizes 1000 10000 100000 --repeat 5
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.analysis import SensorAnalyzer
+from backend.api.routes.analytics import AnalysisMetricsExtended
+from backend.core.encoding import compact_metrics
+
+
+def best_of(func, repeat: int) -> float:
+    """Return the fastest wall-clock time (seconds) over `repeat` runs."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark series encodings")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    analyzer = SensorAnalyzer()
+    rng = np.random.default_rng(42)
+
+    print(f"{'points':>10} {'json (ms)':>10} {'compact (ms)':>13} {'speedup':>9} {'json (KB)':>10} {'compact (KB)':>13}")
+    for n in args.sizes:
+        values = (20 + np.cumsum(rng.normal(0, 0.1, n))).tolist()
+        metrics = analyzer.analyze(values, return_arrays=True)["metrics"]
+
+        def as_json():
+            lists = {k: v.tolist() if isinstance(v, np.ndarray) else v for k, v in metrics.items()}
+            return AnalysisMetricsExtended(**lists).model_dump_json()
+
+        def as_compact():
+            return json.dumps(compact_metrics(metrics))
+
+        t_json = best_of(as_json, args.repeat)
+        t_compact = best_of(as_compact, args.repeat)
+        print(
+            f"{n:>10} {t_json * 1000:>10.2f} {t_compact * 1000:>13.2f} {t_json / t_compact:>8.1f}x "
+            f"{len(as_json()) / 1024:>10.1f} {len(as_compact()) / 1024:>13.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
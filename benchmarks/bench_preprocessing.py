@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Preprocessing Benchmark
+
+Compares the NumPy gap-fill / rolling-mean path in SensorAnalyzer against
+the pandas implementation it replaced, for single windows and batches.
+
+Usage:
+    python -m benchmarks.bench_preprocessing
+    python -m benchmarks.bench_preprocessing --sizes 100 1000 10000 --repeat 5
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.analysis import SensorAnalyzer
+
+
+def best_of(func, repeat: int) -> float:
+    """Return the fastest wall-clock time (seconds) over `repeat` runs."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def with_gaps(rng: np.random.Generator, shape, fraction: float = 0.02) -> np.ndarray:
+    data = rng.normal(20.0, 1.0, shape)
+    data[rng.random(shape) < fraction] = np.nan
+    return data
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark preprocessing engines")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000, 10_000])
+    parser.add_argument("--sensors", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    numpy_analyzer = SensorAnalyzer(engine="numpy")
+    pandas_analyzer = SensorAnalyzer(engine="pandas")
+    rng = np.random.default_rng(42)
+
+    def single(analyzer, values):
+        clean = analyzer.preprocessing(values)
+        analyzer.calc_hysteresis(clean)
+
+    print("single window (preprocessing + hysteresis)")
+    print(f"{'points':>10} {'pandas (ms)':>12} {'numpy (ms)':>11} {'speedup':>9}")
+    for n in args.sizes:
+        values = with_gaps(rng, n).tolist()
+        t_pandas = best_of(lambda: single(pandas_analyzer, values), args.repeat)
+        t_numpy = best_of(lambda: single(numpy_analyzer, values), args.repeat)
+        print(f"{n:>10} {t_pandas * 1000:>12.3f} {t_numpy * 1000:>11.3f} {t_pandas / t_numpy:>8.1f}x")
+
+    def batch(analyzer, matrix):
+        clean = analyzer._preprocess_batch(matrix)
+        analyzer._hysteresis_batch(clean)
+
+    print(f"\nbatch of {args.sensors} sensors")
+    print(f"{'points':>10} {'pandas (ms)':>12} {'numpy (ms)':>11} {'speedup':>9}")
+    for n in args.sizes:
+        matrix = with_gaps(rng, (args.sensors, n))
+        t_pandas = best_of(lambda: batch(pandas_analyzer, matrix), args.repeat)
+        t_numpy = best_of(lambda: batch(numpy_analyzer, matrix), args.repeat)
+        print(f"{n:>10} {t_pandas * 1000:>12.3f} {t_numpy * 1000:>11.3f} {t_pandas / t_numpy:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
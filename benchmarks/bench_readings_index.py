@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Reading Index Benchmark
+
+Loads a synthetic sensor_readings table into a SQLite file and times the
+analysis fetches (latest N readings, date range) with only the original
+single-column indexes and then with the (sensor_id, timestamp, value)
+covering index.
+
+Usage:
+    python -m benchmarks.bench_readings_index                 # 10M rows
+    python -m benchmarks.bench_readings_index --rows 1000000 --sensors 100
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+from sqlalchemy.dialects import sqlite
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.repositories.readings import latest_readings_stmt, range_readings_stmt
+
+START = datetime(2024, 1, 1)
+
+
+def compile_sql(stmt) -> str:
+    return str(stmt.compile(dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def load(conn: sqlite3.Connection, rows: int, sensors: int, chunk: int = 500_000) -> None:
+    """Insert `rows` readings spread round-robin over `sensors` sensors (1 s apart per sensor)."""
+    conn.execute(
+        "CREATE TABLE sensor_readings (id INTEGER PRIMARY KEY, sensor_id VARCHAR(50) NOT NULL, "
+        "timestamp DATETIME NOT NULL, value FLOAT NOT NULL)"
+    )
+    rng = np.random.default_rng(0)
+    for offset in range(0, rows, chunk):
+        n = min(chunk, rows - offset)
+        idx = np.arange(offset, offset + n)
+        values = rng.normal(20.0, 1.0, n)
+        conn.executemany(
+            "INSERT INTO sensor_readings (sensor_id, timestamp, value) VALUES (?, ?, ?)",
+            (
+                (f"S{i % sensors:04d}", (START + timedelta(seconds=int(i // sensors))).isoformat(sep=" "), float(v))
+                for i, v in zip(idx, values)
+            ),
+        )
+    conn.execute("CREATE INDEX ix_sensor_readings_sensor_id ON sensor_readings (sensor_id)")
+    conn.execute("CREATE INDEX ix_sensor_readings_timestamp ON sensor_readings (timestamp)")
+    conn.commit()
+
+
+def time_queries(conn: sqlite3.Connection, queries, repeat: int) -> float:
+    """Mean wall-clock time (ms) per query over `repeat` passes."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for sql in queries:
+            conn.execute(sql).fetchall()
+    return (time.perf_counter() - start) * 1000 / (repeat * len(queries))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the composite reading index")
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--sensors", type=int, default=1_000)
+    parser.add_argument("--window", type=int, default=1_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    per_sensor = args.rows // args.sensors
+    picks = [f"S{i:04d}" for i in np.random.default_rng(1).choice(args.sensors, 20, replace=False)]
+    range_start = START + timedelta(seconds=per_sensor // 4)
+    range_end = range_start + timedelta(seconds=per_sensor // 2)
+    workloads = {
+        f"latest {args.window}": [compile_sql(latest_readings_stmt(s, args.window)) for s in picks],
+        "date range": [compile_sql(range_readings_stmt(s, range_start, range_end, 10_000)) for s in picks],
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(os.path.join(tmp, "readings.db"))
+        t0 = time.perf_counter()
+        load(conn, args.rows, args.sensors)
+        print(f"loaded {args.rows:,} rows ({args.sensors} sensors) in {time.perf_counter() - t0:.1f}s\n")
+
+        before = {name: time_queries(conn, qs, args.repeat) for name, qs in workloads.items()}
+        conn.execute(
+            "CREATE INDEX ix_sensor_readings_sensor_ts_value ON sensor_readings (sensor_id, timestamp, value)"
+        )
+        conn.execute("ANALYZE")
+        after = {name: time_queries(conn, qs, args.repeat) for name, qs in workloads.items()}
+
+        print(f"{'query':>14} {'single-col (ms)':>16} {'composite (ms)':>15} {'speedup':>9}")
+        for name in workloads:
+            print(f"{name:>14} {before[name]:>16.2f} {after[name]:>15.2f} {before[name] / after[name]:>8.1f}x")
+
+        plan = conn.execute("EXPLAIN QUERY PLAN " + workloads["date range"][0]).fetchall()
+        print("\nplan:", plan[0][3])
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()